@@ -0,0 +1,346 @@
+# benchmarks/fake_responses.py
+"""
+Local stand-in for the OpenAI Responses streaming endpoint.
+
+Serves POST /v1/responses as Server-Sent Events in the same shape as the
+real API, so the unmodified OpenAI SDK, run_turn and the REPL can be driven
+offline. Replies are scripted from the prompt:
+
+    "[words=200]"     answer with 200 words (default 40)
+    "[tool=name]"     call the named tool once, then answer
+    "[calls=3]"       ...with that many parallel calls
+
+Timing is configurable: time to first output, gap between deltas and a
+jitter fraction applied to both.
+
+    python benchmarks/fake_responses.py --port 8765 --ttft 0.3 --delta 0.01
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=x neuro "hi [words=80]"
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+_DIRECTIVE = re.compile(r"\[(words|tool|calls)=([\w.-]+)\]")
+
+WORDS = (
+    "latency budget stream token event tool chain render cache socket "
+    "thread pool buffer delta prompt answer model request response"
+).split()
+
+
+@dataclass
+class Timing:
+    ttft_s: float = 0.0  # request received -> first output item
+    delta_s: float = 0.0  # between text / argument deltas
+    jitter: float = 0.0  # +/- fraction applied to each delay
+    seed: int | None = None
+
+
+def _last_user_text(payload: Any) -> str:
+    if isinstance(payload, str):
+        return payload
+
+    for item in reversed(payload or []):
+        if isinstance(item, dict) and item.get("role") == "user":
+            content = item.get("content")
+            return content if isinstance(content, str) else json.dumps(content)
+
+    return ""
+
+
+def script_for(request: dict[str, Any], prompts: dict[str | None, str]) -> list[dict[str, Any]]:
+    """
+    Output items for one request.
+
+    Tool outputs (a list input of function_call_output items) are answered
+    with text; the directives come from the prompt that started the chain.
+    """
+
+    payload = request.get("input")
+    follow_up = isinstance(payload, list) and any(
+        isinstance(item, dict) and item.get("type") == "function_call_output"
+        for item in payload
+    )
+    prompt = (
+        prompts.get(request.get("previous_response_id"), "")
+        if follow_up
+        else _last_user_text(payload)
+    )
+    directives = dict(_DIRECTIVE.findall(prompt))
+    words = int(directives.get("words", 40))
+    tool = directives.get("tool")
+
+    if tool and not follow_up:
+        return [
+            {
+                "type": "function_call",
+                "name": tool,
+                "arguments": json.dumps({"text": f"probe {n}"}),
+            }
+            for n in range(int(directives.get("calls", 1)))
+        ]
+
+    return [{"type": "message", "text": " ".join(itertools.islice(itertools.cycle(WORDS), words))}]
+
+
+class FakeResponsesServer:
+    """
+    Threaded HTTP server speaking the Responses SSE protocol.
+
+    Use as a context manager; `base_url` is ready for OpenAI(base_url=...).
+    `requests` counts the streamed requests served.
+    """
+
+    def __init__(self, timing: Timing | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.timing = timing or Timing()
+        self._random = random.Random(self.timing.seed)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # response id -> prompt that started its chain, for follow-ups.
+        self._prompts: dict[str | None, str] = {}
+        self.requests = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeResponsesServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="fake-responses",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeResponsesServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def delay(self, seconds: float) -> float:
+        if seconds <= 0:
+            return 0.0
+
+        with self._lock:
+            spread = self._random.uniform(-self.timing.jitter, self.timing.jitter)
+
+        return max(0.0, seconds * (1 + spread))
+
+    def _next_id(self, prefix: str) -> str:
+        with self._lock:
+            return f"{prefix}_{next(self._ids):06d}"
+
+    def _begin(self, request: dict[str, Any]) -> tuple[str, list[dict[str, Any]]]:
+        response_id = self._next_id("resp")
+
+        with self._lock:
+            self.requests += 1
+            prompt = self._prompts.get(request.get("previous_response_id"))
+
+            if prompt is None:
+                prompt = _last_user_text(request.get("input"))
+
+            self._prompts[response_id] = prompt
+            items = script_for(request, self._prompts)
+
+        return response_id, items
+
+    def events(self, request: dict[str, Any]):
+        """(event type, payload, delay before sending) for one request."""
+
+        response_id, items = self._begin(request)
+        response = {
+            "id": response_id,
+            "object": "response",
+            "created_at": int(time.time()),
+            "status": "in_progress",
+            "model": request.get("model", "fake"),
+            "output": [],
+            "parallel_tool_calls": bool(request.get("parallel_tool_calls", True)),
+            "tool_choice": request.get("tool_choice", "auto"),
+            "tools": request.get("tools") or [],
+            "instructions": request.get("instructions"),
+            "previous_response_id": request.get("previous_response_id"),
+            "error": None,
+            "incomplete_details": None,
+            "metadata": {},
+            "text": {"format": {"type": "text"}},
+        }
+        yield "response.created", {"response": dict(response)}, 0.0
+
+        first = self.timing.ttft_s
+        output = []
+
+        for index, spec in enumerate(items):
+            item_id = self._next_id("fc" if spec["type"] == "function_call" else "msg")
+
+            if spec["type"] == "function_call":
+                call_id = self._next_id("call")
+                done = {
+                    "type": "function_call",
+                    "id": item_id,
+                    "call_id": call_id,
+                    "name": spec["name"],
+                    "arguments": spec["arguments"],
+                    "status": "completed",
+                }
+                yield "response.output_item.added", {
+                    "output_index": index,
+                    "item": {**done, "arguments": "", "status": "in_progress"},
+                }, first
+                yield "response.function_call_arguments.delta", {
+                    "item_id": item_id,
+                    "output_index": index,
+                    "delta": spec["arguments"],
+                }, self.timing.delta_s
+                yield "response.function_call_arguments.done", {
+                    "item_id": item_id,
+                    "output_index": index,
+                    "arguments": spec["arguments"],
+                }, 0.0
+            else:
+                words = spec["text"].split(" ")
+                text = spec["text"]
+                done = {
+                    "type": "message",
+                    "id": item_id,
+                    "role": "assistant",
+                    "status": "completed",
+                    "content": [{"type": "output_text", "text": text, "annotations": []}],
+                }
+                yield "response.output_item.added", {
+                    "output_index": index,
+                    "item": {**done, "status": "in_progress", "content": []},
+                }, first
+                part = {"item_id": item_id, "output_index": index, "content_index": 0}
+                yield "response.content_part.added", {
+                    **part,
+                    "part": {"type": "output_text", "text": "", "annotations": []},
+                }, 0.0
+
+                for position, word in enumerate(words):
+                    delta = word if position == len(words) - 1 else word + " "
+                    yield "response.output_text.delta", {
+                        **part,
+                        "delta": delta,
+                        "logprobs": [],
+                    }, 0.0 if position == 0 else self.timing.delta_s
+
+                yield "response.output_text.done", {**part, "text": text, "logprobs": []}, 0.0
+                yield "response.content_part.done", {**part, "part": done["content"][0]}, 0.0
+
+            yield "response.output_item.done", {"output_index": index, "item": done}, 0.0
+            output.append(done)
+            first = 0.0
+
+        input_tokens = len(json.dumps(request.get("input"))) // 4 + 1
+        output_tokens = sum(len(json.dumps(item)) // 4 for item in output)
+        yield "response.completed", {
+            "response": {
+                **response,
+                "status": "completed",
+                "output": output,
+                "usage": {
+                    "input_tokens": input_tokens,
+                    "input_tokens_details": {"cached_tokens": 0},
+                    "output_tokens": output_tokens,
+                    "output_tokens_details": {"reasoning_tokens": 0},
+                    "total_tokens": input_tokens + output_tokens,
+                },
+            }
+        }, 0.0
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+            disable_nagle_algorithm = True  # small SSE writes go out at once
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+
+                if self.path.rstrip("/") != "/v1/responses" or not request.get("stream"):
+                    self.send_error(404, "Only streamed POST /v1/responses is served")
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                try:
+                    for sequence, (kind, payload, delay) in enumerate(server.events(request)):
+                        pause = server.delay(delay)
+
+                        if pause:
+                            time.sleep(pause)
+
+                        body = json.dumps({"type": kind, "sequence_number": sequence, **payload})
+                        self._chunk(f"event: {kind}\ndata: {body}\n\n".encode())
+
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True
+
+            def _chunk(self, data: bytes) -> None:
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ttft", type=float, default=0.0, help="Seconds to first output.")
+    parser.add_argument("--delta", type=float, default=0.0, help="Seconds between deltas.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Fraction, e.g. 0.2.")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    server = FakeResponsesServer(
+        Timing(args.ttft, args.delta, args.jitter, args.seed),
+        host=args.host,
+        port=args.port,
+    )
+    print(f"Serving fake Responses API at {server.base_url}", flush=True)
+
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
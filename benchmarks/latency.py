@@ -0,0 +1,392 @@
+# benchmarks/latency.py
+"""
+End-to-end latency benchmark for the neuro runtime.
+
+Runs real turns through run_turn / run_turn_async and the OpenAI SDK
+against the local fake Responses server (benchmarks/fake_responses.py), so
+the numbers are the runtime's own cost: no network, no model. Scenarios:
+
+    turn          one plain text turn, request to final answer
+    events        runtime cost per stream event over raw SDK iteration,
+                  bare and with the REPL's live Markdown rendering
+    tool_chain    a turn with three parallel tool calls, and its cost
+                  over the two round trips it makes
+    concurrency   turns per second with N async sessions, against a
+                  server that takes 50 ms to first output
+
+Every scenario runs --repeat times (default 3), interleaved, and each
+metric is the median of those runs. The run fails (exit 1) when a median
+regresses past the stored baseline (benchmarks/latency_baseline.json) by
+more than NEURO_BENCH_TOLERANCE (a fraction, default 0.5) plus an absolute
+floor for timer and scheduler noise.
+
+    python benchmarks/latency.py                     # measure and check
+    python benchmarks/latency.py --update-baseline   # accept current numbers
+    python benchmarks/latency.py turn events --output r.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+ROOT = Path(__file__).resolve().parents[1]
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.fake_responses import FakeResponsesServer, Timing  # noqa: E402
+
+BASELINE_PATH = ROOT / "benchmarks" / "latency_baseline.json"
+BENCH_TOOL = "bench_echo"
+CONCURRENCY = (1, 8)
+
+# Absolute slack per metric unit (by name suffix), so small figures do not
+# fail on noise alone. The overheads are differences of two medians, so a
+# few milliseconds of jitter in either one shows up whole; per event that
+# is ~100us on a 400-event stream.
+SLACK = {"_ms": 5.0, "_us": 150.0, "_per_s": 0.0}
+
+
+def _quiet_stall_policy():
+    from src.core.watchdog import StallPolicy
+
+    # The default thresholds, made explicit so NEURO_STALL_* / NEURO_HEDGE_*
+    # in the caller's shell cannot change what is measured.
+    return StallPolicy(first_event_s=30.0, idle_s=None, retries=1, hedge_after_s=None)
+
+
+@contextmanager
+def bench_tool() -> Iterator[None]:
+    from src.core import registry
+    from src.core.registry import ToolSpec, register_tool
+
+    register_tool(
+        ToolSpec(
+            name=BENCH_TOOL,
+            kind="function",
+            description="Echo the text back (benchmark tool).",
+            runner=lambda text="": {"echo": text},
+            parameters={
+                "type": "object",
+                "properties": {"text": {"type": "string"}},
+                "required": ["text"],
+            },
+        )
+    )
+
+    try:
+        yield
+    finally:
+        registry.unregister_tool(BENCH_TOOL)
+
+
+class Bench:
+    """A fake server, clients pointed at it and a scratch history log."""
+
+    def __init__(self, timing: Timing | None = None) -> None:
+        self.server = FakeResponsesServer(timing)
+        self._tmp = tempfile.TemporaryDirectory(prefix="neuro-bench-")
+        self.log_file = str(Path(self._tmp.name) / "history.jsonl")
+        self.client: Any = None
+
+    def __enter__(self) -> "Bench":
+        from src.core.transport import build_client
+
+        self.server.start()
+        self.client = build_client(base_url=self.server.base_url, api_key="bench")
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.server.stop()
+        self._tmp.cleanup()
+
+    def turn(self, prompt: str, **kwargs: Any) -> Any:
+        from src.core.runtime import run_turn
+
+        return run_turn(
+            client=self.client,
+            user=prompt,
+            log_file=self.log_file,
+            emit_output=False,
+            stall_policy=_quiet_stall_policy(),
+            **kwargs,
+        )
+
+    def raw_stream(self, prompt: str) -> int:
+        """Consume one response with the bare SDK; returns the event count."""
+
+        count = 0
+
+        with self.client.responses.stream(model="bench", input=prompt) as stream:
+            for _ in stream:
+                count += 1
+
+            stream.get_final_response()
+
+        return count
+
+
+def _timed(fn: Callable[[], Any], runs: int, warmup: int = 2) -> list[float]:
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+
+    return samples
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def _p95(samples: list[float]) -> float:
+    from src.core.stats import percentile
+
+    return percentile(samples, 95) or 0.0
+
+
+@contextmanager
+def _offscreen_console() -> Iterator[None]:
+    """Render the REPL's live Markdown into a buffer instead of the terminal."""
+
+    from rich.console import Console
+
+    from src.cli import pretty
+
+    original = pretty.console
+    pretty.console = Console(file=io.StringIO(), force_terminal=True, width=100)
+
+    try:
+        yield
+    finally:
+        pretty.console = original
+
+
+def measure_turn(runs: int) -> dict[str, float]:
+    with Bench() as bench:
+        samples = _timed(lambda: bench.turn("hello [words=40]"), runs)
+
+    return {
+        "turn.median_ms": _ms(statistics.median(samples)),
+        "turn.p95_ms": _ms(_p95(samples)),
+    }
+
+
+def measure_events(runs: int, words: int = 400) -> dict[str, float]:
+    from src.cli.pretty import live_markdown_stream
+
+    prompt = f"long answer [words={words}]"
+
+    with Bench() as bench:
+        events = bench.raw_stream(prompt)
+        raw = statistics.median(_timed(lambda: bench.raw_stream(prompt), runs))
+        bare = statistics.median(
+            _timed(lambda: bench.turn(prompt, stream_callback=lambda _: None), runs)
+        )
+
+        def rendered() -> None:
+            with live_markdown_stream() as callback:
+                bench.turn(prompt, stream_callback=callback)
+
+        with _offscreen_console():
+            render = statistics.median(_timed(rendered, max(3, runs // 4), warmup=1))
+
+    return {
+        "events.count": events,
+        "events.raw_stream_ms": _ms(raw),
+        "events.runtime_overhead_us": round(max(0.0, bare - raw) / events * 1e6, 2),
+        "events.render_overhead_us": round(max(0.0, render - raw) / events * 1e6, 2),
+    }
+
+
+def measure_tool_chain(runs: int) -> dict[str, float]:
+    prompt = f"probe [tool={BENCH_TOOL}] [calls=3] [words=40]"
+
+    with Bench() as bench, bench_tool():
+        # The chain is the call round trip plus a plain answer; whatever it
+        # takes beyond those two is dispatch, tool runs and the follow-up.
+        calls = statistics.median(_timed(lambda: bench.raw_stream(prompt), runs))
+        plain = statistics.median(_timed(lambda: bench.turn("hello [words=40]"), runs))
+        chain = statistics.median(_timed(lambda: bench.turn(prompt), runs))
+
+    return {
+        "tool_chain.median_ms": _ms(chain),
+        "tool_chain.overhead_ms": _ms(max(0.0, chain - calls - plain)),
+    }
+
+
+async def _sessions(bench: Bench, sessions: int, turns: int) -> float:
+    from src.core.runtime import run_turn_async
+    from src.core.transport import build_async_client
+
+    client = build_async_client(base_url=bench.server.base_url, api_key="bench")
+
+    async def session(index: int) -> None:
+        previous = None
+
+        for turn in range(turns):
+            result = await run_turn_async(
+                client=client,
+                user=f"session {index} turn {turn} [words=40]",
+                log_file=bench.log_file,
+                previous_response_id=previous,
+                stall_policy=_quiet_stall_policy(),
+            )
+            previous = result.response_id
+
+    try:
+        await session(-1)  # warm the pool and the SDK's models
+        started = time.perf_counter()
+        await asyncio.gather(*(session(index) for index in range(sessions)))
+        return sessions * turns / (time.perf_counter() - started)
+    finally:
+        await client.close()
+
+
+def measure_concurrency(runs: int, levels: tuple[int, ...] = CONCURRENCY) -> dict[str, float]:
+    turns = max(3, runs // 4)
+    results = {}
+
+    with Bench(Timing(ttft_s=0.05, delta_s=0.0005)) as bench:
+        for sessions in levels:
+            rate = asyncio.run(_sessions(bench, sessions, turns))
+            results[f"concurrency.{sessions}_sessions_turns_per_s"] = round(rate, 2)
+
+    return results
+
+
+SCENARIOS: dict[str, Callable[[int], dict[str, float]]] = {
+    "turn": measure_turn,
+    "events": measure_events,
+    "tool_chain": measure_tool_chain,
+    "concurrency": measure_concurrency,
+}
+
+
+def _unit(metric: str) -> str | None:
+    return next((suffix for suffix in SLACK if metric.endswith(suffix)), None)
+
+
+def compare(
+    results: dict[str, float],
+    baseline: dict[str, float],
+    tolerance: float,
+) -> list[str]:
+    """Regressions of `results` against `baseline`, as readable lines."""
+
+    regressions = []
+
+    for metric, value in results.items():
+        unit = _unit(metric)
+        base = baseline.get(metric)
+
+        if unit is None or base is None:
+            continue
+
+        if unit == "_per_s":
+            limit = base * (1 - tolerance)
+            worse = value < limit
+        else:
+            limit = base * (1 + tolerance) + SLACK[unit]
+            worse = value > limit
+
+        if worse:
+            regressions.append(f"{metric}: {value:g} (baseline {base:g}, limit {limit:.2f})")
+
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, float]:
+    if not path.exists():
+        return {}
+
+    return json.loads(path.read_text(encoding="utf-8")).get("results", {})
+
+
+def write_baseline(results: dict[str, float], path: Path = BASELINE_PATH) -> None:
+    document = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": dict(sorted(results.items())),
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+
+def run(names: list[str], runs: int, repeat: int = 1) -> dict[str, float]:
+    """
+    Median of each metric over `repeat` rounds of the scenarios.
+
+    Rounds are interleaved rather than back to back, so a burst of load on
+    the machine skews one sample of every metric instead of all samples of
+    one.
+    """
+
+    os.environ.setdefault("NEURO_DAEMON", "off")
+    samples: dict[str, list[float]] = {}
+
+    for _ in range(max(1, repeat)):
+        for name in names:
+            for metric, value in SCENARIOS[name](runs).items():
+                samples.setdefault(metric, []).append(value)
+
+    return {metric: round(statistics.median(values), 2) for metric, values in samples.items()}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3, help="Rounds to take the median of.")
+    parser.add_argument("--output", type=Path, help="Write results as JSON.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store these results as the new baseline instead of checking.",
+    )
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS))
+    args = parser.parse_args(argv)
+
+    results = run(args.scenarios, args.runs, args.repeat)
+    baseline = load_baseline(args.baseline)
+    tolerance = float(os.getenv("NEURO_BENCH_TOLERANCE", "0.5"))
+
+    for metric, value in results.items():
+        base = baseline.get(metric)
+        note = "" if base is None else f"  (baseline {base:g})"
+        print(f"{metric:<44} {value:>10g}{note}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if args.update_baseline:
+        write_baseline({**baseline, **results}, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, tolerance)
+
+    for line in regressions:
+        print(f"REGRESSED  {line}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
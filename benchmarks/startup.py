@@ -0,0 +1,138 @@
+# benchmarks/startup.py
+"""
+Cold-start benchmark for the neuro CLI.
+
+Each scenario runs in a fresh interpreter under `python -X importtime`, so
+the numbers include interpreter start-up and every import on that path. The
+run fails (exit 1) when a scenario's median wall time exceeds its budget.
+
+    python benchmarks/startup.py                  # measure and check
+    python benchmarks/startup.py --output r.json  # also keep the numbers
+    NEURO_STARTUP_BUDGET_SCALE=2 python benchmarks/startup.py  # slow machine
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# name -> (code run in a fresh interpreter, budget in milliseconds)
+SCENARIOS: dict[str, tuple[str, float]] = {
+    # What every `neuro "..."` pays before it can hand off to the daemon.
+    "thin_client": ("import main", 250.0),
+    # In-process fallback: tool schemas registered, runtime ready to stream.
+    "inline_fallback": (
+        "import main; main._register_tools(); import src.cli.inline, src.core.runtime",
+        2500.0,
+    ),
+}
+
+# Modules the thin client must never import.
+HEAVY_MODULES = (
+    "openai",
+    "httpx",
+    "rich",
+    "prompt_toolkit",
+    "requests",
+    "src.core.runtime",
+    "src.tools.homeassistant",
+    "src.tools.sandbox",
+)
+
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Cumulative microseconds per top-level import, from -X importtime."""
+
+    modules: dict[str, int] = {}
+
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+
+        # Nested imports are indented two spaces per level.
+        if match and len(match.group(3)) <= 1:
+            modules[match.group(4)] = int(match.group(2))
+
+    return modules
+
+
+def run_once(code: str) -> tuple[float, dict[str, int]]:
+    env = {**os.environ, "NEURO_DAEMON": "off", "PYTHONDONTWRITEBYTECODE": "1"}
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    if process.returncode != 0:
+        raise RuntimeError(f"{code!r} failed:\n{process.stderr[-2000:]}")
+
+    return wall_ms, parse_importtime(process.stderr)
+
+
+def measure(name: str, *, runs: int = 5, scale: float = 1.0) -> dict:
+    code, budget_ms = SCENARIOS[name]
+    # One untimed run warms the OS file cache and .pyc files.
+    run_once(code)
+    samples = [run_once(code) for _ in range(runs)]
+    walls = [wall for wall, _ in samples]
+    modules = samples[-1][1]
+    top = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:10]
+
+    return {
+        "scenario": name,
+        "runs": runs,
+        "median_ms": round(statistics.median(walls), 1),
+        "min_ms": round(min(walls), 1),
+        "budget_ms": budget_ms * scale,
+        "import_ms": round(sum(modules.values()) / 1000, 1),
+        "top_imports_ms": {module: round(us / 1000, 1) for module, us in top},
+        "heavy_imports": sorted(module for module in HEAVY_MODULES if module in modules),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="Write results as JSON.")
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS))
+    args = parser.parse_args(argv)
+
+    scale = float(os.getenv("NEURO_STARTUP_BUDGET_SCALE", "1"))
+    results = [measure(name, runs=args.runs, scale=scale) for name in args.scenarios]
+    failed = False
+
+    for result in results:
+        over = result["median_ms"] > result["budget_ms"]
+        failed |= over
+        print(
+            f"{result['scenario']:<16} median {result['median_ms']:>7.1f} ms "
+            f"(budget {result['budget_ms']:.0f} ms, imports {result['import_ms']:.1f} ms)"
+            f"{'  OVER BUDGET' if over else ''}"
+        )
+
+        for module, ms in list(result["top_imports_ms"].items())[:5]:
+            print(f"    {ms:>7.1f} ms  {module}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
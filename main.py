@@ -3,25 +3,24 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import itertools
 import os
-import platform
-import shlex
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
-from openai import OpenAI
-from rich.console import Console
-from rich.markdown import Markdown
 
-from src.cli.pretty import live_markdown_stream
+from src.cli import daemon
+from src.cli.inline import command_context
+from src.core.turnlog import default_log_file
 
-# Importing these modules registers their tools with Neuro.
-from src.tools import homeassistant  # noqa: F401
-from src.tools import sandbox  # noqa: F401
-from src.core.runtime import run_once, run_repl
+if TYPE_CHECKING:
+    from openai import OpenAI
 
-console = Console()
+# The runtime, tools, openai and rich are imported only on the paths that
+# need them, so a prompt answered by `neuro daemon` starts in milliseconds.
 
 PROJECT_ROOT = Path(__file__).resolve().parent
 ENV_FILE = PROJECT_ROOT / ".env"
@@ -33,12 +32,10 @@ NEURO_HOME = Path(
     )
 ).expanduser()
 
-LOG_FILE = Path(
-    os.getenv(
-        "NEURO_HISTORY_FILE",
-        NEURO_HOME / "history.md",
-    )
-).expanduser()
+# Structured JSONL turn log (NEURO_HISTORY_FILE, default
+# $NEURO_HOME/history.jsonl). Set NEURO_HISTORY_MARKDOWN=1 to also keep a
+# human-readable history.md next to it.
+LOG_FILE = default_log_file()
 
 DEFAULT_MODEL = os.getenv(
     "NEURO_MODEL",
@@ -46,33 +43,6 @@ DEFAULT_MODEL = os.getenv(
 )
 
 
-NORMAL_INSTRUCTIONS = """
-You are Neuro, a terminal-native AI assistant.
-
-Answer the user's request directly and accurately. You may use any available
-tools when they would improve the answer. The user may be invoking you from an
-interactive terminal, an inline shell command, a pipe, or a script.
-""".strip()
-
-
-COMMAND_INSTRUCTIONS = """
-You are Neuro operating in shell-command mode.
-
-Return only the shell command needed to complete the user's request.
-
-Requirements:
-- Do not use Markdown.
-- Do not use code fences.
-- Do not use backticks.
-- Do not include an explanation.
-- Do not include a label such as "Command:".
-- Do not include introductory or closing text.
-- Return one directly runnable command whenever possible.
-- Use available tools when needed to determine the correct command.
-- Never claim that a command was executed unless a tool actually executed it.
-""".strip()
-
-
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="neuro",
@@ -99,10 +69,110 @@ def build_parser() -> argparse.ArgumentParser:
         help="Suppress streaming and print only the final response.",
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Skip the command-mode response cache and ask the model again.",
+    )
+
     parser.add_argument(
         "--model",
         default=DEFAULT_MODEL,
-        help=f"Model to use. Default: {DEFAULT_MODEL}",
+        help=(
+            f"Model to use ('auto' picks a fast or heavy model per prompt). "
+            f"Default: {DEFAULT_MODEL}"
+        ),
+    )
+
+    parser.add_argument(
+        "--batch",
+        metavar="PROMPTS.jsonl",
+        help=(
+            "Run every prompt in a JSONL file (strings, or objects with "
+            "id/prompt or request_id/title/body) and write results as JSONL."
+        ),
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Requests to run at once in --batch and map-reduce modes. Default: 4",
+    )
+
+    parser.add_argument(
+        "--output",
+        metavar="RESULTS.jsonl",
+        help="Batch output file. Default: <input>.out.jsonl",
+    )
+
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Rerun every batch item instead of skipping ones already ok.",
+    )
+
+    parser.add_argument(
+        "--map-reduce",
+        dest="map_reduce",
+        action="store_true",
+        default=None,
+        help=(
+            "Process piped input in chunks and combine the partial answers. "
+            "Automatic when stdin exceeds NEURO_MAPREDUCE_THRESHOLD characters."
+        ),
+    )
+
+    parser.add_argument(
+        "--no-map-reduce",
+        dest="map_reduce",
+        action="store_false",
+        help="Always send piped input in a single request.",
+    )
+
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=None,
+        help="Approximate tokens per map-reduce chunk. Default: 8000",
+    )
+
+    parser.add_argument(
+        "--record",
+        metavar="CASSETTE.jsonl",
+        help="Append every streamed API response (events and timing) to a cassette.",
+    )
+
+    parser.add_argument(
+        "--replay",
+        metavar="CASSETTE.jsonl",
+        help="Answer from a recorded cassette instead of the API; tools replay recorded outputs.",
+    )
+
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        help="Replay pace: 1 = as recorded, 2 = twice as fast, 0 = no delays. Default: 1",
+    )
+
+    parser.add_argument(
+        "--trace",
+        metavar="TRACE.json|TRACE.jsonl",
+        help=(
+            "Write spans for turns, streams, tool runs, Home Assistant requests "
+            "and sandbox processes: .json in Chrome trace-event format, else JSONL. "
+            "Same as NEURO_TRACE."
+        ),
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Run each turn under cProfile and tracemalloc; reports go to "
+            "profiles/ next to the history log. Toggle in the REPL with :profile."
+        ),
     )
 
     parser.add_argument(
@@ -115,6 +185,175 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def build_history_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="neuro history",
+        description="Search past Neuro conversations",
+    )
+
+    actions = parser.add_subparsers(dest="action", required=True)
+
+    search = actions.add_parser("search", help="Full-text search past turns.")
+    search.add_argument("query", nargs="+", help="Words to search for.")
+    search.add_argument(
+        "-k",
+        "--limit",
+        type=int,
+        default=10,
+        help="Maximum number of turns to show. Default: 10",
+    )
+
+    recent = actions.add_parser("recent", help="Show the latest turns.")
+    recent.add_argument(
+        "-k",
+        "--limit",
+        type=int,
+        default=10,
+        help="Maximum number of turns to show. Default: 10",
+    )
+
+    return parser
+
+
+def run_history(argv: list[str]) -> int:
+    """Handle `neuro history ...` without contacting the model."""
+
+    from src.core.history import format_results, open_store
+
+    args = build_history_parser().parse_args(argv)
+    store = open_store(LOG_FILE)
+
+    if args.action == "search":
+        results = store.search(" ".join(args.query), limit=args.limit)
+    else:
+        results = store.recent(limit=args.limit)
+
+    print(format_results(results))
+    return 0
+
+
+def build_daemon_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="neuro daemon",
+        description=(
+            "Keep Neuro resident on a Unix socket so inline prompts start "
+            "instantly. Inline calls use it automatically when it is running "
+            "(NEURO_DAEMON=off to opt out)."
+        ),
+    )
+
+    parser.add_argument(
+        "action",
+        nargs="?",
+        choices=("start", "stop", "status"),
+        default="start",
+        help="start (foreground, default), stop or status.",
+    )
+
+    parser.add_argument(
+        "--model",
+        default=DEFAULT_MODEL,
+        help=f"Model for requests that do not name one. Default: {DEFAULT_MODEL}",
+    )
+
+    return parser
+
+
+def run_daemon(argv: list[str]) -> int:
+    """Handle `neuro daemon [start|stop|status]`."""
+
+    args = build_daemon_parser().parse_args(argv)
+    path = daemon.socket_path()
+
+    if args.action == "start":
+        LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        daemon.serve(
+            path=path,
+            log_file=str(LOG_FILE),
+            default_model=args.model,
+        )
+        return 0
+
+    try:
+        event = daemon.request({"op": "ping" if args.action == "status" else "stop"}, path=path)
+    except daemon.DaemonUnavailable:
+        print(f"neuro daemon: not running ({path})")
+        return 1
+
+    if args.action == "status":
+        print(f"neuro daemon: running, pid {event.get('pid')}, {event.get('served', 0)} requests served ({path})")
+    else:
+        print("neuro daemon: stopping")
+
+    return 0
+
+
+def build_serve_parser() -> argparse.ArgumentParser:
+    from src.cli.server import DEFAULT_PORT, DEFAULT_WORKERS
+
+    parser = argparse.ArgumentParser(
+        prog="neuro serve",
+        description=(
+            "Serve Neuro over a local HTTP API: sessions keep their own "
+            "conversation, turns stream text and tool events over SSE. "
+            "Set NEURO_SERVE_TOKEN to require a bearer token."
+        ),
+    )
+
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address to bind. Default: 127.0.0.1",
+    )
+
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port to bind. Default: {DEFAULT_PORT}",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("NEURO_SERVE_WORKERS", DEFAULT_WORKERS)),
+        help=f"Turns run at once across all sessions (NEURO_SERVE_WORKERS). Default: {DEFAULT_WORKERS}",
+    )
+
+    parser.add_argument(
+        "--model",
+        default=DEFAULT_MODEL,
+        help=f"Model for sessions that do not name one. Default: {DEFAULT_MODEL}",
+    )
+
+    return parser
+
+
+def run_serve(argv: list[str]) -> int:
+    """Handle `neuro serve`."""
+
+    from src.cli import server
+
+    args = build_serve_parser().parse_args(argv)
+    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    server.serve(
+        log_file=str(LOG_FILE),
+        default_model=args.model,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+    )
+    return 0
+
+
+# `neuro <name> ...` subcommands. Anything else is treated as a prompt.
+SUBCOMMANDS = {
+    "history": run_history,
+    "daemon": run_daemon,
+    "serve": run_serve,
+}
+
+
 def read_stdin() -> str:
     """Read piped input without blocking normal interactive terminal use."""
 
@@ -124,6 +363,90 @@ def read_stdin() -> str:
     return sys.stdin.read().strip()
 
 
+def peek_stdin(limit: int) -> tuple[list[str], bool]:
+    """
+    Read piped lines until more than `limit` characters have arrived.
+
+    Returns (lines read, whether stdin is exhausted). Input beyond the
+    limit stays unread so map-reduce can stream it.
+    """
+
+    if sys.stdin.isatty():
+        return [], True
+
+    lines = []
+    size = 0
+
+    for line in sys.stdin:
+        lines.append(line)
+        size += len(line)
+
+        if size > limit:
+            return lines, False
+
+    return lines, True
+
+
+def make_client(args: argparse.Namespace) -> OpenAI:
+    """The API client, or a cassette recorder / replayer standing in for it."""
+
+    if args.replay:
+        from src.core.cassette import Cassette, ReplayClient, stub_tools
+
+        _register_tools()
+        cassette = Cassette.load(args.replay)
+        # For the life of the process: replayed turns never run real tools.
+        stub_tools(cassette)
+        return ReplayClient(cassette, speed=args.replay_speed)
+
+    from src.core.transport import build_client
+
+    client = build_client()
+
+    if args.record:
+        from src.core.cassette import RecordingClient
+
+        return RecordingClient(client, args.record)
+
+    return client
+
+
+def run_map_reduce(
+    *,
+    client: OpenAI,
+    instruction: str,
+    lines,
+    model: str,
+    quiet: bool,
+    concurrency: int,
+    chunk_tokens: int | None,
+) -> int:
+    """Answer over piped input that is too large for one request."""
+
+    from src.cli.mapreduce import DEFAULT_CHUNK_TOKENS, map_reduce
+
+    options = {
+        "client": client,
+        "instruction": instruction or "Summarize this input.",
+        "lines": lines,
+        "log_file": str(LOG_FILE),
+        "model": model,
+        "concurrency": concurrency,
+        "chunk_tokens": chunk_tokens or DEFAULT_CHUNK_TOKENS,
+    }
+
+    if quiet:
+        print(map_reduce(**options).text)
+        return 0
+
+    from src.cli.pretty import live_markdown_stream
+
+    with live_markdown_stream() as stream_callback:
+        map_reduce(**options, stream_callback=stream_callback)
+
+    return 0
+
+
 def combine_prompt(
     argument_prompt: str,
     stdin_text: str,
@@ -143,73 +466,83 @@ def combine_prompt(
     return stdin_text
 
 
-def command_context() -> str:
-    """
-    Give command mode enough local context to choose an appropriate command.
-
-    This does not execute anything.
-    """
-
-    shell_path = os.getenv("SHELL", "")
-    shell_name = Path(shell_path).name if shell_path else "unknown"
-    current_directory = Path.cwd()
-
-    return (
-        f"Operating system: {platform.system()}\n"
-        f"Shell: {shell_name}\n"
-        f"Current directory: {current_directory}"
-    )
-
-
 def run_inline(
     *,
-    client: OpenAI,
+    client: OpenAI | None,
     prompt: str,
     model: str,
     command_mode: bool,
     quiet: bool,
+    use_cache: bool = True,
 ) -> int:
-    """Run one inline Neuro request."""
+    """
+    Run one inline Neuro request.
 
-    if command_mode:
-        prompt = f"Only output the shell command:\n\n{prompt}"
+    Goes through a running `neuro daemon` when there is one; otherwise the
+    request runs in this process with the given (or a freshly built) client.
+    """
 
     # Command and quiet modes must remain plain for shell usage,
     # pipes, command substitution, and scripts.
-    if command_mode or quiet:
-        result = run_once(
-            client=client,
-            prompt=prompt,
-            log_file=str(LOG_FILE),
-            model=model,
-            emit_output=False,
-        )
-
-        print(result.text.strip())
+    plain = command_mode or quiet
+    options = {
+        "prompt": prompt,
+        "model": model,
+        "command_mode": command_mode,
+        "use_cache": use_cache,
+        "context": command_context() if command_mode else None,
+    }
+
+    if plain:
+        text = _answer(client, options)
+        print(text)
         return 0
 
     # Normal inline mode streams through Rich Live Markdown.
+    from src.cli.pretty import live_markdown_stream
+
     with live_markdown_stream() as stream_callback:
-        run_once(
-            client=client,
-            prompt=prompt,
-            log_file=str(LOG_FILE),
-            model=model,
-            emit_output=False,
-            stream_callback=stream_callback,
-        )
+        _answer(client, options, on_text=stream_callback)
 
     return 0
 
 
+def _answer(client, options: dict, on_text=None) -> str:
+    if client is None and daemon.daemon_enabled():
+        try:
+            return daemon.ask(**options, on_text=on_text)
+        except daemon.DaemonUnavailable:
+            pass
+
+    from src.cli.inline import answer_inline
+    from src.core.transport import build_client
+
+    _register_tools()
+
+    return answer_inline(
+        client=client or build_client(),
+        log_file=str(LOG_FILE),
+        on_text=on_text,
+        **options,
+    )
+
+
+def _register_tools() -> None:
+    # Registers every tool's schema; modules load on their first call.
+    import src.tools  # noqa: F401
+
+
 def run_interactive(
     *,
     client: OpenAI,
     model: str,
     cli_mode: str,
+    profile: bool = False,
 ) -> int:
     """Start Neuro's existing interactive interface."""
 
+    _register_tools()
+
     if cli_mode == "pretty":
         from src.cli.pretty import run as run_pretty
 
@@ -217,12 +550,16 @@ def run_interactive(
             client=client,
             log_file=str(LOG_FILE),
             default_model=model,
+            profile=profile,
         )
     else:
+        from src.core.runtime import run_repl
+
         run_repl(
             client=client,
             log_file=str(LOG_FILE),
             model=model,
+            profile=profile,
         )
 
     return 0
@@ -234,6 +571,11 @@ def main() -> int:
         override=True,
     )
 
+    argv = sys.argv[1:]
+
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+
     parser = build_parser()
     args = parser.parse_args()
 
@@ -242,25 +584,83 @@ def main() -> int:
         exist_ok=True,
     )
 
+    if args.trace:
+        from src.core import tracing
+
+        tracing.configure(args.trace)
+
+    if args.batch:
+        from src.cli.batch import run_batch
+
+        _register_tools()
+
+        failures = run_batch(
+            client=make_client(args),
+            input_path=args.batch,
+            output_path=args.output,
+            log_file=str(LOG_FILE),
+            model=args.model,
+            concurrency=args.concurrency,
+            resume=not args.no_resume,
+        )
+        return 1 if failures else 0
+
     argument_prompt = " ".join(args.prompt).strip()
-    stdin_text = read_stdin()
+
+    if args.map_reduce is False:
+        stdin_text = read_stdin()
+    else:
+        from src.cli.mapreduce import MAPREDUCE_THRESHOLD
+
+        head, exhausted = peek_stdin(MAPREDUCE_THRESHOLD)
+
+        if head and (args.map_reduce or not exhausted):
+            return run_map_reduce(
+                client=make_client(args),
+                instruction=argument_prompt,
+                lines=itertools.chain(head, sys.stdin),
+                model=args.model,
+                quiet=args.quiet or args.command,
+                concurrency=args.concurrency,
+                chunk_tokens=args.chunk_tokens,
+            )
+
+        stdin_text = "".join(head).strip()
+
     prompt = combine_prompt(argument_prompt, stdin_text)
 
-    client = OpenAI()
+    # Cassettes need this process's client, and traces and profiles its
+    # spans and stacks, so they all bypass the daemon.
+    local = bool(args.record or args.replay or args.trace or args.profile)
 
     if prompt:
-        return run_inline(
-            client=client,
+        # No client yet: a running daemon may answer without one.
+        inline = functools.partial(
+            run_inline,
+            client=make_client(args) if local else None,
             prompt=prompt,
             model=args.model,
             command_mode=args.command,
             quiet=args.quiet,
+            use_cache=not args.no_cache,
         )
 
+        if not args.profile:
+            return inline()
+
+        from src.core.profiling import print_summary, profile_turn
+
+        with profile_turn(LOG_FILE, label="inline") as profiler:
+            code = inline()
+
+        print_summary(profiler.profile)
+        return code
+
     return run_interactive(
-        client=client,
+        client=make_client(args),
         model=args.model,
         cli_mode=args.cli,
+        profile=args.profile,
     )
 
 
@@ -0,0 +1,200 @@
+# src/cli/batch.py
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from src.core.runtime import run_once
+
+
+@dataclass
+class BatchItem:
+    id: str
+    prompt: str
+    model: str | None = None
+
+
+def _item_from_line(value: Any, line_number: int) -> BatchItem:
+    """Accept a bare string or an object with prompt/input or title+body."""
+
+    if isinstance(value, str):
+        return BatchItem(id=str(line_number), prompt=value)
+
+    if not isinstance(value, dict):
+        raise ValueError("expected a JSON string or object")
+
+    item_id = value.get("id", value.get("request_id", line_number))
+    prompt = value.get("prompt") or value.get("input")
+
+    if not prompt:
+        prompt = "\n\n".join(
+            str(value[key]) for key in ("title", "body") if value.get(key)
+        )
+
+    if not prompt:
+        raise ValueError("no prompt/input/title/body field")
+
+    return BatchItem(id=str(item_id), prompt=str(prompt), model=value.get("model"))
+
+
+def load_items(path: str | Path) -> list[BatchItem]:
+    items = []
+    seen: set[str] = set()
+
+    with Path(path).open(encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            line = line.strip()
+
+            if not line:
+                continue
+
+            try:
+                item = _item_from_line(json.loads(line), line_number)
+            except Exception as error:
+                raise ValueError(f"{path}:{line_number}: {error}") from error
+
+            if item.id in seen:
+                raise ValueError(f"{path}:{line_number}: duplicate id {item.id!r}")
+
+            seen.add(item.id)
+            items.append(item)
+
+    return items
+
+
+def completed_ids(output_path: str | Path) -> set[str]:
+    """IDs that already succeeded in a previous run (the checkpoint)."""
+
+    path = Path(output_path)
+
+    if not path.exists():
+        return set()
+
+    done = set()
+
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write can leave a partial last line.
+                continue
+
+            if record.get("ok"):
+                done.add(str(record.get("id")))
+
+    return done
+
+
+def default_output_path(input_path: str | Path) -> Path:
+    path = Path(input_path)
+    return path.with_name(f"{path.stem}.out.jsonl")
+
+
+def run_batch(
+    *,
+    client,
+    input_path: str | Path,
+    log_file: str,
+    model: str,
+    output_path: str | Path | None = None,
+    concurrency: int = 4,
+    resume: bool = True,
+    instructions: str | None = None,
+    runner: Callable[..., Any] = run_once,
+) -> int:
+    """
+    Run every prompt in a JSONL file with bounded concurrency.
+
+    Results are appended to the output JSONL in completion order, one line
+    per item, flushed as they finish. With resume, items already recorded
+    as ok are skipped. A failing item is recorded and the batch continues.
+
+    Returns the number of failed items.
+    """
+
+    items = load_items(input_path)
+    output = Path(output_path) if output_path else default_output_path(input_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    skip = completed_ids(output) if resume else set()
+    pending = [item for item in items if item.id not in skip]
+
+    if not resume and output.exists():
+        output.unlink()
+
+    total = len(pending)
+    print(
+        f"[batch] {total} to run, {len(items) - total} already done -> {output}",
+        file=sys.stderr,
+    )
+
+    write_lock = threading.Lock()
+    failures = 0
+    finished = 0
+
+    def run_item(item: BatchItem) -> dict[str, Any]:
+        started = time.perf_counter()
+        item_model = item.model or model
+
+        try:
+            result = runner(
+                client=client,
+                prompt=item.prompt,
+                log_file=log_file,
+                model=item_model,
+                instructions=instructions,
+                emit_output=False,
+            )
+            record = {
+                "id": item.id,
+                "ok": True,
+                "model": item_model,
+                "text": result.text.strip(),
+                "response_id": result.response_id,
+                "tools_used": result.tools_used,
+            }
+        except Exception as error:
+            record = {
+                "id": item.id,
+                "ok": False,
+                "model": item_model,
+                "error": f"{type(error).__name__}: {error}",
+            }
+
+        record["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return record
+
+    with output.open("a", encoding="utf-8") as out:
+        with ThreadPoolExecutor(
+            max_workers=max(1, concurrency),
+            thread_name_prefix="neuro-batch",
+        ) as pool:
+            futures = [pool.submit(run_item, item) for item in pending]
+
+            for future in as_completed(futures):
+                record = future.result()
+
+                with write_lock:
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+
+                finished += 1
+
+                if not record["ok"]:
+                    failures += 1
+
+                status = "ok" if record["ok"] else f"FAILED ({record['error']})"
+                print(
+                    f"[batch] {finished}/{total} {record['id']} {status} "
+                    f"{record['duration_ms'] / 1000:.1f}s",
+                    file=sys.stderr,
+                )
+
+    return failures
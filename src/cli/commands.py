@@ -9,13 +9,22 @@ HELP_TEXT = """[bold cyan]:commands[/]
   :help                  Show this help
   :clear                 Clear screen and redraw header
   :refresh               Reset the thread (forget previous turns)
-  :setmodel <name>       Switch model (e.g., gpt-5-mini)
+  :setmodel <name>       Switch model (e.g., gpt-5-mini; 'auto' routes per prompt)
   :models                Show a few example models
   :config                Show current runtime bits
+  :cache [clear]         Show tool result cache hit/miss counters (or clear it)
+  :history <query>       Search past conversations (no query: latest turns)
+  :stats [reset]         Rolling p50/p95 latency and token figures for this session
+  :stats models          Per-model latency and auto-routing counts
+  :profile on|off        cProfile + tracemalloc report after every turn
+  :bg <prompt>           Run a turn in the background (same as ending it with &)
+  :jobs                  List background jobs
+  :fg [id]               Reattach to a job's stream (default: latest) and continue from it
   :quit / :exit          Quit
 """
 
 EXAMPLE_MODELS = [
+    "auto",
     "gpt-5.6-sol",
     "gpt-5.6-terra",
     "gpt-5.6-luna",
@@ -29,9 +38,71 @@ def _models_table():
     t.add_column("Model", style="green", no_wrap=True)
     t.add_column("Notes", style="white")
     for m in EXAMPLE_MODELS:
+        if m == "auto":
+            t.add_row(m, "Fast model for simple prompts, heavy model otherwise")
+            continue
         t.add_row(m, "Available via OpenAI Responses API")
     return t
 
+def _fmt_stat(name, value):
+    if value is None:
+        return "-"
+    if name.endswith("_s"):
+        return f"{value * 1000:.0f} ms"
+    if name.endswith("_pct"):
+        return f"{value:.0f}%"
+    return f"{value:g}"
+
+
+def _stats_table():
+    from src.core.stats import session_stats
+
+    t = Table(title=f"Session Stats ({len(session_stats)} turns)")
+    t.add_column("Metric", style="cyan", no_wrap=True)
+    t.add_column("n", justify="right")
+    t.add_column("p50", justify="right", style="green")
+    t.add_column("p95", justify="right", style="yellow")
+    for name, row in session_stats.summary().items():
+        t.add_row(name, str(row["n"]), _fmt_stat(name, row["p50"]), _fmt_stat(name, row["p95"]))
+    return t
+
+
+def _model_stats_table():
+    from src.core.model_router import model_router
+    from src.core.stats import session_stats
+
+    routed = model_router.stats()
+    t = Table(title="Per-Model Latency")
+    t.add_column("Model", style="green", no_wrap=True)
+    t.add_column("turns", justify="right")
+    t.add_column("redone", justify="right", style="red")
+    t.add_column("ttft p50", justify="right")
+    t.add_column("ttft p95", justify="right", style="yellow")
+    t.add_column("total p50", justify="right")
+    t.add_column("total p95", justify="right", style="yellow")
+    t.add_column("cached p50", justify="right", style="cyan")
+    for model in session_stats.models():
+        summary = session_stats.summary(model)
+        ttft, total = summary["ttft_s"], summary["total_s"]
+        t.add_row(
+            model,
+            str(total["n"]),
+            str(session_stats.discarded(model)),
+            _fmt_stat("ttft_s", ttft["p50"]),
+            _fmt_stat("ttft_s", ttft["p95"]),
+            _fmt_stat("total_s", total["p50"]),
+            _fmt_stat("total_s", total["p95"]),
+            _fmt_stat("cached_pct", summary["cached_pct"]["p50"]),
+        )
+    if routed:
+        t.caption = (
+            f"auto: {model_router.fast_model} x{routed.get('fast', 0)}, "
+            f"{model_router.heavy_model} x{routed.get('heavy', 0)} "
+            f"({routed.get('escalated', 0)} escalated)"
+        )
+    return t
+
+
 def command_handler_factory(context_getter):
     """
     context_getter() must return a dict with keys: model (str), log_file (str)
@@ -71,6 +142,69 @@ def command_handler_factory(context_getter):
             console.print(f"[cyan]Log file:[/] {ctx.get('log_file')}")
             return {"handled": True}
 
+        if c.startswith(":cache"):
+            from src.core.cache import cache_stats, tool_cache
+
+            if c.split()[1:] == ["clear"]:
+                tool_cache.clear()
+                console.print("[cyan]Tool cache cleared.[/]")
+                return {"handled": True}
+            stats = cache_stats()
+            t = Table(title="Tool Result Cache")
+            t.add_column("Metric", style="cyan", no_wrap=True)
+            t.add_column("Value", style="white")
+            for k, v in stats.items():
+                t.add_row(k, str(v))
+            console.print(t)
+            return {"handled": True}
+
+        if c == ":history" or c.startswith(":history "):
+            from src.core.history import format_results, open_store
+
+            ctx = context_getter() or {}
+            query = c[len(":history"):].strip()
+            store = open_store(ctx.get("log_file"))
+            results = store.search(query, limit=10) if query else store.recent(limit=10)
+            console.print(format_results(results), markup=False, highlight=False)
+            return {"handled": True}
+
+        if c.startswith(":stats"):
+            if c.split()[1:] == ["reset"]:
+                from src.core.stats import session_stats
+
+                session_stats.clear()
+                console.print("[cyan]Session stats cleared.[/]")
+                return {"handled": True}
+            if c.split()[1:] == ["models"]:
+                console.print(_model_stats_table())
+                return {"handled": True}
+            console.print(_stats_table())
+            return {"handled": True}
+
+        if c.startswith(":profile"):
+            parts = c.split()
+            if parts[1:] not in (["on"], ["off"]):
+                console.print("[yellow]Usage:[/] :profile on|off")
+                return {"handled": True}
+            return {"handled": True, "profile": parts[1] == "on"}
+
+        if c == ":bg" or c.startswith(":bg "):
+            prompt = c[len(":bg"):].strip()
+            if not prompt:
+                console.print("[yellow]Usage:[/] :bg <prompt>")
+                return {"handled": True}
+            return {"handled": True, "background": prompt}
+
+        if c == ":jobs":
+            return {"handled": True, "list_jobs": True}
+
+        if c == ":fg" or c.startswith(":fg "):
+            parts = c.split()
+            if len(parts) > 2 or (len(parts) == 2 and not parts[1].lstrip("%").isdigit()):
+                console.print("[yellow]Usage:[/] :fg [job_id]")
+                return {"handled": True}
+            return {"handled": True, "foreground": int(parts[1].lstrip("%")) if len(parts) == 2 else None}
+
         if c == ":":
             console.print(HELP_TEXT)
             return {"handled": True}
@@ -0,0 +1,313 @@
+# src/cli/daemon.py
+"""
+Resident Neuro daemon and its thin client.
+
+`neuro daemon` imports the runtime, registers the tools, builds one tuned
+client and then answers inline prompts over a Unix socket, so each
+`neuro "..."` call skips the imports, .env parsing and TLS handshakes.
+
+The wire format is newline-delimited JSON. The client sends one request
+object; the daemon answers with any number of {"type": "text"} events
+(the accumulated answer so far) followed by {"type": "done"} or
+{"type": "error"}.
+
+This module only imports the standard library at the top level: the client
+half runs on every inline invocation and must stay cheap.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+PROTOCOL_VERSION = 1
+
+# Wait this long for a daemon to accept before running in-process instead.
+CONNECT_TIMEOUT = 0.5
+
+
+class DaemonUnavailable(Exception):
+    """No daemon answered; the caller should run the request itself."""
+
+
+def socket_path() -> Path:
+    configured = os.getenv("NEURO_SOCKET")
+
+    if configured:
+        return Path(configured).expanduser()
+
+    neuro_home = Path(os.getenv("NEURO_HOME", Path.home() / ".neuro")).expanduser()
+    return neuro_home / "neuro.sock"
+
+
+def daemon_enabled() -> bool:
+    """NEURO_DAEMON=off makes the client never try the socket."""
+
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+
+    return os.getenv("NEURO_DAEMON", "auto").lower() not in {"0", "false", "no", "off"}
+
+
+# ---------------------------------------------------------------- client
+
+
+def _connect(path: Path) -> socket.socket:
+    if not path.exists():
+        raise DaemonUnavailable(f"no socket at {path}")
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+
+    try:
+        sock.connect(str(path))
+    except OSError as error:
+        sock.close()
+        raise DaemonUnavailable(str(error)) from error
+
+    # Answers can take minutes; only the connect is time-bounded.
+    sock.settimeout(None)
+    return sock
+
+
+def request(
+    payload: dict[str, Any],
+    *,
+    path: Path | None = None,
+    on_text: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Send one request and return the daemon's final event.
+
+    Raises DaemonUnavailable if nothing is listening; errors reported by a
+    running daemon come back as {"type": "error", "message": ...}.
+    """
+
+    sock = _connect(path or socket_path())
+
+    with sock, sock.makefile("rwb") as stream:
+        stream.write(
+            json.dumps({"v": PROTOCOL_VERSION, **payload}).encode("utf-8") + b"\n"
+        )
+        stream.flush()
+
+        for line in stream:
+            event = json.loads(line)
+
+            if event.get("type") == "text":
+                if on_text:
+                    on_text(event.get("text", ""))
+                continue
+
+            return event
+
+    # The daemon went away mid-answer.
+    return {"type": "error", "message": "daemon closed the connection"}
+
+
+def ask(
+    *,
+    prompt: str,
+    model: str,
+    command_mode: bool,
+    use_cache: bool,
+    context: str | None,
+    on_text: Callable[[str], None] | None = None,
+    path: Path | None = None,
+) -> str:
+    """Forward an inline prompt; returns the answer or raises."""
+
+    event = request(
+        {
+            "op": "ask",
+            "prompt": prompt,
+            "model": model,
+            "command_mode": command_mode,
+            "use_cache": use_cache,
+            "context": context,
+            "stream": on_text is not None,
+        },
+        path=path,
+        on_text=on_text,
+    )
+
+    if event.get("type") != "done":
+        raise RuntimeError(event.get("message") or "daemon request failed")
+
+    return event.get("text", "")
+
+
+# ---------------------------------------------------------------- server
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "NeuroDaemon"
+
+    def _send(self, event: dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        try:
+            payload = json.loads(self.rfile.readline() or b"{}")
+        except ValueError:
+            self._send({"type": "error", "message": "malformed request"})
+            return
+
+        op = payload.get("op")
+
+        try:
+            if op == "ping":
+                self._send({"type": "done", "pid": os.getpid(), "served": self.server.served})
+            elif op == "stop":
+                self._send({"type": "done"})
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            elif op == "ask":
+                self._ask(payload)
+            else:
+                self._send({"type": "error", "message": f"unknown op: {op}"})
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away (e.g. Ctrl-C); the turn is still logged.
+            pass
+
+    def _ask(self, payload: dict[str, Any]) -> None:
+        from src.cli.inline import answer_inline
+
+        alive = True
+
+        def on_text(text: str) -> None:
+            nonlocal alive
+
+            if not alive:
+                return
+
+            try:
+                self._send({"type": "text", "text": text})
+            except OSError:
+                alive = False
+
+        try:
+            text = answer_inline(
+                client=self.server.client,
+                prompt=payload["prompt"],
+                model=payload.get("model") or self.server.default_model,
+                log_file=self.server.log_file,
+                command_mode=bool(payload.get("command_mode")),
+                use_cache=bool(payload.get("use_cache", True)),
+                context=payload.get("context"),
+                on_text=on_text if payload.get("stream") else None,
+            )
+        except Exception as error:
+            self._send({"type": "error", "message": f"{type(error).__name__}: {error}"})
+            return
+        finally:
+            self.server.note_served()
+
+        self._send({"type": "done", "text": text})
+
+
+class NeuroDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix-socket server sharing one client, registry and tool caches."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        client,
+        log_file: str,
+        default_model: str,
+    ) -> None:
+        self.path = Path(path)
+        self.client = client
+        self.log_file = log_file
+        self.default_model = default_model
+        self.served = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _clear_stale_socket(self.path)
+
+        # Only the owner may talk to the daemon: it acts with their tokens.
+        old_umask = os.umask(0o177)
+
+        try:
+            super().__init__(str(self.path), _Handler)
+        finally:
+            os.umask(old_umask)
+
+    def note_served(self) -> None:
+        # Handlers run on their own threads; += is not atomic.
+        with self._lock:
+            self.served += 1
+
+    def server_close(self) -> None:
+        super().server_close()
+
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _clear_stale_socket(path: Path) -> None:
+    if not path.exists():
+        return
+
+    try:
+        request({"op": "ping"}, path=path)
+    except DaemonUnavailable:
+        path.unlink()
+        return
+
+    raise RuntimeError(f"A Neuro daemon is already listening on {path}")
+
+
+def serve(
+    *,
+    log_file: str,
+    default_model: str,
+    path: Path | None = None,
+    client=None,
+) -> None:
+    """Run the daemon in the foreground until stopped."""
+
+    # Imported here, once, so each request finds everything resident
+    # (tool modules included: their HTTP sessions and caches stay warm).
+    from src.tools.manifest import load_all
+    from src.core.transport import build_client, keep_warm, prewarm
+
+    load_all()
+    client = client or build_client()
+    server = NeuroDaemon(
+        path or socket_path(),
+        client=client,
+        log_file=log_file,
+        default_model=default_model,
+    )
+    stop = threading.Event()
+
+    threading.Thread(
+        target=keep_warm,
+        args=(client, stop),
+        name="neuro-keep-warm",
+        daemon=True,
+    ).start()
+    prewarm(client, force=True)
+
+    print(f"neuro daemon listening on {server.path} (pid {os.getpid()})", file=sys.stderr)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
@@ -0,0 +1,96 @@
+# src/cli/inline.py
+from __future__ import annotations
+
+import os
+import platform
+from pathlib import Path
+from typing import Callable
+
+
+def command_context(cwd: str | Path | None = None) -> str:
+    """
+    Give command mode enough local context to choose an appropriate command.
+
+    This does not execute anything.
+    """
+
+    shell_path = os.getenv("SHELL", "")
+    shell_name = Path(shell_path).name if shell_path else "unknown"
+    current_directory = Path(cwd) if cwd else Path.cwd()
+
+    return (
+        f"Operating system: {platform.system()}\n"
+        f"Shell: {shell_name}\n"
+        f"Current directory: {current_directory}"
+    )
+
+
+def answer_inline(
+    *,
+    client,
+    prompt: str,
+    model: str,
+    log_file: str,
+    command_mode: bool,
+    use_cache: bool = True,
+    context: str | None = None,
+    on_text: Callable[[str], None] | None = None,
+) -> str:
+    """
+    Answer one inline request and return the final text.
+
+    Shared by in-process runs and the daemon. In command mode answers are
+    served from / stored in the response cache, keyed on the caller's
+    context (OS, shell, cwd). `on_text` receives the accumulated text while
+    it streams; command answers are never streamed.
+    """
+
+    from src.core.runtime import run_once
+
+    cache = None
+    cache_key = None
+
+    if command_mode:
+        # Command answers depend on the prompt, the model and where the user
+        # is (OS, shell, cwd); identical lookups are answered from disk.
+        try:
+            from src.core.response_cache import cache_key as make_cache_key
+            from src.core.response_cache import get_cache
+
+            # One connection per process: the daemon answers many requests.
+            cache = get_cache()
+            cache_key = make_cache_key(
+                prompt=prompt,
+                model=model,
+                context=context or command_context(),
+            )
+
+            cached = cache.get(cache_key) if use_cache else None
+        except Exception:
+            cache = None
+            cached = None
+
+        if cached is not None:
+            return cached
+
+    result = run_once(
+        client=client,
+        prompt=prompt,
+        log_file=log_file,
+        model=model,
+        emit_output=False,
+        stream_callback=None if command_mode else on_text,
+        # Shell commands never need a web search round trip; the mode also
+        # picks COMMAND_INSTRUCTIONS and the prompt cache key.
+        tool_mode="command" if command_mode else "chat",
+    )
+
+    text = result.text.strip()
+
+    if cache is not None and text:
+        from src.core.response_cache import replayable
+
+        if replayable(result.tools_used):
+            cache.put(cache_key, text)
+
+    return text
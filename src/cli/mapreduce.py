@@ -0,0 +1,313 @@
+# src/cli/mapreduce.py
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator
+
+# Token counts are estimated; ~4 characters per token holds for English
+# prose, logs and code closely enough to size chunks.
+CHARS_PER_TOKEN = 4
+
+DEFAULT_CHUNK_TOKENS = int(os.getenv("NEURO_CHUNK_TOKENS", "8000"))
+
+# Piped input larger than this (characters) is map-reduced automatically.
+MAPREDUCE_THRESHOLD = int(os.getenv("NEURO_MAPREDUCE_THRESHOLD", "400000"))
+
+# What a map call answers when its chunk has nothing relevant.
+NOTHING = "NONE"
+
+# Intermediate reduce passes before the final answer, at most.
+MAX_REDUCE_ROUNDS = 4
+
+# A partial answer: (first part, last part, text); parts are 1-based.
+Note = tuple[int, int, str]
+
+
+@dataclass
+class Chunk:
+    index: int
+    text: str
+    first_line: int
+    last_line: int
+
+
+@dataclass
+class MapReduceResult:
+    text: str
+    chunks: int
+    relevant: int
+    failed: list[int] = field(default_factory=list)
+    reduce_rounds: int = 0
+    duration_s: float = 0.0
+
+
+def _split_long_line(line: str, max_chars: int) -> Iterator[str]:
+    """Cut an oversized line at whitespace near the limit."""
+
+    while len(line) > max_chars:
+        cut = line.rfind(" ", 0, max_chars)
+
+        if cut < max_chars // 2:
+            cut = max_chars
+
+        yield line[:cut]
+        line = line[cut:]
+
+    if line:
+        yield line
+
+
+def iter_chunks(lines: Iterable[str], *, max_chars: int) -> Iterator[Chunk]:
+    """
+    Group lines into chunks of at most max_chars, never splitting a line
+    unless it alone exceeds the limit. Reads lazily, so a 50 MB pipe is
+    never held in memory at once.
+    """
+
+    buffer: list[str] = []
+    size = 0
+    first_line = 1
+    index = 0
+
+    def flush(last_line: int) -> Chunk:
+        nonlocal buffer, size, index
+        chunk = Chunk(index, "".join(buffer), first_line, last_line)
+        buffer, size = [], 0
+        index += 1
+        return chunk
+
+    line_number = 0
+
+    for line_number, line in enumerate(lines, start=1):
+        for piece in _split_long_line(line, max_chars):
+            if buffer and size + len(piece) > max_chars:
+                yield flush(line_number - 1 if piece is line else line_number)
+                first_line = line_number
+
+            buffer.append(piece)
+            size += len(piece)
+
+    if buffer:
+        yield flush(line_number)
+
+
+def map_prompt(instruction: str, chunk: Chunk) -> str:
+    return (
+        f"{instruction}\n\n"
+        f"The input is too large to read at once. Below is part {chunk.index + 1} "
+        f"(lines {chunk.first_line}-{chunk.last_line}). Apply the request to this "
+        "part only and answer with concise notes another pass will combine: keep "
+        "concrete details (counts, names, line numbers, quotes) and skip "
+        f"preamble. If nothing in this part is relevant, answer exactly {NOTHING}.\n\n"
+        f"--- part {chunk.index + 1} ---\n{chunk.text}"
+    )
+
+
+def _label(first: int, last: int) -> str:
+    return f"part {first}" if first == last else f"parts {first}-{last}"
+
+
+def reduce_prompt(
+    instruction: str,
+    notes: list[Note],
+    *,
+    total_chunks: int,
+    failed: list[int],
+    final: bool,
+) -> str:
+    body = "\n\n".join(
+        f"--- notes for {_label(first, last)} ---\n{text}"
+        for first, last, text in notes
+    )
+    gaps = (
+        f"\nParts {', '.join(str(index + 1) for index in failed)} could not be "
+        "processed; say so if it matters."
+        if failed
+        else ""
+    )
+    task = (
+        "Combine them into one complete answer to the request for the whole input."
+        if final
+        else "Merge them into one set of notes, keeping every concrete detail."
+    )
+
+    return (
+        f"{instruction}\n\n"
+        f"The input was split into {total_chunks} parts that were processed "
+        f"separately; parts with nothing relevant were dropped. {task}{gaps}\n\n"
+        f"{body or '(no part contained anything relevant)'}"
+    )
+
+
+def _batches(notes: list[Note], max_chars: int) -> list[list[Note]]:
+    batches: list[list[Note]] = [[]]
+    size = 0
+
+    for note in notes:
+        length = len(note[2])
+
+        if batches[-1] and size + length > max_chars:
+            batches.append([])
+            size = 0
+
+        batches[-1].append(note)
+        size += length
+
+    return batches
+
+
+def map_reduce(
+    *,
+    client,
+    instruction: str,
+    lines: Iterable[str],
+    log_file: str,
+    model: str,
+    concurrency: int = 4,
+    chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+    instructions: str | None = None,
+    stream_callback: Callable[[str], None] | None = None,
+    runner: Callable[..., Any] | None = None,
+    progress: Any = sys.stderr,
+) -> MapReduceResult:
+    """
+    Answer `instruction` over input too large for one request.
+
+    Map: chunks are read lazily and sent concurrently (at most
+    2 x concurrency in flight), each with the instruction. Reduce: the
+    non-empty partial answers are combined, in input order, in as many
+    rounds as it takes to fit one request; only the final answer streams
+    to `stream_callback` and is logged to the history.
+    """
+
+    if runner is None:
+        from src.core.runtime import run_once as runner
+
+    started = time.perf_counter()
+    max_chars = max(1000, chunk_tokens * CHARS_PER_TOKEN)
+    concurrency = max(1, concurrency)
+    partials: dict[int, str] = {}
+    failed: list[int] = []
+    lock = threading.Lock()
+    read = {"chunks": 0, "chars": 0}
+
+    def report(message: str) -> None:
+        if progress is not None:
+            print(f"[map-reduce] {message}", file=progress, flush=True)
+
+    def ask(
+        prompt: str,
+        *,
+        log_file: str | None = None,
+        stream_callback: Callable[[str], None] | None = None,
+    ) -> str:
+        # Only the final reduce is logged; chunk turns would flood history.
+        result = runner(
+            client=client,
+            prompt=prompt,
+            log_file=log_file,
+            model=model,
+            instructions=instructions,
+            emit_output=False,
+            stream_callback=stream_callback,
+            tool_mode="none",
+        )
+        return result.text.strip()
+
+    def map_chunk(chunk: Chunk) -> None:
+        try:
+            text = ask(map_prompt(instruction, chunk))
+        except Exception as error:
+            with lock:
+                failed.append(chunk.index)
+            report(f"part {chunk.index + 1} failed: {type(error).__name__}: {error}")
+            return
+
+        with lock:
+            partials[chunk.index] = text
+            done = len(partials) + len(failed)
+
+        report(
+            f"mapped {done}/{read['chunks']} parts "
+            f"({read['chars'] / 1_000_000:.1f} MB read)"
+        )
+
+    with ThreadPoolExecutor(
+        max_workers=concurrency,
+        thread_name_prefix="neuro-map",
+    ) as pool:
+        in_flight: set = set()
+
+        for chunk in iter_chunks(lines, max_chars=max_chars):
+            read["chunks"] += 1
+            read["chars"] += len(chunk.text)
+
+            if len(in_flight) >= concurrency * 2:
+                _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+
+            in_flight.add(pool.submit(map_chunk, chunk))
+
+        wait(in_flight)
+
+        total = read["chunks"]
+        notes: list[Note] = [
+            (index + 1, index + 1, partials[index])
+            for index in sorted(partials)
+            if partials[index] and partials[index].strip(". ").upper() != NOTHING
+        ]
+        relevant = len(notes)
+        rounds = 0
+
+        # Intermediate reduces until the notes fit one final request.
+        while sum(len(text) for *_, text in notes) > max_chars:
+            batches = _batches(notes, max_chars)
+
+            if len(batches) == len(notes) or rounds >= MAX_REDUCE_ROUNDS:
+                # Nothing left to merge pairwise; the final pass gets it all.
+                break
+
+            rounds += 1
+            report(f"reduce round {rounds}: {len(notes)} notes -> {len(batches)}")
+            merged = pool.map(
+                lambda batch: ask(
+                    reduce_prompt(
+                        instruction,
+                        batch,
+                        total_chunks=total,
+                        failed=[],
+                        final=False,
+                    )
+                ),
+                batches,
+            )
+            notes = [
+                (batch[0][0], batch[-1][1], text)
+                for batch, text in zip(batches, merged)
+            ]
+
+    report(f"reducing {relevant} relevant of {total} parts")
+    text = ask(
+        reduce_prompt(
+            instruction,
+            notes,
+            total_chunks=total,
+            failed=sorted(failed),
+            final=True,
+        ),
+        log_file=log_file,
+        stream_callback=stream_callback,
+    )
+
+    return MapReduceResult(
+        text=text,
+        chunks=total,
+        relevant=relevant,
+        failed=sorted(failed),
+        reduce_rounds=rounds + 1,
+        duration_s=time.perf_counter() - started,
+    )
@@ -8,9 +8,6 @@ from rich.console import Console
 from rich.live import Live
 from rich.markdown import Markdown
 
-from .commands import command_handler_factory
-from .input_ui import multiline_input
-
 
 console = Console()
 
@@ -54,9 +51,13 @@ def run(
     client,
     log_file: str,
     default_model: str = "gpt-5.6-sol",
+    profile: bool = False,
 ) -> None:
     from src.core.runtime import run_repl
 
+    from .commands import command_handler_factory
+    from .input_ui import multiline_input
+
     live_ctx = {
         "model": default_model,
         "log_file": log_file,
@@ -85,4 +86,5 @@ def run(
         banner_fn=_banner_fn,
         command_handler=handler,
         stream_context_factory=live_markdown_stream,
+        profile=profile,
     )
\ No newline at end of file
@@ -0,0 +1,452 @@
+# src/cli/server.py
+"""
+`neuro serve`: one resident Neuro shared by many HTTP clients.
+
+A dashboard or script creates a session, then posts turns to it. Each
+session keeps its own previous_response_id, mode and sticky tool groups.
+Its turns run one at a time, in order, on a bounded worker pool shared by
+every session. The registry, tool modules (and their Home Assistant
+session and caches) and the warm API connection pool are loaded once.
+
+    POST   /v1/sessions                 {"model"?, "mode"?}  -> session
+    GET    /v1/sessions                 -> [session, ...]
+    GET    /v1/sessions/<id>            -> session
+    DELETE /v1/sessions/<id>
+    POST   /v1/sessions/<id>/turns      {"input", "model"?, "stream"?}
+    GET    /v1/health
+
+A turn answers with JSON once it is done, or with Server-Sent Events when
+"stream" is true (or the request accepts text/event-stream):
+
+    event: queued    {"turn", "position"}    waiting behind the session's turns
+    event: started   {"turn"}
+    event: text      {"delta", "text"}       text so far, and what is new
+    event: tool      {"name", "duration_ms", "cached", ...}
+    event: done      {"text", "response_id", "tools_used", "metrics"}
+    event: error     {"message"}
+
+Set NEURO_SERVE_TOKEN to require `Authorization: Bearer <token>`.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+DEFAULT_PORT = 8420
+DEFAULT_WORKERS = 4
+# Turns a session may have waiting behind its running one.
+MAX_QUEUED_PER_SESSION = 16
+
+_DONE = object()
+
+
+class RequestError(Exception):
+    """A client mistake, reported as an HTTP error response."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class Turn:
+    """One queued or running turn and the events its listener has not read."""
+
+    id: str
+    input: str
+    model: str
+    events: queue.Queue = field(default_factory=queue.Queue)
+
+    def emit(self, kind: str, **data: Any) -> None:
+        self.events.put((kind, data))
+
+
+@dataclass
+class Session:
+    id: str
+    model: str
+    mode: str = "chat"
+    previous_response_id: str | None = None
+    tool_groups: frozenset[str] = frozenset()
+    created: float = field(default_factory=time.time)
+    turns: int = 0
+    running: Turn | None = None
+    pending: deque = field(default_factory=deque)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "model": self.model,
+            "mode": self.mode,
+            "previous_response_id": self.previous_response_id,
+            "turns": self.turns,
+            "busy": self.running is not None,
+            "queued": len(self.pending),
+            "created": self.created,
+        }
+
+
+class SessionPool:
+    """
+    Sessions and the worker pool their turns share.
+
+    A session has at most one turn on the pool at a time; the rest wait in
+    its own queue, so turns of one conversation never race each other for
+    previous_response_id while different sessions run in parallel.
+    """
+
+    def __init__(
+        self,
+        *,
+        client,
+        log_file: str,
+        default_model: str,
+        workers: int = DEFAULT_WORKERS,
+    ) -> None:
+        self.client = client
+        self.log_file = log_file
+        self.default_model = default_model
+        self.workers = max(1, workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="neuro-serve",
+        )
+        self._sessions: dict[str, Session] = {}
+        self._lock = threading.Lock()
+        self._turn_ids = itertools.count(1)
+        self.busy = 0
+        self.served = 0
+
+    def create(self, *, model: str | None = None, mode: str = "chat") -> Session:
+        if mode not in {"chat", "command"}:
+            raise RequestError(400, f"unknown mode: {mode}")
+
+        session = Session(id=uuid.uuid4().hex[:12], model=model or self.default_model, mode=mode)
+
+        with self._lock:
+            self._sessions[session.id] = session
+
+        return session
+
+    def get(self, session_id: str) -> Session:
+        with self._lock:
+            session = self._sessions.get(session_id)
+
+        if session is None:
+            raise RequestError(404, f"no session {session_id}")
+
+        return session
+
+    def sessions(self) -> list[Session]:
+        with self._lock:
+            return list(self._sessions.values())
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+
+            if session is None:
+                raise RequestError(404, f"no session {session_id}")
+
+            # Queued turns are dropped; a running one finishes and is logged.
+            for turn in session.pending:
+                turn.emit("error", message="session deleted")
+                turn.events.put(_DONE)
+
+            session.pending.clear()
+
+    def submit(self, session: Session, text: str, *, model: str | None = None) -> Turn:
+        turn = Turn(id=f"turn_{next(self._turn_ids)}", input=text, model=model or session.model)
+
+        with self._lock:
+            if len(session.pending) >= MAX_QUEUED_PER_SESSION:
+                raise RequestError(429, "too many turns queued for this session")
+
+            if session.running is None:
+                session.running = turn
+                self._executor.submit(self._work, session, turn)
+            else:
+                session.pending.append(turn)
+                turn.emit("queued", turn=turn.id, position=len(session.pending))
+
+        return turn
+
+    def _work(self, session: Session, turn: Turn) -> None:
+        with self._lock:
+            self.busy += 1
+
+        turn.emit("started", turn=turn.id)
+        sent = 0
+
+        def on_text(text: str) -> None:
+            nonlocal sent
+            turn.emit("text", delta=text[sent:], text=text)
+            sent = len(text)
+
+        from src.core.runtime import run_turn
+
+        try:
+            result = run_turn(
+                client=self.client,
+                user=turn.input,
+                model=turn.model,
+                log_file=self.log_file,
+                previous_response_id=session.previous_response_id,
+                emit_output=False,
+                stream_callback=on_text,
+                tool_mode=session.mode,
+                tool_groups=session.tool_groups,
+                tool_callback=lambda summary: turn.emit("tool", **summary),
+            )
+        except Exception as error:
+            turn.emit("error", message=f"{type(error).__name__}: {error}")
+        else:
+            session.previous_response_id = result.response_id
+            session.tool_groups = result.tool_groups
+            turn.emit(
+                "done",
+                turn=turn.id,
+                text=result.text,
+                response_id=result.response_id,
+                tools_used=result.tools_used,
+                metrics=result.metrics.as_dict() if result.metrics else None,
+            )
+        finally:
+            # Bookkeeping first, so a client that saw "done" sees it counted.
+            self._next(session)
+            turn.events.put(_DONE)
+
+    def _next(self, session: Session) -> None:
+        with self._lock:
+            self.busy -= 1
+            self.served += 1
+            session.turns += 1
+            session.running = session.pending.popleft() if session.pending else None
+
+            if session.running is not None:
+                self._executor.submit(self._work, session, session.running)
+
+            # Everyone still waiting moved up one place.
+            for position, waiting in enumerate(session.pending, start=1):
+                waiting.emit("queued", turn=waiting.id, position=position)
+
+    def health(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "workers": self.workers,
+                "busy": self.busy,
+                "queued": sum(len(session.pending) for session in self._sessions.values()),
+                "sessions": len(self._sessions),
+                "served": self.served,
+            }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "NeuroHTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    # ------------------------------------------------------------ plumbing
+
+    def _json(self, status: int, body: Any = None) -> None:
+        data = b"" if body is None else json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+
+        if not length:
+            return {}
+
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise RequestError(400, "body is not JSON") from None
+
+        if not isinstance(body, dict):
+            raise RequestError(400, "body must be a JSON object")
+
+        return body
+
+    def _authorized(self) -> bool:
+        token = self.server.token
+        return not token or self.headers.get("Authorization") == f"Bearer {token}"
+
+    def _dispatch(self, method: str) -> None:
+        try:
+            if not self._authorized():
+                raise RequestError(401, "missing or wrong bearer token")
+
+            parts = [part for part in self.path.split("?", 1)[0].split("/") if part]
+            self._route(method, parts)
+        except RequestError as error:
+            self._json(error.status, {"error": str(error)})
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away; a started turn still runs and is logged.
+            self.close_connection = True
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    # -------------------------------------------------------------- routes
+
+    def _route(self, method: str, parts: list[str]) -> None:
+        pool = self.server.pool
+
+        if parts[:1] != ["v1"]:
+            raise RequestError(404, "not found")
+
+        route = parts[1:]
+
+        if route == ["health"] and method == "GET":
+            self._json(200, pool.health())
+        elif route == ["sessions"] and method == "POST":
+            body = self._body()
+            session = pool.create(model=body.get("model"), mode=body.get("mode") or "chat")
+            self._json(201, session.as_dict())
+        elif route == ["sessions"] and method == "GET":
+            self._json(200, [session.as_dict() for session in pool.sessions()])
+        elif len(route) == 2 and route[0] == "sessions" and method == "GET":
+            self._json(200, pool.get(route[1]).as_dict())
+        elif len(route) == 2 and route[0] == "sessions" and method == "DELETE":
+            pool.delete(route[1])
+            self._json(204)
+        elif len(route) == 3 and route[0] == "sessions" and route[2] == "turns" and method == "POST":
+            self._turn(pool.get(route[1]), self._body())
+        else:
+            raise RequestError(404 if method == "GET" else 405, f"no route for {method} {self.path}")
+
+    def _turn(self, session: Session, body: dict[str, Any]) -> None:
+        text = body.get("input")
+
+        if not isinstance(text, str) or not text.strip():
+            raise RequestError(400, "input must be a non-empty string")
+
+        stream = bool(body.get("stream")) or "text/event-stream" in (self.headers.get("Accept") or "")
+        turn = self.server.pool.submit(session, text, model=body.get("model"))
+
+        if stream:
+            self._stream(turn)
+            return
+
+        outcome: dict[str, Any] = {}
+
+        for kind, data in _drain(turn):
+            if kind in {"done", "error"}:
+                outcome = {"type": kind, **data}
+
+        self._json(200 if outcome.get("type") == "done" else 500, outcome)
+
+    def _stream(self, turn: Turn) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        for kind, data in _drain(turn):
+            payload = json.dumps(data, ensure_ascii=False, default=str)
+            self.wfile.write(f"event: {kind}\ndata: {payload}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+
+def _drain(turn: Turn):
+    while True:
+        item = turn.events.get()
+
+        if item is _DONE:
+            return
+
+        yield item
+
+
+class NeuroHTTPServer(ThreadingHTTPServer):
+    """HTTP front end for a SessionPool."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], pool: SessionPool, token: str | None = None) -> None:
+        self.pool = pool
+        self.token = token
+        super().__init__(address, _Handler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def serve(
+    *,
+    log_file: str,
+    default_model: str,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    workers: int = DEFAULT_WORKERS,
+    client=None,
+) -> None:
+    """Run the HTTP server in the foreground until interrupted."""
+
+    # Loaded once for every client, as in the daemon.
+    from src.core.transport import build_client, keep_warm, prewarm
+    from src.tools.manifest import load_all
+
+    load_all()
+    client = client or build_client()
+    pool = SessionPool(
+        client=client,
+        log_file=log_file,
+        default_model=default_model,
+        workers=workers,
+    )
+    server = NeuroHTTPServer((host, port), pool, token=os.getenv("NEURO_SERVE_TOKEN") or None)
+    stop = threading.Event()
+
+    threading.Thread(
+        target=keep_warm,
+        args=(client, stop),
+        name="neuro-keep-warm",
+        daemon=True,
+    ).start()
+    prewarm(client, force=True)
+
+    print(f"neuro serve listening on {server.url} ({pool.workers} workers, pid {os.getpid()})", file=sys.stderr)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        pool.close()
+        server.server_close()
@@ -0,0 +1,134 @@
+# src/core/budget.py
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from .cache import canonical_args
+from .env import env_number
+
+
+@dataclass
+class TurnBudget:
+    """
+    Limits for one turn's tool chain.
+
+    max_round_trips:  model requests per turn, including the final answer.
+    deadline_s:       wall-clock limit for the whole turn.
+    tool_deadline_s:  wall-clock limit for any single tool runner.
+    repeat_limit:     identical tool calls (same name and args) tolerated
+                      before the chain is treated as a loop.
+
+    None disables a limit. Defaults come from NEURO_MAX_ROUND_TRIPS,
+    NEURO_TURN_DEADLINE, NEURO_TOOL_DEADLINE and NEURO_TOOL_REPEAT_LIMIT.
+    """
+
+    max_round_trips: int | None = 12
+    deadline_s: float | None = 300.0
+    tool_deadline_s: float | None = 60.0
+    repeat_limit: int = 2
+
+    @classmethod
+    def from_env(cls) -> "TurnBudget":
+        round_trips = env_number("NEURO_MAX_ROUND_TRIPS", 12)
+
+        return cls(
+            max_round_trips=int(round_trips) if round_trips else None,
+            deadline_s=env_number("NEURO_TURN_DEADLINE", 300.0),
+            tool_deadline_s=env_number("NEURO_TOOL_DEADLINE", 60.0),
+            repeat_limit=int(os.getenv("NEURO_TOOL_REPEAT_LIMIT", "2")),
+        )
+
+
+def loop_key(tool_call: dict[str, Any], raw_args: str) -> tuple[str, str]:
+    """Identity of a call for loop detection: name plus canonical args."""
+
+    try:
+        args: Any = json.loads(raw_args or "{}")
+    except Exception:
+        args = raw_args or ""
+
+    return tool_call.get("name") or "<unknown>", canonical_args(args)
+
+
+@dataclass
+class BudgetGuard:
+    """Tracks one turn against its TurnBudget."""
+
+    budget: TurnBudget
+    started: float = field(default_factory=time.perf_counter)
+
+    def remaining(self) -> float | None:
+        if self.budget.deadline_s is None:
+            return None
+
+        return self.budget.deadline_s - (time.perf_counter() - self.started)
+
+    def tool_timeout(self, started: float) -> float | None:
+        """Seconds left for a tool that began at `started` (perf_counter)."""
+
+        limits = []
+
+        if self.budget.tool_deadline_s is not None:
+            limits.append(
+                self.budget.tool_deadline_s - (time.perf_counter() - started)
+            )
+
+        remaining = self.remaining()
+
+        if remaining is not None:
+            limits.append(remaining)
+
+        return max(0.0, min(limits)) if limits else None
+
+    def out_of_round_trips(self, round_trips: int) -> bool:
+        """True when only the final-answer request is left after round_trips."""
+
+        limit = self.budget.max_round_trips
+        return limit is not None and round_trips + 1 >= limit
+
+    def exhausted(self, round_trips: int, max_repeats: int) -> str | None:
+        """
+        Why the next request must be the final answer, or None.
+
+        Called with the number of model requests made so far and the highest
+        repeat count of any identical tool call this turn.
+        """
+
+        if self.out_of_round_trips(round_trips):
+            return f"max_round_trips ({self.budget.max_round_trips}) reached"
+
+        remaining = self.remaining()
+
+        if remaining is not None and remaining <= 0:
+            return f"turn deadline ({self.budget.deadline_s:g}s) exceeded"
+
+        if max_repeats >= self.budget.repeat_limit:
+            return "repeated identical tool calls (loop detected)"
+
+        return None
+
+
+def final_answer_message(reason: str) -> dict[str, Any]:
+    """Input item asking the model to wrap up without further tools."""
+
+    return {
+        "role": "developer",
+        "content": (
+            f"Tool budget exhausted: {reason}. Do not call any more tools. "
+            "Using the results you already have, give the user your best "
+            "final answer now and mention briefly if it is incomplete."
+        ),
+    }
+
+
+def skipped_output(reason: str) -> str:
+    return json.dumps(
+        {
+            "error": "not executed",
+            "reason": f"turn budget exhausted: {reason}",
+        }
+    )
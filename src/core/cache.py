@@ -0,0 +1,149 @@
+# src/core/cache.py
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable
+
+from .registry import ToolSpec
+
+
+def canonical_args(args: Any) -> str:
+    """Stable text form of tool arguments, independent of key order."""
+
+    if isinstance(args, str):
+        return args
+
+    return json.dumps(
+        args,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+
+
+class ToolResultCache:
+    """
+    Bounded LRU of tool outputs with per-entry TTL and tag invalidation.
+
+    Entries are keyed on (tool name, canonicalized args) unless the tool's
+    CachePolicy supplies its own key function.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[tuple, tuple[float, frozenset, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def key_for(self, spec: ToolSpec, args: Any) -> tuple:
+        policy = spec.cache
+        if policy is not None and policy.key is not None:
+            return (spec.name, canonical_args(policy.key(args)))
+        return (spec.name, canonical_args(args))
+
+    def get(
+        self,
+        spec: ToolSpec,
+        args: Any,
+        valid: Callable[[str], bool] | None = None,
+    ) -> str | None:
+        """
+        Return a fresh cached output or None, counting hits and misses.
+
+        An entry that fails `valid` is dropped and counts as a miss.
+        """
+
+        key = self.key_for(spec, args)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] <= now or (valid is not None and not valid(entry[2])):
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, spec: ToolSpec, args: Any, result: Any, output: str) -> None:
+        policy = spec.cache
+        if policy is None:
+            return
+
+        if policy.accept is not None:
+            if not policy.accept(result):
+                return
+        elif isinstance(result, dict) and "error" in result:
+            return
+
+        tags = frozenset(policy.tags(args) if policy.tags else ())
+        key = self.key_for(spec, args)
+        expires = time.monotonic() + policy.ttl
+
+        with self._lock:
+            self._entries[key] = (expires, tags, output)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying any of the given tags."""
+
+        wanted = set(tags)
+        if not wanted:
+            return 0
+
+        with self._lock:
+            stale = [
+                key
+                for key, (_, entry_tags, _) in self._entries.items()
+                if entry_tags & wanted
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+TOOL_CACHE_ENABLED = os.getenv("NEURO_TOOL_CACHE", "1").lower() not in {"0", "false", "off"}
+
+tool_cache = ToolResultCache(
+    max_entries=int(os.getenv("NEURO_TOOL_CACHE_SIZE", "256")),
+)
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters for the shared tool result cache."""
+    return {"enabled": TOOL_CACHE_ENABLED, **tool_cache.stats()}
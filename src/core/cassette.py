@@ -0,0 +1,438 @@
+# src/core/cassette.py
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator
+
+from .registry import get_tool
+
+# A cassette is a JSONL file with one line per completed Responses request:
+#   {"request": {...}, "recorded_at": "...", "duration_s": 1.23,
+#    "events": [[0.41, {...event...}], ...], "final": {...response...}}
+# Event offsets are seconds from the request being sent. Tool outputs are
+# the function_call_output items of the next request's input.
+CASSETTE_VERSION = 1
+
+
+class CassetteMismatch(LookupError):
+    """A replayed request has no recorded interaction to answer it."""
+
+
+def to_data(value: Any) -> Any:
+    """SDK models, namespaces and containers as plain JSON data."""
+
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+
+    if isinstance(value, dict):
+        return {str(key): to_data(item) for key, item in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return [to_data(item) for item in value]
+
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+
+    if hasattr(value, "__dict__"):
+        return {
+            key: to_data(item)
+            for key, item in vars(value).items()
+            if not key.startswith("_")
+        }
+
+    return str(value)
+
+
+def to_namespace(data: Any) -> Any:
+    """Plain data back into attribute access, as the stream consumer expects."""
+
+    if isinstance(data, dict):
+        return SimpleNamespace(**{key: to_namespace(item) for key, item in data.items()})
+
+    if isinstance(data, list):
+        return [to_namespace(item) for item in data]
+
+    return data
+
+
+def _input_key(request: dict[str, Any]) -> str:
+    return json.dumps(
+        [request.get("previous_response_id"), request.get("input")],
+        sort_keys=True,
+        default=str,
+    )
+
+
+class Cassette:
+    """Recorded interactions, in the order their requests were sent."""
+
+    def __init__(self, interactions: list[dict[str, Any]] | None = None) -> None:
+        self.interactions = interactions or []
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Cassette":
+        with open(path, encoding="utf-8") as handle:
+            return cls([json.loads(line) for line in handle if line.strip()])
+
+    def tool_outputs(self) -> dict[str, list[str]]:
+        """Recorded tool outputs by tool name, in call order."""
+
+        names: dict[str, str] = {}
+        outputs: dict[str, list[str]] = defaultdict(list)
+
+        for interaction in self.interactions:
+            payload = interaction["request"].get("input")
+
+            if isinstance(payload, list):
+                for item in payload:
+                    name = names.get(item.get("call_id"))
+
+                    if item.get("type") == "function_call_output" and name:
+                        outputs[name].append(item.get("output", ""))
+
+            for item in (interaction.get("final") or {}).get("output") or []:
+                if item.get("call_id") and item.get("name"):
+                    names[item["call_id"]] = item["name"]
+
+        return dict(outputs)
+
+
+class CassetteWriter:
+    """Append completed interactions to a cassette file, thread-safely."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def write(self, interaction: dict[str, Any]) -> None:
+        line = json.dumps(interaction, ensure_ascii=False, default=str)
+
+        with self._lock, self.path.open("a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+class _Recording:
+    """Shared capture for the sync and async recording streams."""
+
+    def __init__(self, manager: Any, writer: CassetteWriter, options: dict[str, Any]):
+        self._manager = manager
+        self._writer = writer
+        self._request = to_data(options)
+        self._recorded_at = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        self._started = time.perf_counter()
+        self._events: list[list[Any]] = []
+        self._stream: Any = None
+        self._final: Any = None
+
+    def _capture(self, event: Any) -> None:
+        self._events.append(
+            [round(time.perf_counter() - self._started, 4), to_data(event)]
+        )
+
+    def _save(self) -> None:
+        # Only finished requests are kept; a stalled or losing hedge copy
+        # has nothing a replay could answer with.
+        if self._final is None:
+            return
+
+        self._writer.write(
+            {
+                "version": CASSETTE_VERSION,
+                "recorded_at": self._recorded_at,
+                "request": self._request,
+                "duration_s": round(time.perf_counter() - self._started, 4),
+                "events": self._events,
+                "final": to_data(self._final),
+            }
+        )
+
+    def close(self) -> None:
+        close = getattr(self._stream, "close", None)
+
+        if close is not None:
+            close()
+
+
+class _RecordingStream(_Recording):
+    def __enter__(self) -> "_RecordingStream":
+        self._stream = self._manager.__enter__()
+        return self
+
+    def __exit__(self, *exc: Any) -> Any:
+        try:
+            return self._manager.__exit__(*exc)
+        finally:
+            self._save()
+
+    def __iter__(self) -> Iterator[Any]:
+        for event in self._stream:
+            self._capture(event)
+            yield event
+
+    def get_final_response(self) -> Any:
+        self._final = self._stream.get_final_response()
+        return self._final
+
+
+class _RecordingAsyncStream(_Recording):
+    async def __aenter__(self) -> "_RecordingAsyncStream":
+        self._stream = await self._manager.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> Any:
+        try:
+            return await self._manager.__aexit__(*exc)
+        finally:
+            self._save()
+
+    async def __aiter__(self):
+        async for event in self._stream:
+            self._capture(event)
+            yield event
+
+    async def get_final_response(self) -> Any:
+        self._final = await self._stream.get_final_response()
+        return self._final
+
+
+class _RecordingResponses:
+    def __init__(self, responses: Any, writer: CassetteWriter, stream_type: type):
+        self._responses = responses
+        self._writer = writer
+        self._stream_type = stream_type
+
+    def stream(self, **options: Any) -> _Recording:
+        return self._stream_type(self._responses.stream(**options), self._writer, options)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._responses, name)
+
+
+class RecordingClient:
+    """
+    Wrap an OpenAI client and record every streamed response to a cassette.
+
+    Everything but responses.stream is passed through untouched.
+    """
+
+    _stream_type: type = _RecordingStream
+
+    def __init__(self, client: Any, path: str | Path) -> None:
+        self._client = client
+        self.writer = CassetteWriter(path)
+        self.responses = _RecordingResponses(client.responses, self.writer, self._stream_type)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+class RecordingAsyncClient(RecordingClient):
+    """RecordingClient for AsyncOpenAI."""
+
+    _stream_type = _RecordingAsyncStream
+
+
+class _Replay:
+    """Shared state for replaying one recorded interaction."""
+
+    def __init__(self, interaction: dict[str, Any], speed: float) -> None:
+        self._interaction = interaction
+        self._speed = speed
+        self._closed = False
+        self._started = time.perf_counter()
+
+    def _delay(self, offset: float) -> float:
+        """Seconds to wait before an event recorded at `offset`."""
+
+        if not self._speed:
+            return 0.0
+
+        return offset / self._speed - (time.perf_counter() - self._started)
+
+    def _final(self) -> Any:
+        return to_namespace(self._interaction["final"])
+
+    def close(self) -> None:
+        self._closed = True
+
+
+class _ReplayStream(_Replay):
+    def __enter__(self) -> "_ReplayStream":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def __iter__(self) -> Iterator[Any]:
+        for offset, event in self._interaction["events"]:
+            delay = self._delay(offset)
+
+            if delay > 0:
+                time.sleep(delay)
+
+            if self._closed:
+                return
+
+            yield to_namespace(event)
+
+    def get_final_response(self) -> Any:
+        return self._final()
+
+
+class _ReplayAsyncStream(_Replay):
+    async def __aenter__(self) -> "_ReplayAsyncStream":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    async def __aiter__(self):
+        for offset, event in self._interaction["events"]:
+            delay = self._delay(offset)
+
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if self._closed:
+                return
+
+            yield to_namespace(event)
+
+    async def get_final_response(self) -> Any:
+        return self._final()
+
+
+class _ReplayResponses:
+    def __init__(self, client: "ReplayClient") -> None:
+        self._client = client
+
+    def stream(self, **options: Any) -> _Replay:
+        client = self._client
+        interaction = client.take(options)
+        return client._stream_type(interaction, client.speed)
+
+
+class ReplayClient:
+    """
+    Answer responses.stream from a cassette instead of the API.
+
+    Requests are matched to unused recordings by previous_response_id and
+    input, falling back to the next unused one in recorded order (unless
+    strict). speed=1.0 replays at recorded pace, 2.0 twice as fast, and 0
+    as fast as possible.
+    """
+
+    _stream_type: type = _ReplayStream
+
+    def __init__(
+        self,
+        cassette: Cassette | str | Path,
+        *,
+        speed: float = 0.0,
+        strict: bool = False,
+    ) -> None:
+        self.cassette = cassette if isinstance(cassette, Cassette) else Cassette.load(cassette)
+        self.speed = max(0.0, speed)
+        self.strict = strict
+        self.requests: list[dict[str, Any]] = []
+        self.responses = _ReplayResponses(self)
+        self._unused = deque(range(len(self.cassette.interactions)))
+        self._lock = threading.Lock()
+
+    def take(self, options: dict[str, Any]) -> dict[str, Any]:
+        interactions = self.cassette.interactions
+        key = _input_key(to_data(options))
+
+        with self._lock:
+            self.requests.append(options)
+            match = next(
+                (
+                    index
+                    for index in self._unused
+                    if _input_key(interactions[index]["request"]) == key
+                ),
+                None,
+            )
+
+            if match is None and not self.strict and self._unused:
+                match = self._unused[0]
+
+            if match is None:
+                raise CassetteMismatch(
+                    f"No recorded response for request #{len(self.requests)}"
+                )
+
+            self._unused.remove(match)
+            return interactions[match]
+
+
+class ReplayAsyncClient(ReplayClient):
+    """ReplayClient for code written against AsyncOpenAI."""
+
+    _stream_type = _ReplayAsyncStream
+
+
+def _parsed(output: str) -> Any:
+    try:
+        return json.loads(output)
+    except (TypeError, ValueError):
+        return output
+
+
+def stub_tools(cassette: Cassette) -> Callable[[], None]:
+    """
+    Answer registered tools from the cassette's recorded outputs.
+
+    Each tool returns its recorded outputs in order, so a replayed turn
+    never touches Home Assistant, the sandbox or anything else with side
+    effects. A tool called more often than recorded returns an error.
+    Returns a function that puts the real runners back.
+    """
+
+    originals = []
+
+    for name, outputs in cassette.tool_outputs().items():
+        spec = get_tool(name)
+
+        if spec is None:
+            continue
+
+        queue = deque(outputs)
+
+        def runner(*_args: Any, _queue: deque = queue, _name: str = name, **_kwargs: Any) -> Any:
+            if not _queue:
+                return {"error": f"No recorded output left for {_name}"}
+
+            return _parsed(_queue.popleft())
+
+        originals.append((spec, spec.runner, spec.cache))
+        spec.runner = runner
+        spec.cache = None  # recorded outputs must not leak into the tool cache
+
+    def restore() -> None:
+        for spec, runner, cache in originals:
+            spec.runner = runner
+            spec.cache = cache
+
+    return restore
+
+
+@contextmanager
+def replay_tools(cassette: Cassette) -> Iterator[None]:
+    """stub_tools for the duration of a with-block."""
+
+    restore = stub_tools(cassette)
+
+    try:
+        yield
+    finally:
+        restore()
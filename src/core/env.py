@@ -0,0 +1,23 @@
+# src/core/env.py
+from __future__ import annotations
+
+import os
+
+
+def env_number(name: str, default: float | None) -> float | None:
+    """
+    A numeric NEURO_* setting.
+
+    Unset or empty gives `default`; "none", "off" or "0" turn the limit off
+    (None).
+    """
+
+    value = os.getenv(name)
+
+    if value is None or value == "":
+        return default
+
+    if value.lower() in {"none", "off", "0"}:
+        return None
+
+    return float(value)
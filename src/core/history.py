@@ -0,0 +1,218 @@
+# src/core/history.py
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from .turnlog import jsonl_path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS turns (
+    id INTEGER PRIMARY KEY,
+    ts TEXT,
+    model TEXT,
+    response_id TEXT,
+    user TEXT,
+    text TEXT,
+    tools TEXT
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS turns_fts USING fts5(
+    user, text, tools,
+    content='turns', content_rowid='id',
+    tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS turns_ai AFTER INSERT ON turns BEGIN
+    INSERT INTO turns_fts(rowid, user, text, tools)
+    VALUES (new.id, new.user, new.text, new.tools);
+END;
+CREATE TRIGGER IF NOT EXISTS turns_ad AFTER DELETE ON turns BEGIN
+    INSERT INTO turns_fts(turns_fts, rowid, user, text, tools)
+    VALUES ('delete', old.id, old.user, old.text, old.tools);
+END;
+"""
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def history_db_path(log_file: str | Path) -> Path:
+    """SQLite store that sits next to the JSONL history log."""
+
+    override = os.getenv("NEURO_HISTORY_DB")
+
+    if override and override.lower() not in {"off", "0", "none"}:
+        return Path(override).expanduser()
+
+    return jsonl_path(log_file).with_name("history.db")
+
+
+class HistoryStore:
+    """
+    Full-text searchable conversation history.
+
+    Uses SQLite FTS5 when the interpreter's SQLite has it, and falls back to
+    LIKE matching otherwise.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+
+        self._conn.commit()
+
+    def add(self, record: dict[str, Any]) -> None:
+        """Store one turn record as produced by the runtime's turn log."""
+
+        tools = " ".join(call.get("name", "") for call in record.get("tool_calls") or [])
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO turns (ts, model, response_id, user, text, tools) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    record.get("ts"),
+                    record.get("model"),
+                    record.get("response_id"),
+                    record.get("user") or "",
+                    record.get("text") or "",
+                    tools,
+                ),
+            )
+            self._conn.commit()
+
+    def __call__(self, record: dict[str, Any]) -> None:
+        # Lets the store be used directly as a TurnLogWriter sink.
+        self.add(record)
+
+    def search(self, query: str, limit: int = 5) -> list[dict[str, Any]]:
+        """Best-matching turns for a free-text query, most relevant first."""
+
+        words = _WORD_RE.findall(query or "")
+
+        if not words:
+            return []
+
+        limit = max(1, min(int(limit), 50))
+
+        with self._lock:
+            if not self.fts:
+                return self._search_like(words, limit)
+
+            # Quote every term so user punctuation never becomes FTS syntax;
+            # prefer turns matching all terms, then fall back to any term.
+            quoted = [f'"{word}"' for word in words]
+
+            for match in (" ".join(quoted), " OR ".join(quoted)):
+                rows = self._conn.execute(
+                    "SELECT t.id, t.ts, t.model, t.response_id, t.user, t.tools, "
+                    "snippet(turns_fts, 0, '[', ']', ' … ', 12) AS user_snippet, "
+                    "snippet(turns_fts, 1, '[', ']', ' … ', 24) AS text_snippet "
+                    "FROM turns_fts JOIN turns t ON t.id = turns_fts.rowid "
+                    "WHERE turns_fts MATCH ? ORDER BY bm25(turns_fts) LIMIT ?",
+                    (match, limit),
+                ).fetchall()
+
+                if rows:
+                    return [_row(row) for row in rows]
+
+                if len(words) == 1:
+                    break
+
+        return []
+
+    def _search_like(self, words: list[str], limit: int) -> list[dict[str, Any]]:
+        clauses = " AND ".join("(user LIKE ? OR text LIKE ?)" for _ in words)
+        params: list[Any] = []
+
+        for word in words:
+            params += [f"%{word}%", f"%{word}%"]
+
+        rows = self._conn.execute(
+            "SELECT id, ts, model, response_id, user, tools, "
+            "substr(user, 1, 120) AS user_snippet, substr(text, 1, 240) AS text_snippet "
+            f"FROM turns WHERE {clauses} ORDER BY id DESC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+
+        return [_row(row) for row in rows]
+
+    def recent(self, limit: int = 10) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, ts, model, response_id, user, tools, "
+                "substr(user, 1, 120) AS user_snippet, substr(text, 1, 240) AS text_snippet "
+                "FROM turns ORDER BY id DESC LIMIT ?",
+                (max(1, int(limit)),),
+            ).fetchall()
+
+        return [_row(row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _row(row: sqlite3.Row) -> dict[str, Any]:
+    return {
+        "id": row["id"],
+        "ts": row["ts"],
+        "model": row["model"],
+        "response_id": row["response_id"],
+        "tools": row["tools"] or "",
+        "user": row["user_snippet"],
+        "snippet": row["text_snippet"],
+    }
+
+
+_stores: dict[Path, HistoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(log_file: str | Path) -> HistoryStore:
+    """Shared store for a configured history file."""
+
+    path = history_db_path(log_file)
+
+    with _stores_lock:
+        store = _stores.get(path)
+
+        if store is None:
+            store = HistoryStore(path)
+            _stores[path] = store
+
+        return store
+
+
+def format_results(results: list[dict[str, Any]]) -> str:
+    """Plain-text listing used by the CLI subcommand and :history."""
+
+    if not results:
+        return "No matching turns."
+
+    lines = []
+
+    for result in results:
+        tools = f"  (tools: {result['tools']})" if result["tools"] else ""
+        lines.append(f"[{result['ts']}] #{result['id']}{tools}")
+        lines.append(f"  You: {result['user']}")
+        lines.append(f"  AI:  {json.dumps(result['snippet'], ensure_ascii=False)[1:-1]}")
+
+    return "\n".join(lines)
@@ -0,0 +1,200 @@
+# src/core/jobs.py
+from __future__ import annotations
+
+import itertools
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from rich.table import Table
+
+TurnRunner = Callable[[Callable[[str], None]], Any]
+
+
+class Job:
+    """
+    One turn running in the background.
+
+    The worker feeds `update` with the accumulated text, exactly like a
+    stream callback; whoever is attached (`:fg`) sees it live, and the text
+    is kept for whoever asks later.
+    """
+
+    def __init__(self, job_id: int, prompt: str) -> None:
+        self.id = job_id
+        self.prompt = prompt
+        self.text = ""
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+        self.shown = False  # output already seen in the foreground
+        self.done = threading.Event()
+        self._listener: Callable[[str], None] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def status(self) -> str:
+        if not self.done.is_set():
+            return "running"
+
+        return "failed" if self.error is not None else "done"
+
+    @property
+    def elapsed_s(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def update(self, text: str) -> None:
+        with self._lock:
+            self.text = text
+
+            if self._listener is not None:
+                self._listener(text)
+
+    def attach(self, listener: Callable[[str], None]) -> None:
+        """Send the text so far, then every update, to `listener`."""
+
+        with self._lock:
+            self._listener = listener
+
+            if self.text:
+                listener(self.text)
+
+    def detach(self) -> None:
+        with self._lock:
+            self._listener = None
+
+    def wait(self, poll_s: float = 0.1) -> None:
+        """Block until the job ends; Ctrl-C still reaches the caller."""
+
+        while not self.done.wait(poll_s):
+            pass
+
+
+class JobManager:
+    """Background turns for the REPL, each on its own daemon thread."""
+
+    def __init__(self) -> None:
+        self._jobs: dict[int, Job] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def start(self, prompt: str, run: TurnRunner) -> Job:
+        """
+        Run `run(stream_callback)` in the background.
+
+        `run` is called on the worker thread and should return the turn's
+        result; it must not touch the foreground conversation state.
+        """
+
+        with self._lock:
+            job = Job(next(self._ids), prompt)
+            self._jobs[job.id] = job
+
+        def work() -> None:
+            try:
+                job.result = run(job.update)
+
+                if job.result is not None:
+                    job.update(getattr(job.result, "text", job.text))
+            except BaseException as error:
+                job.error = error
+            finally:
+                job.finished = time.perf_counter()
+                job.done.set()
+
+        threading.Thread(target=work, name=f"neuro-job-{job.id}", daemon=True).start()
+        return job
+
+    def get(self, job_id: int | None = None) -> Job | None:
+        """A job by id, or the most recent one."""
+
+        with self._lock:
+            if job_id is None:
+                return self._jobs[max(self._jobs)] if self._jobs else None
+
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> list[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def running(self) -> list[Job]:
+        return [job for job in self.jobs() if job.status == "running"]
+
+    def wait_running(self, timeout_s: float) -> list[Job]:
+        """Wait up to `timeout_s` for running jobs; returns those still running."""
+
+        deadline = time.perf_counter() + timeout_s
+
+        # Short waits, as in Job.wait, so Ctrl-C still reaches the caller.
+        while time.perf_counter() < deadline:
+            running = self.running()
+
+            if not running:
+                break
+
+            running[0].done.wait(0.1)
+
+        return self.running()
+
+    def take_finished(self) -> list[Job]:
+        """Finished jobs whose output has not been shown yet; marks them shown."""
+
+        finished = [job for job in self.jobs() if job.done.is_set() and not job.shown]
+
+        for job in finished:
+            job.shown = True
+
+        return finished
+
+
+def parse_background(user: str) -> str | None:
+    """The prompt of an `&`-suffixed line, or None for a foreground one."""
+
+    if user.endswith("&") and not user.endswith("&&"):
+        return user[:-1].rstrip() or None
+
+    return None
+
+
+def jobs_table(jobs: list[Job]) -> Table:
+    table = Table(title="Background Jobs")
+    table.add_column("Job", style="cyan", justify="right")
+    table.add_column("Status")
+    table.add_column("Elapsed", justify="right")
+    table.add_column("Chars", justify="right")
+    table.add_column("Prompt", style="white", overflow="ellipsis", no_wrap=True, max_width=60)
+    colours = {"running": "yellow", "done": "green", "failed": "red"}
+
+    for job in jobs:
+        table.add_row(
+            str(job.id),
+            f"[{colours[job.status]}]{job.status}[/]",
+            f"{job.elapsed_s:.1f}s",
+            str(len(job.text)),
+            job.prompt,
+        )
+
+    return table
+
+
+@contextmanager
+def plain_stream() -> Iterator[Callable[[str], None]]:
+    """Stream callback that prints only the new part of the text."""
+
+    printed = 0
+
+    def write(text: str) -> None:
+        nonlocal printed
+        sys.stdout.write(text[printed:])
+        sys.stdout.flush()
+        printed = len(text)
+
+    yield write
+
+    if printed:
+        sys.stdout.write("\n")
+        sys.stdout.flush()
@@ -0,0 +1,297 @@
+# src/core/model_router.py
+from __future__ import annotations
+
+import inspect
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Iterable
+
+from rich.console import Console
+
+from .response_cache import replayable
+from .router import tool_router
+from .stats import session_stats
+
+console = Console(stderr=True)
+
+# `--model auto` / `:setmodel auto` / NEURO_MODEL=auto turn routing on.
+AUTO_MODEL = "auto"
+
+FAST_MODEL = os.getenv("NEURO_FAST_MODEL", "gpt-5.4-nano")
+HEAVY_MODEL = os.getenv("NEURO_HEAVY_MODEL", "gpt-5.6-sol")
+
+# Prompts longer than this (words) always go to the heavy model.
+FAST_MAX_WORDS = int(os.getenv("NEURO_FAST_MAX_WORDS", "40"))
+
+# Words that signal reasoning, writing or code work rather than a lookup
+# or a device command. Matched at word starts.
+HEAVY_CUES = (
+    "analy", "architect", "compare", "critique", "debug", "derive", "design",
+    "essay", "evaluat", "explain", "implement", "improve", "optimi", "plan",
+    "proof", "prove", "refactor", "research", "review", "step by step",
+    "strateg", "summar", "translat", "tradeoff", "trade-off", "why", "write",
+)
+_HEAVY_CUE = re.compile(r"\b(?:" + "|".join(map(re.escape, HEAVY_CUES)) + ")", re.IGNORECASE)
+
+# Tool groups that are cheap to drive from a small model.
+LIGHT_GROUPS = frozenset({"homeassistant", "history"})
+
+_UNSURE = re.compile(
+    r"\b(?:i(?:'m| am) not sure|i (?:can(?:no|')t|am unable to|don't know)|"
+    r"unable to (?:determine|help)|as an ai)\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class RouteDecision:
+    model: str
+    tier: str  # "fast" | "heavy"
+    reason: str
+    escalated: str | None = None  # why a fast answer was redone
+    discarded: dict[str, Any] | None = None  # ...and what that answer cost
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class ModelRouter:
+    """
+    Local, rule-based routing between a fast and a heavy model.
+
+    classify() looks only at the prompt (length, shape, cue words, the tool
+    groups it would need); check() looks at a fast answer and says why it
+    should be redone on the heavy model, if at all.
+    """
+
+    def __init__(
+        self,
+        *,
+        fast_model: str = FAST_MODEL,
+        heavy_model: str = HEAVY_MODEL,
+        fast_max_words: int = FAST_MAX_WORDS,
+    ) -> None:
+        self.fast_model = fast_model
+        self.heavy_model = heavy_model
+        self.fast_max_words = fast_max_words
+        self.counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def _heavy(self, reason: str) -> RouteDecision:
+        return RouteDecision(self.heavy_model, "heavy", reason)
+
+    def classify(
+        self,
+        prompt: str,
+        *,
+        command_mode: bool = False,
+        tool_groups: Iterable[str] = (),
+    ) -> RouteDecision:
+        words = len(prompt.split())
+
+        if words > self.fast_max_words:
+            return self._heavy(f"long prompt ({words} words)")
+
+        if "```" in prompt or prompt.count("\n") > 3:
+            return self._heavy("multi-line or code input")
+
+        cue = _HEAVY_CUE.search(prompt)
+
+        if cue and not command_mode:
+            return self._heavy(f"reasoning cue '{cue.group(0).lower()}'")
+
+        # A shell one-liner mentions files and code without needing tools.
+        groups = frozenset(tool_groups)
+
+        if not command_mode:
+            groups |= tool_router.match(prompt)
+
+        heavy_groups = groups - LIGHT_GROUPS
+
+        if heavy_groups:
+            return self._heavy(f"tools: {', '.join(sorted(heavy_groups))}")
+
+        reason = "shell command" if command_mode else "short prompt"
+
+        if groups:
+            reason += f", tools: {', '.join(sorted(groups))}"
+
+        return RouteDecision(self.fast_model, "fast", reason)
+
+    def check(self, result: Any, *, command_mode: bool = False) -> str | None:
+        """Why a fast answer is not good enough, or None."""
+
+        text = (getattr(result, "text", "") or "").strip()
+
+        if not text:
+            return "empty answer"
+
+        if getattr(result, "budget_exhausted", None):
+            return f"tool budget exhausted ({result.budget_exhausted})"
+
+        if '"error"' in (getattr(result, "tool_output_preview", "") or ""):
+            return "tool returned an error"
+
+        if _UNSURE.search(text):
+            return "answer sounds unsure"
+
+        if command_mode and ("`" in text or len(text.splitlines()) > 3):
+            return "not a bare shell command"
+
+        return None
+
+    def record(self, decision: RouteDecision) -> None:
+        with self._lock:
+            self.counts[decision.tier] += 1
+
+            if decision.escalated:
+                self.counts["escalated"] += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+model_router = ModelRouter()
+
+
+def _routing(kwargs: dict[str, Any]) -> tuple[RouteDecision, bool]:
+    command_mode = kwargs.get("tool_mode") == "command"
+    decision = model_router.classify(
+        kwargs["user"],
+        command_mode=command_mode,
+        tool_groups=kwargs.get("tool_groups") or (),
+    )
+    return decision, command_mode
+
+
+def _escalation(
+    decision: RouteDecision,
+    result: Any,
+    command_mode: bool,
+    kwargs: dict[str, Any],
+) -> RouteDecision | None:
+    if decision.tier != "fast":
+        return None
+
+    problem = model_router.check(result, command_mode=command_mode)
+
+    # Redoing a turn re-runs its tools; only read-only ones may run twice.
+    if problem is None or not replayable(result.tools_used):
+        return None
+
+    if kwargs.get("emit_output") or kwargs.get("stream_callback"):
+        console.print(
+            f"[yellow]{decision.model}: {problem}; "
+            f"asking {model_router.heavy_model}.[/yellow]"
+        )
+
+    return RouteDecision(
+        model_router.heavy_model,
+        "heavy",
+        decision.reason,
+        escalated=problem,
+        discarded=_discarded(decision, result),
+    )
+
+
+def _discarded(decision: RouteDecision, result: Any) -> dict[str, Any]:
+    # The redone attempt is never logged as a turn of its own; the heavy
+    # turn's route keeps enough to account for it.
+    metrics = result.metrics
+
+    return {
+        "model": decision.model,
+        "response_id": result.response_id,
+        "duration_ms": round(metrics.total_s * 1000, 1) if metrics else None,
+        "usage": dict(metrics.usage) if metrics else None,
+    }
+
+
+def _attempt_kwargs(decision: RouteDecision, kwargs: dict[str, Any]) -> dict[str, Any]:
+    options = {**kwargs, "model": decision.model, "route": decision.as_dict(), "defer_log": True}
+
+    if decision.tier == "fast":
+        # Buffered: a fast answer may be redone, and a streamed "I don't
+        # know" must not show before the heavy answer replaces it.
+        options.update(emit_output=False, stream_callback=None)
+
+    return options
+
+
+def _replay(result: Any, kwargs: dict[str, Any]) -> Any:
+    """Show a buffered fast answer the way the caller asked to see it."""
+
+    if kwargs.get("stream_callback"):
+        return kwargs["stream_callback"](result.text)
+
+    if kwargs.get("emit_output") and result.text:
+        sys.stdout.write(result.text if result.text.endswith("\n") else result.text + "\n")
+        sys.stdout.flush()
+
+    return None
+
+
+def _settle(
+    decision: RouteDecision,
+    result: Any,
+    command_mode: bool,
+    kwargs: dict[str, Any],
+) -> RouteDecision | None:
+    """Keep (and show) the first answer, or return the retry to run instead."""
+
+    retry = _escalation(decision, result, command_mode, kwargs)
+
+    if retry is not None:
+        # Not a turn of its own, but what the fast model cost belongs in
+        # its latency stats: these are the answers routing got wrong.
+        if result.metrics is not None:
+            session_stats.record(decision.model, result.metrics, discarded=True)
+
+        return retry
+
+    if not kwargs.get("defer_log"):
+        result.commit()
+
+    return None
+
+
+def run_auto_turn(run: Callable[..., Any], **kwargs: Any) -> Any:
+    """Run a turn with model="auto": route, check, escalate once."""
+
+    decision, command_mode = _routing(kwargs)
+    result = run(**_attempt_kwargs(decision, kwargs))
+    retry = _settle(decision, result, command_mode, kwargs)
+
+    if retry is None:
+        if decision.tier == "fast":
+            _replay(result, kwargs)
+    else:
+        decision = retry
+        result = run(**kwargs, model=decision.model, route=decision.as_dict())
+
+    model_router.record(decision)
+    return result
+
+
+async def run_auto_turn_async(
+    run: Callable[..., Awaitable[Any]],
+    **kwargs: Any,
+) -> Any:
+    decision, command_mode = _routing(kwargs)
+    result = await run(**_attempt_kwargs(decision, kwargs))
+    retry = _settle(decision, result, command_mode, kwargs)
+
+    if retry is None:
+        if decision.tier == "fast" and inspect.isawaitable(replayed := _replay(result, kwargs)):
+            await replayed
+    else:
+        decision = retry
+        result = await run(**kwargs, model=decision.model, route=decision.as_dict())
+
+    model_router.record(decision)
+    return result
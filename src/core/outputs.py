@@ -0,0 +1,195 @@
+# src/core/outputs.py
+from __future__ import annotations
+
+import json
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import Any
+
+from .registry import ToolSpec, register_tool
+
+# Roughly 4 bytes per token for English/JSON, so the default is ~4k tokens.
+DEFAULT_OUTPUT_BUDGET = int(os.getenv("NEURO_TOOL_OUTPUT_BUDGET", "16000"))
+
+PREVIEW_CHARS = 2000
+# tool_output_read runs unbudgeted, so one page may be no larger than what
+# any other tool is allowed to return inline.
+MAX_READ_CHARS = DEFAULT_OUTPUT_BUDGET if DEFAULT_OUTPUT_BUDGET > 0 else 32000
+MAX_SPILL_FILES = 200
+
+_HANDLE_RE = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def spill_dir() -> Path:
+    """Directory for oversized tool outputs (next to the history log)."""
+
+    neuro_home = Path(os.getenv("NEURO_HOME", Path.home() / ".neuro"))
+    return Path(
+        os.getenv("NEURO_SPILL_DIR", neuro_home / "tool_outputs")
+    ).expanduser()
+
+
+def _shape(output: str) -> dict[str, Any]:
+    """A cheap structural summary so the model knows what it is paging."""
+
+    try:
+        value = json.loads(output)
+    except Exception:
+        return {"type": "text", "lines": output.count("\n") + 1}
+
+    if isinstance(value, list):
+        shape: dict[str, Any] = {"type": "list", "items": len(value)}
+
+        if value and isinstance(value[0], dict):
+            shape["item_keys"] = list(value[0])[:20]
+
+        return shape
+
+    if isinstance(value, dict):
+        return {
+            "type": "object",
+            "key_bytes": {
+                key: len(json.dumps(item, ensure_ascii=False).encode("utf-8"))
+                for key, item in list(value.items())[:20]
+            },
+        }
+
+    return {"type": type(value).__name__}
+
+
+def _prune(directory: Path) -> None:
+    files = sorted(
+        directory.glob("*.txt"),
+        key=lambda path: path.stat().st_mtime,
+    )
+
+    for stale in files[:-MAX_SPILL_FILES]:
+        try:
+            stale.unlink()
+        except OSError:
+            pass
+
+
+def apply_budget(spec: ToolSpec, output: str) -> str:
+    """
+    Keep a tool's output within its byte budget.
+
+    Oversized output is written to disk and replaced with a summary, a
+    preview and a handle the model can page through with tool_output_read.
+    """
+
+    budget = spec.output_budget
+
+    if budget is None:
+        budget = DEFAULT_OUTPUT_BUDGET
+
+    size = len(output.encode("utf-8"))
+
+    if budget <= 0 or size <= budget:
+        return output
+
+    directory = spill_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    handle = f"{spec.name}-{uuid.uuid4().hex[:12]}"
+    (directory / f"{handle}.txt").write_text(output, encoding="utf-8")
+    _prune(directory)
+
+    preview_chars = min(PREVIEW_CHARS, max(200, budget // 4))
+
+    return json.dumps(
+        {
+            "truncated": True,
+            "tool": spec.name,
+            "handle": handle,
+            "total_bytes": size,
+            "total_chars": len(output),
+            "approx_tokens": size // 4,
+            "shape": _shape(output),
+            "preview": output[:preview_chars],
+            "next_offset": preview_chars,
+            "hint": (
+                "Output exceeded the tool budget and was stored locally. "
+                "Call tool_output_read with this handle to page through the "
+                "rest only if you need it."
+            ),
+        },
+        ensure_ascii=False,
+    )
+
+
+def spill_available(output: str) -> bool:
+    """
+    False when `output` is a spill summary whose file has been pruned.
+
+    Cached summaries outlive their files once MAX_SPILL_FILES newer
+    spills exist; serving one would hand the model a dead handle.
+    """
+
+    if not output.startswith('{"truncated": true'):
+        return True
+
+    try:
+        handle = json.loads(output).get("handle")
+    except Exception:
+        return True
+
+    return not handle or (spill_dir() / f"{handle}.txt").exists()
+
+
+def tool_output_read(handle: str, offset: int = 0, limit: int = 8000):
+    """Return one page of a spilled tool output."""
+
+    if not handle or not _HANDLE_RE.match(handle):
+        return {"error": f"Invalid handle: {handle!r}"}
+
+    path = spill_dir() / f"{handle}.txt"
+
+    if not path.exists():
+        return {"error": f"Unknown or expired handle: {handle}"}
+
+    text = path.read_text(encoding="utf-8")
+    offset = max(0, int(offset or 0))
+    limit = max(1, min(int(limit or 8000), MAX_READ_CHARS))
+    content = text[offset:offset + limit]
+    encoded = content.encode("utf-8")
+
+    # The budget is in bytes; multi-byte text can exceed it at `limit` chars.
+    if len(encoded) > MAX_READ_CHARS:
+        content = encoded[:MAX_READ_CHARS].decode("utf-8", errors="ignore")
+
+    end = offset + len(content)
+
+    return {
+        "handle": handle,
+        "offset": offset,
+        "total_chars": len(text),
+        "content": content,
+        "next_offset": end if end < len(text) else None,
+    }
+
+
+register_tool(
+    ToolSpec(
+        name="tool_output_read",
+        kind="function",
+        description=(
+            "Page through a tool output that was too large to return inline. "
+            "Use the handle from a truncated tool result."
+        ),
+        parameters={
+            "type": "object",
+            "properties": {
+                "handle": {"type": "string"},
+                "offset": {"type": "integer", "minimum": 0, "default": 0},
+                "limit": {"type": "integer", "minimum": 1, "maximum": MAX_READ_CHARS, "default": 8000},
+            },
+            "required": ["handle"],
+        },
+        runner=tool_output_read,
+        # Pages are already bounded by MAX_READ_CHARS (the default budget).
+        output_budget=0,
+    )
+)
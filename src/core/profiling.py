@@ -0,0 +1,208 @@
+# src/core/profiling.py
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from rich.console import Console
+from rich.markup import escape
+
+from .turnlog import jsonl_path
+
+console = Console(stderr=True)
+
+# Allocation sites worth ignoring: the profilers' own bookkeeping.
+_ALLOC_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, pstats.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+
+def profile_dir(log_file: str | Path) -> Path:
+    """Profiles live in a `profiles/` folder next to the history log."""
+
+    return jsonl_path(log_file).parent / "profiles"
+
+
+@dataclass
+class TurnProfile:
+    """What one profiled turn cost, and where the full reports were written."""
+
+    label: str
+    wall_s: float = 0.0
+    thread_s: float = 0.0  # profiled (calling) thread only
+    peak_bytes: int = 0  # peak of memory allocated during the turn
+    retained_bytes: int = 0  # ...and still held when it finished
+    hot: list[tuple[str, int, float, float]] = field(default_factory=list)
+    allocations: list[tuple[str, int, int]] = field(default_factory=list)
+    stats_path: Path | None = None
+    report_path: Path | None = None
+
+
+def _alloc_site(frame: tracemalloc.Frame) -> str:
+    path = Path(frame.filename)
+    return f"{path.parent.name}/{path.name}:{frame.lineno}" if path.parent.name else str(frame)
+
+
+def _site(func: tuple[str, int, str]) -> str:
+    filename, line, name = func
+
+    if filename == "~":
+        return name  # builtins, e.g. <method 'read' of '_ssl._SSLSocket'>
+
+    return f"{Path(filename).name}:{line}({name})"
+
+
+class TurnProfiler:
+    """
+    cProfile and tracemalloc around one turn.
+
+    cProfile sees the thread that runs the turn (event handling, rendering,
+    tool-output formatting); stream readers and tool workers show up as time
+    spent waiting on them. tracemalloc covers every thread. On exit the
+    binary stats (`.prof`, for pstats / snakeviz) and a text report go to
+    `directory`, and `profile` holds the summary.
+    """
+
+    _lock = threading.Lock()  # one profiler per process at a time
+
+    def __init__(self, directory: str | Path, *, label: str = "turn", top: int = 5) -> None:
+        self.directory = Path(directory).expanduser()
+        self.top = top
+        self.profile = TurnProfile(label=label)
+        self._profiler = cProfile.Profile()
+        self._before: tracemalloc.Snapshot | None = None
+        self._baseline = 0
+        self._started_tracing = False
+        self._started = 0.0
+
+    def __enter__(self) -> "TurnProfiler":
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("another turn is already being profiled")
+
+        if tracemalloc.is_tracing():
+            self._before = tracemalloc.take_snapshot().filter_traces(_ALLOC_FILTERS)
+            self._baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        else:
+            # One frame per allocation: the report groups by line, and
+            # deeper tracebacks slow a turn by an order of magnitude.
+            tracemalloc.start(1)
+            self._started_tracing = True
+
+        self._started = time.perf_counter()
+        self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._profiler.disable()
+
+        try:
+            self.profile.wall_s = time.perf_counter() - self._started
+            snapshot = tracemalloc.take_snapshot().filter_traces(_ALLOC_FILTERS)
+            current, peak = tracemalloc.get_traced_memory()
+
+            if self._started_tracing:
+                tracemalloc.stop()
+
+            self.profile.peak_bytes = max(0, peak - self._baseline)
+            self.profile.retained_bytes = max(0, current - self._baseline)
+            allocations = self._allocation_diff(snapshot)
+            self._summarize(allocations)
+            self._write(allocations)
+        finally:
+            self._lock.release()
+
+    def _summarize(self, allocations: list[tracemalloc.StatisticDiff]) -> None:
+        stats = pstats.Stats(self._profiler)
+        self.profile.thread_s = stats.total_tt
+        hottest = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+        self.profile.hot = [
+            (_site(func), calls, tottime, cumtime)
+            for func, (_, calls, tottime, cumtime, _) in hottest[: self.top]
+        ]
+        self.profile.allocations = [
+            (_alloc_site(stat.traceback[0]), stat.size_diff, stat.count_diff)
+            for stat in allocations[: self.top]
+        ]
+
+    def _allocation_diff(self, snapshot: tracemalloc.Snapshot) -> list[tracemalloc.StatisticDiff]:
+        if self._before is None:
+            # Tracing started with the turn: everything traced is new.
+            return [
+                tracemalloc.StatisticDiff(stat.traceback, stat.size, stat.size, stat.count, stat.count)
+                for stat in snapshot.statistics("lineno")
+            ]
+
+        return snapshot.compare_to(self._before, "lineno")
+
+    def _write(self, allocations: list[tracemalloc.StatisticDiff]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")[:-3]
+        base = self.directory / f"{stamp}-{self.profile.label}"
+
+        stats_path = base.with_suffix(".prof")
+        self._profiler.dump_stats(stats_path)
+
+        report = io.StringIO()
+        report.write(
+            f"{self.profile.label}: {self.profile.wall_s:.3f}s wall, "
+            f"{self.profile.thread_s:.3f}s profiled, "
+            f"peak {_mib(self.profile.peak_bytes)}, "
+            f"retained {_mib(self.profile.retained_bytes)}\n\n"
+        )
+        stats = pstats.Stats(self._profiler, stream=report)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(40)
+        report.write("Top allocations (size diff, count diff, site):\n")
+
+        for stat in allocations[:25]:
+            report.write(f"  {_mib(stat.size_diff):>12}  {stat.count_diff:>+8}  {stat.traceback[0]}\n")
+
+        report_path = base.with_suffix(".txt")
+        report_path.write_text(report.getvalue(), encoding="utf-8")
+        self.profile.stats_path = stats_path
+        self.profile.report_path = report_path
+
+
+def _mib(size: int) -> str:
+    return f"{size / (1024 * 1024):.2f} MiB"
+
+
+def print_summary(profile: TurnProfile) -> None:
+    """A short hot-function and memory summary on stderr."""
+
+    console.print(
+        f"[dim]profile[/] {profile.wall_s:.2f}s wall, "
+        f"{profile.thread_s:.2f}s on the turn thread, "
+        f"peak {_mib(profile.peak_bytes)} "
+        f"(retained {_mib(profile.retained_bytes)})",
+        highlight=False,
+    )
+
+    for site, calls, tottime, cumtime in profile.hot:
+        console.print(
+            f"  [cyan]{tottime:7.3f}s[/] self  {cumtime:7.3f}s cum  {calls:>7}x  {escape(site)}",
+            highlight=False,
+        )
+
+    for site, size, count in profile.allocations:
+        console.print(f"  [magenta]{_mib(size):>12}[/]  {count:>+7} blocks  {escape(site)}", highlight=False)
+
+    if profile.stats_path:
+        console.print(f"  [dim]{escape(str(profile.stats_path))} (+ .txt)[/]", highlight=False)
+
+
+def profile_turn(log_file: str | Path, *, label: str = "turn") -> TurnProfiler:
+    """Profiler for one turn, writing next to `log_file`."""
+
+    return TurnProfiler(profile_dir(log_file), label=label)
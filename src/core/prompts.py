@@ -0,0 +1,56 @@
+# src/core/prompts.py
+from __future__ import annotations
+
+import os
+
+NORMAL_INSTRUCTIONS = """
+You are Neuro, a terminal-native AI assistant.
+
+Answer the user's request directly and accurately. You may use any available
+tools when they would improve the answer. The user may be invoking you from an
+interactive terminal, an inline shell command, a pipe, or a script.
+""".strip()
+
+
+COMMAND_INSTRUCTIONS = """
+You are Neuro operating in shell-command mode.
+
+Return only the shell command needed to complete the user's request.
+
+Requirements:
+- Do not use Markdown.
+- Do not use code fences.
+- Do not use backticks.
+- Do not include an explanation.
+- Do not include a label such as "Command:".
+- Do not include introductory or closing text.
+- Return one directly runnable command whenever possible.
+- Use available tools when needed to determine the correct command.
+- Never claim that a command was executed unless a tool actually executed it.
+""".strip()
+
+
+# Namespace for prompt_cache_key; "off" stops sending one.
+PROMPT_CACHE_NAMESPACE = os.getenv("NEURO_PROMPT_CACHE_KEY", "neuro")
+
+
+def instructions_for(tool_mode: str) -> str:
+    """Default instructions for a tool mode (see router.TOOL_MODES)."""
+
+    return COMMAND_INSTRUCTIONS if tool_mode == "command" else NORMAL_INSTRUCTIONS
+
+
+def prompt_cache_key(tool_mode: str, session: str | None = None) -> str | None:
+    """
+    Cache-routing key for requests that share a prefix.
+
+    Requests with the same instructions and tools should land on the same
+    cache, so the default key is per mode; pass `session` to keep one
+    conversation's growing prefix together instead.
+    """
+
+    if PROMPT_CACHE_NAMESPACE.lower() in {"", "0", "off", "none"}:
+        return None
+
+    key = f"{PROMPT_CACHE_NAMESPACE}-{tool_mode}"
+    return f"{key}-{session}" if session else key
@@ -1,7 +1,36 @@
 # src/core/registry.py
 from __future__ import annotations
+import importlib
+import json
 import os
-from typing import Callable, Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Iterable, Optional, List
+
+
+class CachePolicy:
+    """
+    Declares that a tool's results may be reused for a while.
+
+    ttl:     seconds a result stays fresh.
+    key:     maps call args to a cache key; defaults to the canonicalized args.
+    tags:    labels stored with each entry so other tools can invalidate it
+             (e.g. "entity:light.kitchen").
+    accept:  returns False for results that must not be cached (errors, etc.).
+    """
+    def __init__(
+        self,
+        *,
+        ttl: float,
+        key: Optional[Callable[[Any], Any]] = None,
+        tags: Optional[Callable[[Any], Iterable[str]]] = None,
+        accept: Optional[Callable[[Any], bool]] = None,
+    ):
+        if ttl <= 0:
+            raise ValueError(f"Cache ttl must be positive: {ttl}")
+        self.ttl = ttl
+        self.key = key
+        self.tags = tags
+        self.accept = accept
+
 
 class ToolSpec:
     """
@@ -20,6 +49,12 @@ class ToolSpec:
         description: str,
         runner: Callable[..., Any],
         parameters: Optional[dict] = None,  # JSON Schema for function args
+        cache: Optional[CachePolicy] = None,  # reuse results for idempotent tools
+        invalidates: Optional[Callable[[Any], Iterable[str]]] = None,  # cache tags a call makes stale
+        output_budget: Optional[int] = None,  # max output bytes sent to the model; None = default, 0 = unlimited
+        groups: Optional[Iterable[str]] = None,  # router groups; None = always offered
+        keywords: Optional[Iterable[str]] = None,  # words in a prompt that select this tool's groups
+        module: Optional[str] = None,  # set on lazy placeholders: import this to get the real spec
     ):
         if kind not in {"custom", "function"}:
             raise ValueError(f"Unsupported tool kind: {kind}")
@@ -29,6 +64,12 @@ class ToolSpec:
         # Default empty-object schema so the LLM still sends {} if there are no args.
         self.parameters = parameters or {"type": "object", "properties": {}}
         self.runner = runner
+        self.cache = cache
+        self.invalidates = invalidates
+        self.output_budget = output_budget
+        self.groups = frozenset(groups or ())
+        self.keywords = tuple(keywords or ())
+        self.module = module
 
     def to_openai_tool(self) -> dict:
         """
@@ -45,17 +86,85 @@ class ToolSpec:
 
 _registry: Dict[str, ToolSpec] = {}
 
+# Bumped on every change so derived payloads know when to rebuild.
+_version = 0
+
 
 def register_tool(spec: ToolSpec) -> None:
-    """Register a tool by name; raises if the name already exists."""
-    if spec.name in _registry:
+    """
+    Register a tool by name; raises if the name already exists.
+    A lazy placeholder (see register_lazy_tool) is replaced by the real spec.
+    """
+    global _version
+    existing = _registry.get(spec.name)
+    if existing is not None and existing.module is None:
         raise ValueError(f"Tool already registered: {spec.name}")
     _registry[spec.name] = spec
+    _version += 1
+
+
+def _not_loaded(*_args, **_kwargs):
+    raise RuntimeError("Lazy tool placeholder called; resolve it with get_tool()")
+
+
+def register_lazy_tool(
+    *,
+    name: str,
+    module: str,
+    description: str,
+    parameters: Optional[dict] = None,
+    groups: Optional[Iterable[str]] = None,
+    keywords: Optional[Iterable[str]] = None,
+) -> None:
+    """
+    Register a tool's schema without importing its module.
+
+    The placeholder is enough to build request payloads; get_tool() imports
+    `module` on first use, which registers the real spec over it. Ignored if
+    the real tool is already registered.
+    """
+    if name in _registry:
+        return
+    register_tool(
+        ToolSpec(
+            name=name,
+            kind="function",
+            description=description,
+            runner=_not_loaded,
+            parameters=parameters,
+            groups=groups,
+            keywords=keywords,
+            module=module,
+        )
+    )
+
+
+def unregister_tool(name: str) -> Optional[ToolSpec]:
+    """Remove a tool by name; returns the removed spec, if any."""
+    global _version
+    spec = _registry.pop(name, None)
+    if spec is not None:
+        _version += 1
+    return spec
+
+
+def registry_version() -> int:
+    """Monotonic counter that changes whenever the registry does."""
+    return _version
 
 
 def get_tool(name: str) -> Optional[ToolSpec]:
-    """Return a tool spec or None if not found (avoid KeyError in the runtime)."""
-    return _registry.get(name)
+    """
+    Return a tool spec or None if not found (avoid KeyError in the runtime).
+    Lazy placeholders are loaded here, on first use.
+    """
+    spec = _registry.get(name)
+    if spec is not None and spec.module is not None:
+        importlib.import_module(spec.module)
+        spec = _registry.get(name)
+        if spec is not None and spec.module is not None:
+            raise RuntimeError(f"Module {spec.module} did not register tool {name}")
+    return spec
 
 
 def all_tools() -> Dict[str, ToolSpec]:
@@ -63,24 +172,41 @@ def all_tools() -> Dict[str, ToolSpec]:
     return dict(_registry)
 
 
+def canonical_tool(tool: dict) -> dict:
+    """
+    Key-sorted copy of a tool payload. Schemas arrive from code or from the
+    manifest in different key orders; the request prefix must not change
+    with them, or the server's prompt cache misses.
+    """
+    return json.loads(json.dumps(tool, sort_keys=True))
+
+
 def as_openai_tools() -> List[dict]:
     """
     Produce the OpenAI tool list from the registry.
     - Exposes BOTH 'function' and 'custom' kinds as 'type': 'function'.
     - Uses each ToolSpec's JSON schema so the model sends correct kwargs.
+    - Sorted by name and canonicalized, so the list is byte-stable however
+      and in whatever order the tool modules were loaded.
     """
-    return [spec.to_openai_tool() for spec in _registry.values()]
+    return [canonical_tool(_registry[name].to_openai_tool()) for name in sorted(_registry)]
+
+
+def web_search_tool() -> dict:
+    """Hosted web search, localized from CITY/STATE."""
+    return {
+        "type": "web_search",
+        "user_location": {
+            "type": "approximate",
+            "country": "US",
+            "city": os.getenv("CITY"),
+            "region": os.getenv("STATE")
+        }
+    }
+
 
 def runtime_tools():
     return [
         *as_openai_tools(),   # local Neuro tools from registry.py
-        {
-            "type": "web_search",
-            "user_location": {
-                "type": "approximate",
-                "country": "US",
-                "city": os.getenv("CITY"),
-                "region": os.getenv("STATE")
-            }
-        },
+        canonical_tool(web_search_tool()),
     ]
\ No newline at end of file
@@ -0,0 +1,174 @@
+# src/core/response_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable
+
+from .registry import get_tool
+
+DEFAULT_TTL = float(os.getenv("NEURO_COMMAND_CACHE_TTL", str(24 * 3600)))
+DEFAULT_MAX_BYTES = int(os.getenv("NEURO_COMMAND_CACHE_MAX_BYTES", str(5 * 1024 * 1024)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed);
+"""
+
+
+def default_cache_path() -> Path:
+    neuro_home = Path(os.getenv("NEURO_HOME", Path.home() / ".neuro")).expanduser()
+    return Path(
+        os.getenv("NEURO_COMMAND_CACHE", neuro_home / "command_cache.db")
+    ).expanduser()
+
+
+def cache_key(**parts: str) -> str:
+    """Stable digest of everything that determines a command-mode answer."""
+
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def replayable(tools_used: Iterable[str]) -> bool:
+    """
+    True when an answer can be served again without re-running its tools.
+
+    Only answers built from no tools, or from tools that declare a
+    CachePolicy (idempotent reads), qualify.
+    """
+
+    for name in tools_used:
+        spec = get_tool(name)
+
+        if spec is None or spec.cache is None:
+            return False
+
+    return True
+
+
+class ResponseCache:
+    """
+    Persistent prompt -> response cache with TTL and size-bounded LRU.
+
+    Backed by a single SQLite file so separate `neuro -c` processes share it.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        *,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.path = Path(path).expanduser() if path else default_cache_path()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=2)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            value, created = row
+
+            if now - created > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?",
+                (now, key),
+            )
+            self._conn.commit()
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        now = time.time()
+        size = len(value.encode("utf-8"))
+
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, accessed, size) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, now, now, size),
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE created < ?",
+                (now - self.ttl,),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+        if total <= self.max_bytes:
+            return
+
+        # Oldest-accessed first until we are back under budget.
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_caches: dict[Path, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(path: str | Path | None = None) -> ResponseCache:
+    """Shared cache for a database file (one connection per file)."""
+
+    resolved = Path(path).expanduser() if path else default_cache_path()
+
+    with _caches_lock:
+        cache = _caches.get(resolved)
+
+        if cache is None:
+            cache = ResponseCache(resolved)
+            _caches[resolved] = cache
+
+        return cache
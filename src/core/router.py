@@ -0,0 +1,252 @@
+# src/core/router.py
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, replace
+from typing import Any, Iterable
+
+from .registry import all_tools, canonical_tool, registry_version, web_search_tool
+
+
+# NEURO_TOOL_ROUTER=0 offers every tool on every request, as before.
+ROUTER_ENABLED = os.getenv("NEURO_TOOL_ROUTER", "1").lower() not in {
+    "0",
+    "false",
+    "no",
+    "off",
+}
+
+# Modes decide which hosted tools are offered alongside the local ones.
+#   chat:    routed local tools plus web search (REPL and inline prompts)
+#   command: routed local tools only; `-c` answers a shell command
+#   all:     every registered tool plus web search, no routing
+#   none:    no tools at all (pure text work such as map-reduce chunks)
+TOOL_MODES = ("chat", "command", "all", "none")
+
+
+def _payload_bytes(tool: dict[str, Any]) -> int:
+    return len(
+        json.dumps(tool, separators=(",", ":"), ensure_ascii=False).encode(
+            "utf-8"
+        )
+    )
+
+
+def _keyword_regex(word: str) -> str:
+    # A trailing space marks a whole word: "run " is not "running".
+    if word.endswith(" "):
+        return re.escape(word.strip()) + r"s?\b"
+
+    return re.escape(word)
+
+
+def _keyword_pattern(keywords: Iterable[str]) -> re.Pattern | None:
+    """
+    One regex per group: keywords match at a word start, so "light" also
+    catches "lights" and "lighting". Short, ambiguous keywords end with a
+    space to match only as a whole word (or its plural).
+    """
+
+    words = sorted({word.lower() for word in keywords if word.strip()}, key=len)
+
+    if not words:
+        return None
+
+    return re.compile(
+        r"\b(?:" + "|".join(_keyword_regex(word) for word in reversed(words)) + ")",
+        re.IGNORECASE,
+    )
+
+
+@dataclass(frozen=True)
+class ToolSelection:
+    """The frozen tools payload chosen for one turn."""
+
+    tools: tuple[dict[str, Any], ...]
+    names: tuple[str, ...]
+    groups: frozenset[str]
+    matched: frozenset[str]
+    bytes: int
+    full_bytes: int
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.full_bytes - self.bytes
+
+    def payload(self) -> list[dict[str, Any]]:
+        return list(self.tools)
+
+    def as_dict(self, round_trips: int = 1) -> dict[str, Any]:
+        return {
+            "offered": len(self.names),
+            "groups": sorted(self.groups),
+            "bytes": self.bytes,
+            "saved_bytes": self.saved_bytes * max(1, round_trips),
+        }
+
+
+@dataclass
+class _Catalog:
+    """Everything the router derives from one registry version."""
+
+    version: int
+    tools: dict[str, tuple[dict[str, Any], int, frozenset[str]]]
+    patterns: dict[str, re.Pattern]
+    web_search: tuple[dict[str, Any], int]
+    full_bytes: int
+    selections: dict[tuple, ToolSelection]
+
+    @classmethod
+    def build(cls, version: int) -> "_Catalog":
+        tools: dict[str, tuple[dict[str, Any], int, frozenset[str]]] = {}
+        keywords: dict[str, list[str]] = {}
+
+        # Name order and sorted keys keep each selection byte-stable.
+        for name, spec in sorted(all_tools().items()):
+            tool = canonical_tool(spec.to_openai_tool())
+            tools[name] = (tool, _payload_bytes(tool), spec.groups)
+
+            for group in spec.groups:
+                keywords.setdefault(group, []).extend(spec.keywords)
+
+        search = canonical_tool(web_search_tool())
+        web_search = (search, _payload_bytes(search))
+
+        return cls(
+            version=version,
+            tools=tools,
+            patterns={
+                group: pattern
+                for group, words in keywords.items()
+                if (pattern := _keyword_pattern(words)) is not None
+            },
+            web_search=web_search,
+            full_bytes=sum(size for _, size, _ in tools.values()) + web_search[1],
+            selections={},
+        )
+
+    def groups(self) -> frozenset[str]:
+        return frozenset(
+            group for _, _, groups in self.tools.values() for group in groups
+        )
+
+    def match(self, text: str) -> frozenset[str]:
+        return frozenset(
+            group
+            for group, pattern in self.patterns.items()
+            if pattern.search(text or "")
+        )
+
+
+class ToolRouter:
+    """
+    Pick the tools worth sending for a prompt.
+
+    Tools without groups are always offered. A group is offered when the
+    prompt mentions one of its keywords, or when the caller keeps it sticky
+    from the previous turn. Payloads are built once per registry version and
+    reused for every request with the same groups and mode.
+
+    Turns on many threads share one router: each call works on one catalog
+    snapshot, and a rebuilt catalog is only published whole, under a lock.
+    """
+
+    def __init__(self) -> None:
+        self._catalog: _Catalog | None = None
+        self._lock = threading.Lock()
+
+    def _current(self) -> _Catalog:
+        version = registry_version()
+        catalog = self._catalog
+
+        if catalog is not None and catalog.version == version:
+            return catalog
+
+        # Built outside the lock: a lazy tool import can take a while, and
+        # may itself register tools (a newer version, rebuilt next call).
+        fresh = _Catalog.build(version)
+
+        with self._lock:
+            catalog = self._catalog
+
+            if catalog is not None and catalog.version == registry_version():
+                return catalog  # another thread published it meanwhile
+
+            self._catalog = fresh
+            return fresh
+
+    def groups(self) -> frozenset[str]:
+        """Every group declared by a registered tool."""
+
+        return self._current().groups()
+
+    def groups_for(self, names: Iterable[str]) -> frozenset[str]:
+        """Groups of the named tools, e.g. the ones a turn actually used."""
+
+        tools = self._current().tools
+        return frozenset(
+            group
+            for name in names
+            if name in tools
+            for group in tools[name][2]
+        )
+
+    def match(self, text: str) -> frozenset[str]:
+        """Groups whose keywords appear in the text."""
+
+        return self._current().match(text)
+
+    def select(
+        self,
+        text: str,
+        *,
+        mode: str = "chat",
+        sticky: Iterable[str] = (),
+    ) -> ToolSelection:
+        if mode not in TOOL_MODES:
+            raise ValueError(f"Unknown tool mode: {mode}")
+
+        catalog = self._current()
+        matched = catalog.match(text)
+
+        if mode == "all" or not ROUTER_ENABLED:
+            groups = catalog.groups()
+        else:
+            groups = matched | frozenset(sticky)
+
+        key = (groups, mode)
+        selection = catalog.selections.get(key)
+
+        if selection is None:
+            selection = self._build(catalog, groups, mode)
+
+            with self._lock:
+                selection = catalog.selections.setdefault(key, selection)
+
+        return replace(selection, matched=matched)
+
+    @staticmethod
+    def _build(catalog: _Catalog, groups: frozenset[str], mode: str) -> ToolSelection:
+        chosen = [
+            (name, tool, size)
+            for name, (tool, size, tool_groups) in catalog.tools.items()
+            if mode != "none" and (not tool_groups or tool_groups & groups)
+        ]
+
+        if mode in {"chat", "all"}:
+            chosen.append(("web_search", *catalog.web_search))
+
+        return ToolSelection(
+            tools=tuple(tool for _, tool, _ in chosen),
+            names=tuple(name for name, _, _ in chosen),
+            groups=groups,
+            matched=frozenset(),
+            bytes=sum(size for _, _, size in chosen),
+            full_bytes=catalog.full_bytes,
+        )
+
+
+tool_router = ToolRouter()
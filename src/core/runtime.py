@@ -2,23 +2,73 @@
 
 from __future__ import annotations
 
+import asyncio
+import inspect
 import json
 import os
-import pathlib
 import sys
-from dataclasses import dataclass
-from typing import Any, Callable, Optional
-
-from openai import BadRequestError, OpenAI
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import CancelledError as FutureCancelledError
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Iterable, Optional, Union
+
+from openai import AsyncOpenAI, BadRequestError, OpenAI
 from prompt_toolkit.patch_stdout import patch_stdout
 from rich.console import Console
+from rich.markup import escape
 from contextlib import nullcontext
 
-from .registry import get_tool, runtime_tools
+from .budget import (
+    BudgetGuard,
+    TurnBudget,
+    final_answer_message,
+    loop_key,
+    skipped_output,
+)
+from .cache import TOOL_CACHE_ENABLED, tool_cache
+from .model_router import AUTO_MODEL, run_auto_turn, run_auto_turn_async
+from .jobs import Job, JobManager, jobs_table, parse_background, plain_stream
+from .outputs import apply_budget, spill_available
+from .profiling import print_summary as print_profile
+from .profiling import profile_turn
+from .prompts import instructions_for
+from .prompts import prompt_cache_key as cache_key_for
+from .registry import ToolSpec, get_tool, runtime_tools
+from .router import ToolSelection, tool_router
+from .stats import TurnMetrics, session_stats
+from .tracing import (
+    bind as trace_bind,
+    current as trace_current,
+    enabled as trace_enabled,
+    span as trace_span,
+)
+from .transport import prewarm
+from .turnlog import get_writer, jsonl_path, set_active_log
+from .watchdog import StallPolicy, StreamStalled, WatchedAsyncStream, WatchedStream
 
 
 console = Console(stderr=True)
 
+# Upper bound on tool runners executing at once for one model response.
+DEFAULT_TOOL_WORKERS = 4
+
+TOOL_CALL_TYPES = ("function_call", "custom_tool_call")
+
+TOOL_ARGUMENT_DELTA_TYPES = (
+    "response.function_call_arguments.delta",
+    "response.function_call.arguments.delta",
+    "response.function_call.delta",
+    "response.tool_call.delta",
+    "response.custom_tool_call_input.delta",
+)
+
+# Stream callbacks may be plain functions or coroutines in the async API.
+AsyncStreamCallback = Callable[[str], Union[None, Awaitable[None]]]
+
 
 @dataclass
 class TurnResult:
@@ -29,6 +79,27 @@ class TurnResult:
     tool_used: str | None = None
     tool_input_len: int = 0
     tool_output_preview: str = ""
+    tools_used: list[str] = field(default_factory=list)
+    metrics: TurnMetrics | None = None
+    budget_exhausted: str | None = None
+    tool_groups: frozenset[str] = frozenset()
+    # Writes the history record and session stats of a defer_log turn.
+    commit: Callable[[], None] = field(default=lambda: None, repr=False, compare=False)
+
+
+@dataclass
+class ToolRun:
+    """Outcome of one local tool call within a turn."""
+
+    name: str
+    call_id: str | None
+    args_bytes: int
+    output: str
+    duration_s: float = 0.0
+    cached: bool = False
+    repeated: bool = False
+    timed_out: bool = False
+    skipped: bool = False
 
 
 def _ensure_json_payload(value: str) -> str:
@@ -41,269 +112,1385 @@ def _ensure_json_payload(value: str) -> str:
         return json.dumps({"stdout": value})
 
 
-def _append_log(
-    log_file: str,
-    user: str,
-    ai_text: str,
-    tool_used: str | None = None,
-    tool_input_len: int = 0,
-    tool_output_preview: str = "",
-) -> None:
-    """Append a completed Neuro turn to the global history file."""
+def _append_log(log_file: str, record: dict[str, Any]) -> None:
+    """Queue a completed turn for the background history writer."""
 
-    path = pathlib.Path(log_file).expanduser()
-    path.parent.mkdir(parents=True, exist_ok=True)
+    get_writer(log_file).submit(record)
 
-    with path.open("a", encoding="utf-8") as file:
-        file.write(
-            "\n### turn\n"
-            f"**You:** {user}\n\n"
-            f"**AI:** {ai_text}\n"
-        )
 
-        if tool_used:
-            file.write(
-                f"\n_Tool used_: {tool_used}\n"
-                f"_Input bytes_: {tool_input_len}\n"
-                f"_Output_: {tool_output_preview}\n"
-            )
+def _tool_call_from_item(
+    item: Any,
+) -> tuple[dict[str, Any], str]:
+    """Describe one function/custom tool-call output item."""
+
+    arguments = getattr(item, "arguments", None)
 
+    if arguments is None:
+        arguments = getattr(item, "input", None)
+
+    if isinstance(arguments, (dict, list)):
+        arguments = json.dumps(arguments, ensure_ascii=False)
+
+    tool_call = {
+        "call_id": getattr(item, "call_id", None),
+        "name": getattr(item, "name", None),
+        "kind": getattr(item, "type", None),
+    }
 
-def _extract_tool_from_final(
+    return tool_call, str(arguments or "").strip()
+
+
+def _extract_tools_from_final(
     final: Any,
-) -> tuple[dict[str, Any] | None, str]:
+) -> list[tuple[dict[str, Any], str]]:
     """
-    Scan a completed response for a local function/custom tool call.
+    Scan a completed response for local function/custom tool calls.
 
     Returns:
-        A tuple containing the tool-call information and raw arguments.
+        A list of (tool-call information, raw arguments) pairs in the order
+        the model emitted them.
     """
 
+    tool_calls: list[tuple[dict[str, Any], str]] = []
+
     try:
         output_items = getattr(final, "output", None) or []
 
         for item in output_items:
-            item_type = getattr(item, "type", None)
+            if getattr(item, "type", None) in TOOL_CALL_TYPES:
+                tool_calls.append(_tool_call_from_item(item))
+
+    except Exception:
+        pass
+
+    return tool_calls
+
+
+def _resolve_tool_call(
+    tool_call: dict[str, Any],
+    raw_args: str,
+) -> tuple[ToolSpec | None, Any, str | None]:
+    """
+    Look up a tool and decode its arguments.
+
+    Returns:
+        (spec, call arguments, error payload). When the error payload is set
+        the call must not run and the payload goes straight to the model.
+    """
+
+    tool_name = tool_call.get("name") or "<unknown>"
+    call_kind = tool_call.get("kind") or "function_call"
+
+    try:
+        spec = get_tool(tool_name)
+    except Exception as error:
+        # A lazily registered tool whose module failed to import.
+        return None, None, json.dumps(
+            {
+                "error": f"Tool could not be loaded: {error}",
+                "tool": tool_name,
+            }
+        )
+
+    if not spec:
+        return None, None, json.dumps(
+            {
+                "error": f"Tool not registered: {tool_name}",
+                "tool": tool_name,
+            }
+        )
+
+    if call_kind != "function_call":
+        # custom_tool_call runners receive the raw payload string.
+        return spec, raw_args, None
+
+    try:
+        args = json.loads(raw_args or "{}")
+    except Exception as error:
+        return spec, None, json.dumps(
+            {
+                "error": f"Arguments could not be parsed: {error}",
+                "tool": tool_name,
+                "raw": (raw_args or "")[:500],
+            }
+        )
+
+    return spec, args or {}, None
+
+
+def _invoke_runner(
+    spec: ToolSpec,
+    call_kind: str,
+    args: Any,
+) -> Any:
+    """Call a runner with kwargs, falling back to a single positional dict."""
+
+    if call_kind != "function_call":
+        return spec.runner(args)
+
+    try:
+        return spec.runner(**args)
+    except TypeError:
+        return spec.runner(args)
+
+
+def _runner_error(
+    spec: ToolSpec,
+    call_kind: str,
+    args: Any,
+    error: Exception,
+) -> dict[str, Any]:
+    result: dict[str, Any] = {
+        "error": str(error),
+        "tool": spec.name,
+    }
+
+    if call_kind == "function_call":
+        result["args_seen"] = args
+
+    return result
+
+
+def _format_tool_result(result: Any) -> str:
+    """Serialize a runner's return value for function_call_output."""
+
+    if isinstance(result, (dict, list)):
+        return json.dumps(result, ensure_ascii=False)
+
+    return _ensure_json_payload(str(result))
+
+
+def _cached_tool_output(spec: ToolSpec, args: Any) -> str | None:
+    """Serve a fresh cached result for tools that declare a CachePolicy."""
+
+    if not TOOL_CACHE_ENABLED or spec.cache is None:
+        return None
+
+    # A spilled output is only worth serving while its file is still there.
+    return tool_cache.get(spec, args, valid=spill_available)
+
+
+def _finish_tool_run(
+    spec: ToolSpec,
+    args: Any,
+    result: Any,
+    failed: bool,
+) -> str:
+    """Format a runner result, enforce its output budget, update the cache."""
+
+    output = apply_budget(spec, _format_tool_result(result))
+
+    if spec.invalidates is not None:
+        try:
+            tool_cache.invalidate(spec.invalidates(args))
+        except Exception:
+            # A call we cannot reason about may have touched anything.
+            tool_cache.clear()
+
+    if TOOL_CACHE_ENABLED and spec.cache is not None and not failed:
+        tool_cache.put(spec, args, result, output)
+
+    return output
+
+
+def _new_tool_run(tool_call: dict[str, Any], raw_args: str) -> ToolRun:
+    return ToolRun(
+        name=tool_call.get("name") or "<unknown>",
+        call_id=tool_call.get("call_id"),
+        args_bytes=len((raw_args or "").encode("utf-8")),
+        output="",
+    )
+
+
+def _trace_tool_run(span: Any, run: ToolRun) -> None:
+    if not span.recording:
+        return
+
+    span.set(output_bytes=len(run.output.encode("utf-8")), cached=run.cached)
+
+
+def _execute_tool(
+    tool_call: dict[str, Any],
+    raw_args: str,
+) -> ToolRun:
+    """Execute a registered local Neuro tool and time it."""
+
+    started = time.perf_counter()
+    run = _new_tool_run(tool_call, raw_args)
+
+    with trace_span("tool", tool=run.name, args_bytes=run.args_bytes) as span:
+        run.output, run.cached = _execute_tool_output(tool_call, raw_args)
+        _trace_tool_run(span, run)
+
+    run.duration_s = time.perf_counter() - started
+    return run
+
+
+def _run_registered_tool(
+    tool_call: dict[str, Any],
+    raw_args: str,
+) -> str:
+    """Execute a registered local Neuro tool."""
+
+    return _execute_tool(tool_call, raw_args).output
+
+
+def _execute_tool_output(
+    tool_call: dict[str, Any],
+    raw_args: str,
+) -> tuple[str, bool]:
+    """Return (output, served from cache) for one tool call."""
+
+    spec, args, error_payload = _resolve_tool_call(tool_call, raw_args)
+
+    if error_payload is not None:
+        return error_payload, False
+
+    cached = _cached_tool_output(spec, args)
+
+    if cached is not None:
+        return cached, True
+
+    call_kind = tool_call.get("kind") or "function_call"
+    failed = False
+
+    try:
+        result = _invoke_runner(spec, call_kind, args)
+
+        # Coroutine runners are allowed; drive them to completion here.
+        if inspect.isawaitable(result):
+            result = asyncio.run(result)
+    except Exception as error:
+        result = _runner_error(spec, call_kind, args, error)
+        failed = True
+        trace_current().fail(error)
+
+    return _finish_tool_run(spec, args, result, failed), False
+
+
+async def _execute_tool_async(
+    tool_call: dict[str, Any],
+    raw_args: str,
+) -> ToolRun:
+    """
+    Execute a registered local Neuro tool from async code.
+
+    Coroutine runners are awaited on the running loop; blocking runners go to
+    the default executor so they never stall other turns.
+    """
+
+    started = time.perf_counter()
+    run = _new_tool_run(tool_call, raw_args)
+
+    with trace_span("tool", tool=run.name, args_bytes=run.args_bytes) as span:
+        run.output, run.cached = await _execute_tool_output_async(
+            tool_call,
+            raw_args,
+        )
+        _trace_tool_run(span, run)
+
+    run.duration_s = time.perf_counter() - started
+    return run
+
+
+async def _run_registered_tool_async(
+    tool_call: dict[str, Any],
+    raw_args: str,
+) -> str:
+    return (await _execute_tool_async(tool_call, raw_args)).output
+
+
+async def _execute_tool_output_async(
+    tool_call: dict[str, Any],
+    raw_args: str,
+) -> tuple[str, bool]:
+    spec, args, error_payload = _resolve_tool_call(tool_call, raw_args)
+
+    if error_payload is not None:
+        return error_payload, False
+
+    cached = _cached_tool_output(spec, args)
+
+    if cached is not None:
+        return cached, True
+
+    call_kind = tool_call.get("kind") or "function_call"
+    failed = False
+
+    try:
+        if inspect.iscoroutinefunction(spec.runner):
+            result = await _invoke_runner(spec, call_kind, args)
+        else:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                None,
+                trace_bind(_invoke_runner),
+                spec,
+                call_kind,
+                args,
+            )
+
+            if inspect.isawaitable(result):
+                result = await result
+    except Exception as error:
+        result = _runner_error(spec, call_kind, args, error)
+        failed = True
+        trace_current().fail(error)
+
+    return _finish_tool_run(spec, args, result, failed), False
+
+
+ToolCallList = list[tuple[dict[str, Any], str]]
+
+
+def _dispatch_key(tool_call: dict[str, Any], raw_args: str) -> tuple:
+    return (
+        tool_call.get("call_id"),
+        tool_call.get("name"),
+        raw_args,
+    )
+
+
+def _parsed_output(output: str) -> Any:
+    try:
+        return json.loads(output)
+    except Exception:
+        return output
+
+
+def _repeated_run(
+    run: ToolRun,
+    tool_call: dict[str, Any],
+    raw_args: str,
+) -> ToolRun:
+    """Answer an identical call from the earlier run in this turn."""
+
+    repeat = _new_tool_run(tool_call, raw_args)
+    repeat.output = json.dumps(
+        {
+            "repeated_call": True,
+            "note": (
+                "This exact call was already made in this turn; its result "
+                "is repeated here instead of running the tool again."
+            ),
+            "result": _parsed_output(run.output),
+        },
+        ensure_ascii=False,
+    )
+    repeat.cached = True
+    repeat.repeated = True
+    return repeat
+
+
+def _timed_out_run(
+    tool_call: dict[str, Any],
+    raw_args: str,
+    waited_s: float,
+) -> ToolRun:
+    run = _new_tool_run(tool_call, raw_args)
+    run.output = json.dumps(
+        {
+            "error": "tool deadline exceeded",
+            "tool": run.name,
+            "waited_s": round(waited_s, 3),
+        }
+    )
+    run.duration_s = waited_s
+    run.timed_out = True
+    return run
+
+
+def _skipped_run(
+    tool_call: dict[str, Any],
+    raw_args: str,
+    reason: str,
+) -> ToolRun:
+    run = _new_tool_run(tool_call, raw_args)
+    run.output = skipped_output(reason)
+    run.skipped = True
+    return run
+
+
+@dataclass
+class _PendingRun:
+    """A started tool call: its Future/Task, start time and repeat flag."""
+
+    handle: Any
+    started: float
+    repeated: bool = False
+    call_id: str | None = None  # set when a resent call adopts this run
 
-            if item_type not in ("function_call", "custom_tool_call"):
+    def claim(self, run: ToolRun) -> ToolRun:
+        """The run, answered under the adopting call's id if any."""
+
+        return replace(run, call_id=self.call_id) if self.call_id else run
+
+
+class _DispatcherBase(ABC):
+    """
+    Bookkeeping shared by the sync and async dispatchers.
+
+    Calls are keyed twice: by call id for joining, and by name plus
+    canonical args so an identical call later in the same turn reuses the
+    first run instead of executing the tool again.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[tuple, _PendingRun] = {}
+        self._memo: dict[tuple, _PendingRun] = {}
+        self._carried: dict[tuple, _PendingRun] = {}
+        self.repeats: dict[tuple, int] = {}
+
+    @property
+    def max_repeats(self) -> int:
+        return max(self.repeats.values(), default=0)
+
+    @abstractmethod
+    def _spawn(self, tool_call: dict[str, Any], raw_args: str) -> Any:
+        """Start running one call; returns the handle the subclass joins."""
+
+    def _pending_for(
+        self,
+        tool_call: dict[str, Any],
+        raw_args: str,
+    ) -> _PendingRun:
+        key = loop_key(tool_call, raw_args)
+        carried = self._carried.pop(key, None)
+
+        if carried is not None:
+            return replace(carried, call_id=tool_call.get("call_id"))
+
+        prior = self._memo.get(key)
+
+        if prior is not None:
+            self.repeats[key] = self.repeats.get(key, 0) + 1
+            return _PendingRun(prior.handle, prior.started, repeated=True)
+
+        pending = _PendingRun(
+            self._spawn(tool_call, raw_args),
+            time.perf_counter(),
+        )
+        self._memo[key] = pending
+        return pending
+
+    def start(self, tool_call: dict[str, Any], raw_args: str) -> None:
+        """Begin running a completed call before the stream has finished."""
+
+        key = _dispatch_key(tool_call, raw_args)
+
+        if key not in self._pending:
+            self._pending[key] = self._pending_for(tool_call, raw_args)
+
+    def rewind(self) -> None:
+        """
+        Forget a stream that is about to be resent.
+
+        Calls it already started keep running and are handed, as first runs,
+        to the same calls in the resent response, so a retry never executes
+        a tool twice.
+        """
+
+        started = {id(pending) for pending in self._pending.values()}
+
+        for key, pending in self._memo.items():
+            if id(pending) in started:
+                self._carried[key] = pending
+
+        self._pending.clear()
+
+    def _take(
+        self,
+        tool_call: dict[str, Any],
+        raw_args: str,
+    ) -> _PendingRun:
+        pending = self._pending.pop(_dispatch_key(tool_call, raw_args), None)
+
+        if pending is None:
+            pending = self._pending_for(tool_call, raw_args)
+
+        return pending
+
+    def skip(self, tool_calls: ToolCallList, reason: str) -> list[ToolRun]:
+        """
+        Close out a batch without starting anything new.
+
+        Calls that already finished while the response streamed keep their
+        real output; everything else is cancelled and reported as skipped.
+        """
+
+        runs = []
+
+        for tool_call, raw_args in tool_calls:
+            pending = self._pending.pop(
+                _dispatch_key(tool_call, raw_args),
+                None,
+            )
+            handle = pending.handle if pending else None
+
+            if handle is not None and handle.done() and not handle.cancelled():
+                run = handle.result()
+                runs.append(
+                    _repeated_run(run, tool_call, raw_args)
+                    if pending.repeated
+                    else pending.claim(run)
+                )
                 continue
 
-            call_id = getattr(item, "call_id", None)
-            name = getattr(item, "name", None)
-            arguments = getattr(item, "arguments", None)
+            if handle is not None:
+                handle.cancel()
 
-            if arguments is None:
-                arguments = getattr(item, "input", None)
+            runs.append(_skipped_run(tool_call, raw_args, reason))
 
-            if isinstance(arguments, (dict, list)):
-                arguments = json.dumps(arguments, ensure_ascii=False)
+        return runs
+
+
+class _ToolDispatcher(_DispatcherBase):
+    """
+    Run a turn's tool calls on a bounded worker pool.
+
+    Calls can be started speculatively while the model is still streaming
+    (as soon as their output item completes) and are joined once the stream
+    ends, so tool time overlaps with the rest of the response.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_TOOL_WORKERS) -> None:
+        super().__init__()
+        self.max_workers = max(1, max_workers)
+        self._pool: ThreadPoolExecutor | None = None
+
+    def _spawn(self, tool_call: dict[str, Any], raw_args: str) -> Future:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="neuro-tool",
+            )
+
+        # Early calls start mid-stream; their spans belong to that stream.
+        return self._pool.submit(trace_bind(_execute_tool), tool_call, raw_args)
+
+    def _join(
+        self,
+        pending: _PendingRun,
+        tool_call: dict[str, Any],
+        raw_args: str,
+        guard: BudgetGuard | None,
+    ) -> ToolRun:
+        timeout = guard.tool_timeout(pending.started) if guard else None
+
+        try:
+            run = pending.handle.result(timeout=timeout)
+        except (FutureTimeoutError, FutureCancelledError):
+            # The worker thread cannot be interrupted; its result is dropped.
+            pending.handle.cancel()
+            return _timed_out_run(
+                tool_call,
+                raw_args,
+                time.perf_counter() - pending.started,
+            )
+
+        if pending.repeated:
+            return _repeated_run(run, tool_call, raw_args)
+
+        return pending.claim(run)
+
+    def results(
+        self,
+        tool_calls: ToolCallList,
+        guard: BudgetGuard | None = None,
+    ) -> list[ToolRun]:
+        """Join (starting any stragglers) and return runs in call order."""
+
+        pending = [
+            self._take(tool_call, raw_args)
+            for tool_call, raw_args in tool_calls
+        ]
+
+        return [
+            self._join(item, tool_call, raw_args, guard)
+            for item, (tool_call, raw_args) in zip(pending, tool_calls)
+        ]
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+        self._pending.clear()
+        self._memo.clear()
+        self._carried.clear()
+
+
+class _AsyncToolDispatcher(_DispatcherBase):
+    """Async twin of _ToolDispatcher, bounded by a semaphore."""
+
+    def __init__(self, max_workers: int = DEFAULT_TOOL_WORKERS) -> None:
+        super().__init__()
+        self._limit = asyncio.Semaphore(max(1, max_workers))
+
+    async def _run(self, tool_call: dict[str, Any], raw_args: str) -> ToolRun:
+        async with self._limit:
+            return await _execute_tool_async(tool_call, raw_args)
+
+    def _spawn(self, tool_call: dict[str, Any], raw_args: str) -> asyncio.Task:
+        return asyncio.ensure_future(self._run(tool_call, raw_args))
+
+    async def _join(
+        self,
+        pending: _PendingRun,
+        tool_call: dict[str, Any],
+        raw_args: str,
+        guard: BudgetGuard | None,
+    ) -> ToolRun:
+        timeout = guard.tool_timeout(pending.started) if guard else None
+        task = pending.handle
+
+        if not task.cancelled():
+            try:
+                # Shielded so a repeat of this call can still await it.
+                run = await asyncio.wait_for(asyncio.shield(task), timeout)
+            except asyncio.TimeoutError:
+                task.cancel()
+            else:
+                if pending.repeated:
+                    return _repeated_run(run, tool_call, raw_args)
+
+                return pending.claim(run)
+
+        return _timed_out_run(
+            tool_call,
+            raw_args,
+            time.perf_counter() - pending.started,
+        )
+
+    async def results(
+        self,
+        tool_calls: ToolCallList,
+        guard: BudgetGuard | None = None,
+    ) -> list[ToolRun]:
+        pending = [
+            self._take(tool_call, raw_args)
+            for tool_call, raw_args in tool_calls
+        ]
+
+        return list(
+            await asyncio.gather(
+                *(
+                    self._join(item, tool_call, raw_args, guard)
+                    for item, (tool_call, raw_args) in zip(pending, tool_calls)
+                )
+            )
+        )
+
+    def close(self) -> None:
+        for pending in self._memo.values():
+            pending.handle.cancel()
+
+        self._pending.clear()
+        self._memo.clear()
+        self._carried.clear()
+
+
+class _StreamAccumulator:
+    """
+    Fold Responses API stream events into visible text and tool calls.
+
+    Shared by the sync and async streaming paths so both see identical
+    text suppression and argument assembly.
+    """
+
+    def __init__(
+        self,
+        on_tool_call: Callable[[dict[str, Any], str], None] | None = None,
+    ) -> None:
+        # Called with each tool call whose arguments are complete, while the
+        # rest of the response is still streaming.
+        self.on_tool_call = on_tool_call
+        self.text_buffer: list[str] = []
+        # Tool calls keyed by output item id so interleaved argument deltas
+        # from parallel calls land in the right buffer.
+        self.pending_calls: dict[str, dict[str, Any]] = {}
+        self.argument_buffers: dict[str, list[str]] = {}
+        self.suppress_text = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self.text_buffer)
+
+    def feed(self, event: Any) -> str | None:
+        """Consume one event; return a text delta to display, if any."""
+
+        event_type = event.type
+
+        if event_type == "response.output_text.delta":
+            if self.suppress_text:
+                return None
+
+            delta = event.delta or ""
+
+            # Prevent accidental internal tool narration from appearing.
+            if "to=functions." in delta:
+                self.suppress_text = True
+                return None
+
+            self.text_buffer.append(delta)
+            return delta
+
+        if event_type in (
+            "response.output_item.added",
+            "response.output_item.done",
+        ):
+            item = getattr(event, "item", None)
+
+            if not item or item.type not in TOOL_CALL_TYPES:
+                return None
+
+            self.suppress_text = True
+
+            item_key = (
+                getattr(item, "id", None)
+                or getattr(item, "call_id", None)
+                or str(len(self.pending_calls))
+            )
+            tool_call, arguments = _tool_call_from_item(item)
+            self.pending_calls[item_key] = tool_call
+
+            if arguments:
+                # A completed item carries the full argument string.
+                self.argument_buffers[item_key] = [arguments]
+            else:
+                self.argument_buffers.setdefault(item_key, [])
+
+            if (
+                event_type == "response.output_item.done"
+                and self.on_tool_call is not None
+                and tool_call.get("call_id")
+            ):
+                self.on_tool_call(tool_call, arguments)
+
+            return None
+
+        if event_type in TOOL_ARGUMENT_DELTA_TYPES:
+            self.suppress_text = True
+            fragment = getattr(event, "delta", None)
+            item_key = getattr(event, "item_id", None)
+
+            if fragment and item_key in self.argument_buffers:
+                self.argument_buffers[item_key].append(fragment)
+
+        return None
+
+    def tool_calls(
+        self,
+        final: Any,
+    ) -> ToolCallList:
+        """Return every local tool call, preferring the final response."""
+
+        streamed_calls = [
+            (
+                tool_call,
+                "".join(self.argument_buffers.get(item_key, [])).strip(),
+            )
+            for item_key, tool_call in self.pending_calls.items()
+        ]
+
+        # The final response is authoritative; fall back to it for anything
+        # the event stream did not fully deliver.
+        final_calls = _extract_tools_from_final(final)
+        final_args = {
+            tool_call.get("call_id"): raw_args
+            for tool_call, raw_args in final_calls
+        }
+
+        if final_calls and len(final_calls) >= len(streamed_calls):
+            return final_calls
+
+        return [
+            (
+                tool_call,
+                raw_args or final_args.get(tool_call.get("call_id"), ""),
+            )
+            for tool_call, raw_args in streamed_calls
+        ]
+
+
+def _request_options(
+    *,
+    model: str,
+    input_payload: Any,
+    previous_response_id: str | None,
+    parallel_tool_calls: bool,
+    tool_choice: str = "auto",
+    tools: list[dict[str, Any]] | None = None,
+    instructions: str | None = None,
+    prompt_cache_key: str | None = None,
+) -> dict[str, Any]:
+    """
+    Build one Responses API request.
+
+    The cacheable prefix (instructions, then tools) comes first and is
+    byte-stable for a given mode and tool selection; instructions are sent
+    on every round trip because previous_response_id does not carry them.
+    """
+
+    options: dict[str, Any] = {"model": model}
+
+    if instructions:
+        options["instructions"] = instructions
+
+    if tools is None:
+        tools = runtime_tools()
+
+    # Tool-free requests (router mode "none") omit the tool settings.
+    if tools:
+        options.update(
+            tools=tools,
+            tool_choice=tool_choice,
+            parallel_tool_calls=parallel_tool_calls,
+        )
+
+    if prompt_cache_key:
+        options["prompt_cache_key"] = prompt_cache_key
+
+    options.update(
+        previous_response_id=previous_response_id,
+        input=input_payload,
+    )
+
+    return options
+
+
+def _retry_stalled(
+    stall: StreamStalled,
+    *,
+    attempt: int,
+    policy: StallPolicy,
+    dispatcher: _ToolDispatcher | _AsyncToolDispatcher | None,
+    metrics: TurnMetrics | None,
+    partial_output: bool,
+) -> bool:
+    """Prepare to resend a stalled request; False when out of retries."""
+
+    if attempt >= policy.retries:
+        return False
+
+    if dispatcher:
+        dispatcher.rewind()
+
+    if metrics:
+        metrics.stalls += 1
+
+    if partial_output:
+        # The resent answer starts over on a fresh line.
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
+    console.print(f"[yellow]Response stream stalled ({stall}). Retrying.[/yellow]")
+    return True
+
+
+def _note_hedge(
+    watched: WatchedStream | WatchedAsyncStream,
+    metrics: TurnMetrics | None,
+) -> None:
+    if metrics and watched.hedged:
+        metrics.hedges += 1
+        metrics.hedge_wins += int(watched.hedge_won)
+
+
+def _stream_attributes(request_options: dict[str, Any]) -> dict[str, Any]:
+    if not trace_enabled():
+        return {}
+
+    payload = request_options["input"]
+
+    return {
+        "model": request_options["model"],
+        "input_bytes": len(json.dumps(payload, ensure_ascii=False).encode("utf-8")),
+        "input_items": 1 if isinstance(payload, str) else len(payload),
+        "continued": bool(request_options.get("previous_response_id")),
+        "tools": len(request_options.get("tools") or []),
+    }
+
+
+def _trace_stream(
+    span: Any,
+    final: Any,
+    accumulator: _StreamAccumulator,
+    events: int,
+    attempt: int,
+    watched: WatchedStream | WatchedAsyncStream,
+) -> None:
+    if not span.recording:
+        return
+
+    usage = getattr(final, "usage", None)
+    span.set(
+        response_id=getattr(final, "id", None),
+        events=events,
+        text_chars=len(accumulator.text),
+        tool_calls=len(accumulator.tool_calls(final)),
+        input_tokens=getattr(usage, "input_tokens", None),
+        output_tokens=getattr(usage, "output_tokens", None),
+        stalls=attempt,
+        hedged=watched.hedged,
+    )
+
+
+def _stream_response(
+    *,
+    client: OpenAI,
+    model: str,
+    input_payload: Any,
+    previous_response_id: str | None,
+    instructions: str | None,
+    emit_output: bool,
+    stream_callback: Callable[[str], None] | None = None,
+    parallel_tool_calls: bool = True,
+    dispatcher: _ToolDispatcher | _AsyncToolDispatcher | None = None,
+    metrics: TurnMetrics | None = None,
+    tool_choice: str = "auto",
+    tools: list[dict[str, Any]] | None = None,
+    prompt_cache_key: str | None = None,
+    stall_policy: StallPolicy | None = None,
+) -> tuple[str, str | None, ToolCallList, Any]:
+    """
+    Stream one Responses API request.
+
+    The input may be normal user text or a list of function_call_output
+    items. Every local tool call the model emits is returned, in order.
+    With a dispatcher, each call starts running as soon as its item is
+    complete instead of waiting for the stream to end.
+
+    The stream is watched by a StallPolicy: a late first output may be
+    hedged with a second copy of the request, and a stalled stream is
+    resent without re-running tools it already started.
+    """
+
+    request_options = _request_options(
+        model=model,
+        input_payload=input_payload,
+        previous_response_id=previous_response_id,
+        parallel_tool_calls=parallel_tool_calls,
+        tool_choice=tool_choice,
+        tools=tools,
+        instructions=instructions,
+        prompt_cache_key=prompt_cache_key,
+    )
+    policy = stall_policy or StallPolicy.from_env()
+
+    # Only a turn that writes its own deltas needs prompt_toolkit's stdout
+    # proxy. patch_stdout swaps the process-wide sys.stdout, so concurrent
+    # silent turns (batch, map-reduce, daemon threads) must leave it alone.
+    stdout_context = (
+        patch_stdout(raw=True)
+        if emit_output and stream_callback is None
+        else nullcontext()
+    )
+
+    started = time.perf_counter()
+
+    with stdout_context, trace_span("stream", **_stream_attributes(request_options)) as span:
+        attempt = 0
+        events = 0
+
+        while True:
+            accumulator = _StreamAccumulator(
+                on_tool_call=dispatcher.start if dispatcher else None,
+            )
+            watched = WatchedStream(
+                lambda: client.responses.stream(**request_options),
+                policy,
+            )
+
+            try:
+                for event in watched:
+                    events += 1
 
-            tool_call = {
-                "call_id": call_id,
-                "name": name,
-                "kind": item_type,
-            }
+                    if metrics:
+                        metrics.mark_event()
 
-            return tool_call, str(arguments or "").strip()
+                    delta = accumulator.feed(event)
 
-    except Exception:
-        pass
+                    if delta is None:
+                        continue
 
-    return None, ""
+                    if metrics:
+                        metrics.mark_text()
 
+                    if stream_callback:
+                        stream_callback(accumulator.text)
+                    elif emit_output:
+                        sys.stdout.write(delta)
+                        sys.stdout.flush()
 
-def _run_registered_tool(
-    tool_call: dict[str, Any],
-    raw_args: str,
-) -> str:
-    """Execute a registered local Neuro tool."""
+            except StreamStalled as stall:
+                if not _retry_stalled(
+                    stall,
+                    attempt=attempt,
+                    policy=policy,
+                    dispatcher=dispatcher,
+                    metrics=metrics,
+                    partial_output=bool(
+                        emit_output and not stream_callback and accumulator.text
+                    ),
+                ):
+                    raise
 
-    tool_name = tool_call.get("name") or "<unknown>"
-    call_kind = tool_call.get("kind") or "function_call"
+                attempt += 1
+                continue
 
-    spec = get_tool(tool_name)
+            final = watched.final
+            break
 
-    if not spec:
-        return json.dumps(
-            {
-                "error": f"Tool not registered: {tool_name}",
-                "tool": tool_name,
-            }
-        )
+        _trace_stream(span, final, accumulator, events, attempt, watched)
 
-    if call_kind == "function_call":
-        try:
-            args = json.loads(raw_args or "{}")
-        except Exception as error:
-            return json.dumps(
-                {
-                    "error": f"Arguments could not be parsed: {error}",
-                    "tool": tool_name,
-                    "raw": (raw_args or "")[:500],
-                }
-            )
+    if metrics:
+        metrics.add_stream(time.perf_counter() - started, final)
 
-        try:
-            try:
-                result = spec.runner(**(args or {}))
-            except TypeError:
-                result = spec.runner(args or {})
-        except Exception as error:
-            result = {
-                "error": str(error),
-                "tool": tool_name,
-                "args_seen": args,
-            }
+    _note_hedge(watched, metrics)
 
-    else:
-        # custom_tool_call
-        try:
-            result = spec.runner(raw_args)
-        except Exception as error:
-            result = {
-                "error": str(error),
-                "tool": tool_name,
-            }
+    response_text = accumulator.text
+    response_id = getattr(final, "id", None)
 
-    if isinstance(result, (dict, list)):
-        return json.dumps(result, ensure_ascii=False)
+    if emit_output and response_text and not response_text.endswith("\n"):
+        sys.stdout.write("\n")
+        sys.stdout.flush()
 
-    return _ensure_json_payload(str(result))
+    return response_text, response_id, accumulator.tool_calls(final), final
 
 
-def _stream_response(
+async def _stream_response_async(
     *,
-    client: OpenAI,
+    client: AsyncOpenAI,
     model: str,
     input_payload: Any,
     previous_response_id: str | None,
     instructions: str | None,
     emit_output: bool,
-    stream_callback: Callable[[str], None] | None = None,
-) -> tuple[str, str | None, dict[str, Any] | None, str, Any]:
-    """
-    Stream one Responses API request.
+    stream_callback: AsyncStreamCallback | None = None,
+    parallel_tool_calls: bool = True,
+    dispatcher: _ToolDispatcher | _AsyncToolDispatcher | None = None,
+    metrics: TurnMetrics | None = None,
+    tool_choice: str = "auto",
+    tools: list[dict[str, Any]] | None = None,
+    prompt_cache_key: str | None = None,
+    stall_policy: StallPolicy | None = None,
+) -> tuple[str, str | None, ToolCallList, Any]:
+    """Async twin of _stream_response built on AsyncOpenAI."""
+
+    request_options = _request_options(
+        model=model,
+        input_payload=input_payload,
+        previous_response_id=previous_response_id,
+        parallel_tool_calls=parallel_tool_calls,
+        tool_choice=tool_choice,
+        tools=tools,
+        instructions=instructions,
+        prompt_cache_key=prompt_cache_key,
+    )
+    policy = stall_policy or StallPolicy.from_env()
 
-    The input may be normal user text or a function_call_output payload.
-    """
+    started = time.perf_counter()
 
-    text_buffer: list[str] = []
-    argument_buffer: list[str] = []
-    tool_call: dict[str, Any] | None = None
-    suppress_text = False
-
-    request_options: dict[str, Any] = {
-        "model": model,
-        "input": input_payload,
-        "tools": runtime_tools(),
-        "tool_choice": "auto",
-        "parallel_tool_calls": False,
-        "previous_response_id": previous_response_id,
-    }
+    with trace_span("stream", **_stream_attributes(request_options)) as span:
+        attempt = 0
+        events = 0
 
-    stdout_context = (
-        nullcontext()
-        if stream_callback is not None
-        else patch_stdout(raw=True)
-    )
+        while True:
+            accumulator = _StreamAccumulator(
+                on_tool_call=dispatcher.start if dispatcher else None,
+            )
+            watched = WatchedAsyncStream(
+                lambda: client.responses.stream(**request_options),
+                policy,
+            )
 
-    with stdout_context:
-        with client.responses.stream(**request_options) as stream:
-            for event in stream:
-                event_type = event.type
+            try:
+                async for event in watched:
+                    events += 1
 
-                if event_type == "response.output_text.delta":
-                    if suppress_text:
-                        continue
+                    if metrics:
+                        metrics.mark_event()
 
-                    delta = event.delta or ""
+                    delta = accumulator.feed(event)
 
-                    # Prevent accidental internal tool narration from appearing.
-                    if "to=functions." in delta:
-                        suppress_text = True
+                    if delta is None:
                         continue
 
-                    text_buffer.append(delta)
+                    if metrics:
+                        metrics.mark_text()
 
                     if stream_callback:
-                        stream_callback("".join(text_buffer))
+                        outcome = stream_callback(accumulator.text)
+
+                        if inspect.isawaitable(outcome):
+                            await outcome
                     elif emit_output:
                         sys.stdout.write(delta)
                         sys.stdout.flush()
 
-                elif event_type in (
-                    "response.output_item.added",
-                    "response.output_item.done",
+            except StreamStalled as stall:
+                if not _retry_stalled(
+                    stall,
+                    attempt=attempt,
+                    policy=policy,
+                    dispatcher=dispatcher,
+                    metrics=metrics,
+                    partial_output=bool(
+                        emit_output and not stream_callback and accumulator.text
+                    ),
                 ):
-                    item = getattr(event, "item", None)
-
-                    if (
-                        item
-                        and item.type in ("function_call", "custom_tool_call")
-                        and tool_call is None
-                    ):
-                        tool_call = {
-                            "call_id": getattr(item, "call_id", None),
-                            "name": getattr(item, "name", None),
-                            "kind": item.type,
-                        }
-
-                        suppress_text = True
-
-                        initial_arguments = getattr(item, "arguments", None)
-
-                        if initial_arguments is None:
-                            initial_arguments = getattr(item, "input", None)
-
-                        if initial_arguments is not None:
-                            if isinstance(initial_arguments, (dict, list)):
-                                argument_buffer.append(
-                                    json.dumps(
-                                        initial_arguments,
-                                        ensure_ascii=False,
-                                    )
-                                )
-                            else:
-                                argument_buffer.append(
-                                    str(initial_arguments)
-                                )
+                    raise
 
-                elif event_type in (
-                    "response.function_call.arguments.delta",
-                    "response.function_call.delta",
-                    "response.tool_call.delta",
-                ):
-                    suppress_text = True
-                    fragment = getattr(event, "delta", None)
+                attempt += 1
+                continue
+
+            final = watched.final
+            break
+
+        _trace_stream(span, final, accumulator, events, attempt, watched)
 
-                    if fragment:
-                        argument_buffer.append(fragment)
+    if metrics:
+        metrics.add_stream(time.perf_counter() - started, final)
 
-            final = stream.get_final_response()
+    _note_hedge(watched, metrics)
 
-    response_text = "".join(text_buffer)
+    response_text = accumulator.text
     response_id = getattr(final, "id", None)
 
     if emit_output and response_text and not response_text.endswith("\n"):
         sys.stdout.write("\n")
         sys.stdout.flush()
 
-    raw_args = "".join(argument_buffer).strip()
+    return response_text, response_id, accumulator.tool_calls(final), final
+
+
+def _tool_summary(run: ToolRun) -> dict[str, Any]:
+    """One finished tool run, as logged and as reported to tool_callback."""
+
+    return {
+        "name": run.name,
+        "call_id": run.call_id,
+        "args_bytes": run.args_bytes,
+        "output_bytes": len(run.output.encode("utf-8")),
+        "duration_ms": round(run.duration_s * 1000, 1),
+        "cached": run.cached,
+        "repeated": run.repeated,
+        "timed_out": run.timed_out,
+        "skipped": run.skipped,
+    }
+
+
+class _TurnTracker:
+    """Bookkeeping for one turn: round trips, tool runs and timing."""
+
+    def __init__(
+        self,
+        *,
+        model: str,
+        previous_response_id: str | None,
+        selection: ToolSelection | None = None,
+        route: dict[str, Any] | None = None,
+        tool_callback: Callable[[dict[str, Any]], None] | None = None,
+    ) -> None:
+        self.model = model
+        self.selection = selection
+        self.route = route
+        self.tool_callback = tool_callback
+        self.previous_response_id = previous_response_id
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.response_ids: list[str | None] = []
+        self.tool_runs: list[ToolRun] = []
+        self.metrics = TurnMetrics(started=self.started)
+        self.budget_exhausted: str | None = None
+        self._pending: tuple[str | None, str, str] | None = None
+
+    @property
+    def tools_used(self) -> list[str]:
+        return [run.name for run in self.tool_runs]
+
+    @property
+    def tool_groups(self) -> frozenset[str]:
+        """Groups worth keeping offered next turn: mentioned or used now."""
+
+        if self.selection is None:
+            return frozenset()
+
+        return self.selection.matched | tool_router.groups_for(self.tools_used)
+
+    def add_response(self, response_id: str | None) -> None:
+        self.response_ids.append(response_id)
+
+    def output_payload(
+        self,
+        tool_runs: list[ToolRun],
+    ) -> list[dict[str, Any]]:
+        """Record one batch of tool runs and build the follow-up input."""
+
+        self.tool_runs.extend(tool_runs)
+        self.metrics.tool_durations.extend(
+            (run.name, run.duration_s) for run in tool_runs
+        )
+
+        if self.tool_callback:
+            for run in tool_runs:
+                self.tool_callback(_tool_summary(run))
+
+        return [
+            {
+                "type": "function_call_output",
+                "call_id": run.call_id,
+                "output": run.output,
+            }
+            for run in tool_runs
+        ]
+
+    def final_payload(
+        self,
+        tool_runs: list[ToolRun],
+        reason: str,
+    ) -> list[dict[str, Any]]:
+        """Follow-up input that closes the chain and asks for an answer."""
+
+        self.budget_exhausted = reason
+        return [*self.output_payload(tool_runs), final_answer_message(reason)]
+
+    def record(self, user: str, text: str) -> dict[str, Any]:
+        """Structured history entry for this turn."""
+
+        return {
+            "ts": datetime.fromtimestamp(
+                self.started_at,
+                tz=timezone.utc,
+            ).isoformat(timespec="milliseconds"),
+            "model": self.model,
+            "route": self.route,
+            "previous_response_id": self.previous_response_id,
+            "response_id": self.response_ids[-1] if self.response_ids else None,
+            "response_ids": self.response_ids,
+            "round_trips": len(self.response_ids),
+            "duration_ms": round(self.metrics.total_s * 1000, 1),
+            "metrics": self.metrics.as_dict(),
+            "budget_exhausted": self.budget_exhausted,
+            "tool_payload": (
+                self.selection.as_dict(len(self.response_ids))
+                if self.selection
+                else None
+            ),
+            "user": user,
+            "text": text,
+            "tool_calls": [
+                {**_tool_summary(run), "output_preview": run.output[:500]}
+                for run in self.tool_runs
+            ],
+        }
+
+    def finish(
+        self,
+        log_file: str | None,
+        user: str,
+        text: str,
+        *,
+        defer: bool = False,
+    ) -> None:
+        """
+        Close the turn's clock, feed session stats and queue the log.
+        Internal turns (e.g. map-reduce chunks) pass log_file=None; with
+        defer, stats and log wait for commit() and are dropped without it.
+        """
+
+        self.metrics.finish()
+        self._pending = (log_file, user, text)
+
+        if not defer:
+            self.commit()
+
+    def commit(self) -> None:
+        if self._pending is None:
+            return
+
+        log_file, user, text = self._pending
+        self._pending = None
+        session_stats.record(self.model, self.metrics)
+
+        if log_file:
+            _append_log(log_file, self.record(user, text))
+
+    def result(self, text: str, response_id: str | None) -> TurnResult:
+        last = self.tool_runs[-1] if self.tool_runs else None
+
+        return TurnResult(
+            text=text,
+            response_id=response_id,
+            tool_used=last.name if last else None,
+            tool_input_len=last.args_bytes if last else 0,
+            tool_output_preview=last.output[:500] if last else "",
+            tools_used=self.tools_used,
+            metrics=self.metrics,
+            budget_exhausted=self.budget_exhausted,
+            tool_groups=self.tool_groups,
+            commit=self.commit,
+        )
+
+
+def _trace_turn(span: Any, tracker: _TurnTracker, text: str) -> None:
+    if not span.recording:
+        return
+
+    usage = tracker.metrics.usage
+    span.set(
+        response_id=tracker.response_ids[-1] if tracker.response_ids else None,
+        round_trips=len(tracker.response_ids),
+        tools_used=tracker.tools_used,
+        text_chars=len(text),
+        input_tokens=usage["input_tokens"],
+        cached_tokens=usage["cached_tokens"],
+        output_tokens=usage["output_tokens"],
+        budget_exhausted=tracker.budget_exhausted,
+    )
+
+
+def _is_stale_thread_error(
+    error: BadRequestError,
+    previous_response_id: str | None,
+) -> bool:
+    return bool(previous_response_id) and (
+        "No tool output found for function call" in str(error)
+    )
+
+
+def _warn_stale_thread() -> None:
+    console.print(
+        "[yellow]Previous conversation state was unavailable. "
+        "Retrying as a fresh turn.[/yellow]"
+    )
+
 
-    if tool_call and not raw_args:
-        _, final_args = _extract_tool_from_final(final)
+def _early_dispatcher(
+    enabled: bool,
+    dispatcher: _ToolDispatcher | _AsyncToolDispatcher,
+    guard: BudgetGuard,
+    round_trips: int,
+) -> _ToolDispatcher | _AsyncToolDispatcher | None:
+    """
+    Dispatcher for speculative starts during the next stream, if any.
+
+    Tool calls in a response that will exhaust the round-trip budget are
+    never executed, so they must not be started early either.
+    """
 
-        if final_args:
-            raw_args = final_args
+    if not enabled or guard.out_of_round_trips(round_trips + 1):
+        return None
 
-    if not tool_call:
-        final_tool_call, final_args = _extract_tool_from_final(final)
+    return dispatcher
 
-        if final_tool_call:
-            tool_call = final_tool_call
-            raw_args = raw_args or final_args
 
-    return response_text, response_id, tool_call, raw_args, final
+def _warn_budget(reason: str) -> None:
+    console.print(
+        f"[yellow]Tool budget exhausted: {reason}. "
+        "Asking for a final answer.[/yellow]"
+    )
 
 
 def run_turn(
@@ -311,11 +1498,22 @@ def run_turn(
     client: OpenAI,
     user: str,
     model: str = "gpt-5.6-sol",
-    log_file: str,
+    log_file: str | None,
     previous_response_id: str | None = None,
     instructions: str | None = None,
     emit_output: bool = True,
     stream_callback: Callable[[str], None] | None = None,
+    parallel_tool_calls: bool = True,
+    max_tool_workers: int = DEFAULT_TOOL_WORKERS,
+    early_tool_dispatch: bool = True,
+    budget: TurnBudget | None = None,
+    tool_mode: str = "chat",
+    tool_groups: Iterable[str] = (),
+    prompt_cache_key: str | None = None,
+    stall_policy: StallPolicy | None = None,
+    route: dict[str, Any] | None = None,
+    tool_callback: Callable[[dict[str, Any]], None] | None = None,
+    defer_log: bool = False,
 ) -> TurnResult:
     """
     Run one complete Neuro turn.
@@ -325,137 +1523,363 @@ def run_turn(
     - OpenAI streaming
     - Hosted tools such as web search
     - Registered local Neuro tools
-    - Multi-step tool chains
+    - Routing a relevant subset of tools for the prompt
+    - Routing the prompt to a fast or heavy model when model="auto"
+    - Multi-step tool chains, bounded by a TurnBudget
+    - Parallel tool calls from a single response
+    - Early dispatch of tool calls while the response is still streaming
+    - A stall watchdog that hedges slow first output and resends stalled
+      streams without re-running their tools
     - Response-ID continuation
-    - History logging
+    - History logging, held back until result.commit() with defer_log
+    - Reporting each finished tool run to tool_callback
     """
 
-    pathlib.Path(log_file).expanduser().parent.mkdir(
-        parents=True,
-        exist_ok=True,
-    )
-
-    try:
-        (
-            full_text,
-            response_id,
-            tool_call,
-            raw_args,
-            _,
-        ) = _stream_response(
+    if model == AUTO_MODEL:
+        return run_auto_turn(
+            run_turn,
             client=client,
-            model=model,
-            input_payload=user,
+            user=user,
+            log_file=log_file,
             previous_response_id=previous_response_id,
             instructions=instructions,
             emit_output=emit_output,
             stream_callback=stream_callback,
+            parallel_tool_calls=parallel_tool_calls,
+            max_tool_workers=max_tool_workers,
+            early_tool_dispatch=early_tool_dispatch,
+            budget=budget,
+            tool_mode=tool_mode,
+            tool_groups=tool_groups,
+            prompt_cache_key=prompt_cache_key,
+            stall_policy=stall_policy,
+            tool_callback=tool_callback,
+            defer_log=defer_log,
         )
 
-    except BadRequestError as error:
-        if (
-            previous_response_id
-            and "No tool output found for function call" in str(error)
-        ):
-            console.print(
-                "[yellow]Previous conversation state was unavailable. "
-                "Retrying as a fresh turn.[/yellow]"
-            )
+    if log_file:
+        # history_search reads the history this turn is written to.
+        set_active_log(log_file)
 
-            (
-                full_text,
-                response_id,
-                tool_call,
-                raw_args,
-                _,
-            ) = _stream_response(
-                client=client,
-                model=model,
-                input_payload=user,
-                previous_response_id=None,
-                instructions=instructions,
-                emit_output=emit_output,
-                stream_callback=stream_callback,
-            )
-        else:
-            raise
+    with trace_span("turn", model=model, mode=tool_mode) as span:
+        selection = tool_router.select(user, mode=tool_mode, sticky=tool_groups)
+        tracker = _TurnTracker(
+            model=model,
+            previous_response_id=previous_response_id,
+            selection=selection,
+            route=route,
+            tool_callback=tool_callback,
+        )
+        dispatcher = _ToolDispatcher(
+            max_workers=max_tool_workers if parallel_tool_calls else 1,
+        )
 
-    last_tool_name: str | None = None
-    last_tool_input_len = 0
-    last_tool_output_preview = ""
+        stream_options: dict[str, Any] = {
+            "client": client,
+            "model": model,
+            "instructions": (
+                instructions_for(tool_mode) if instructions is None else instructions
+            ),
+            "emit_output": emit_output,
+            "parallel_tool_calls": parallel_tool_calls,
+            "metrics": tracker.metrics,
+            # Routed once per turn; chained round trips reuse the same list.
+            "tools": selection.payload(),
+            "prompt_cache_key": prompt_cache_key or cache_key_for(tool_mode),
+            "stall_policy": stall_policy or StallPolicy.from_env(),
+        }
+        guard = BudgetGuard(budget or TurnBudget.from_env(), tracker.started)
+        first_dispatcher = _early_dispatcher(
+            early_tool_dispatch,
+            dispatcher,
+            guard,
+            0,
+        )
 
-    streamed_text = full_text
+        try:
+            try:
+                full_text, response_id, tool_calls, _ = _stream_response(
+                    **stream_options,
+                    input_payload=user,
+                    previous_response_id=previous_response_id,
+                    stream_callback=stream_callback,
+                    dispatcher=first_dispatcher,
+                )
 
-    while tool_call:
-        tool_name = tool_call.get("name") or "<unknown>"
-        last_tool_name = tool_name
+            except BadRequestError as error:
+                if not _is_stale_thread_error(error, previous_response_id):
+                    raise
 
-        tool_output = _run_registered_tool(
-            tool_call=tool_call,
-            raw_args=raw_args,
-        )
+                _warn_stale_thread()
 
-        last_tool_input_len = len(raw_args or "")
-        last_tool_output_preview = tool_output[:500]
+                full_text, response_id, tool_calls, _ = _stream_response(
+                    **stream_options,
+                    input_payload=user,
+                    previous_response_id=None,
+                    stream_callback=stream_callback,
+                    dispatcher=first_dispatcher,
+                )
 
-        tool_output_payload = [
-            {
-                "type": "function_call_output",
-                "call_id": tool_call.get("call_id"),
-                "output": tool_output,
-            }
-        ]
+            tracker.add_response(response_id)
+            streamed_text = full_text
 
-        def chained_stream_callback(text: str) -> None:
-            if stream_callback:
-                stream_callback(streamed_text + text)
+            while tool_calls:
+                exhausted = guard.exhausted(
+                    len(tracker.response_ids),
+                    dispatcher.max_repeats,
+                )
 
-        (
-            post_text,
-            response_id,
-            tool_call,
-            raw_args,
-            _,
-        ) = _stream_response(
+                if exhausted:
+                    if emit_output:
+                        _warn_budget(exhausted)
+
+                    tool_output_payload = tracker.final_payload(
+                        dispatcher.skip(tool_calls, exhausted),
+                        exhausted,
+                    )
+                else:
+                    tool_output_payload = tracker.output_payload(
+                        dispatcher.results(tool_calls, guard),
+                    )
+
+                def chained_stream_callback(text: str) -> None:
+                    if stream_callback:
+                        stream_callback(streamed_text + text)
+
+                post_text, response_id, tool_calls, _ = _stream_response(
+                    **stream_options,
+                    input_payload=tool_output_payload,
+                    previous_response_id=response_id,
+                    stream_callback=(
+                        chained_stream_callback if stream_callback else None
+                    ),
+                    tool_choice="none" if exhausted else "auto",
+                    dispatcher=_early_dispatcher(
+                        early_tool_dispatch and not exhausted,
+                        dispatcher,
+                        guard,
+                        len(tracker.response_ids),
+                    ),
+                )
+
+                tracker.add_response(response_id)
+                full_text += post_text
+                streamed_text = full_text
+
+                if exhausted:
+                    break
+
+        finally:
+            dispatcher.close()
+
+        tracker.finish(log_file, user, full_text, defer=defer_log)
+        _trace_turn(span, tracker, full_text)
+
+    return tracker.result(full_text, response_id)
+
+
+async def run_turn_async(
+    *,
+    client: AsyncOpenAI,
+    user: str,
+    model: str = "gpt-5.6-sol",
+    log_file: str | None,
+    previous_response_id: str | None = None,
+    instructions: str | None = None,
+    emit_output: bool = False,
+    stream_callback: AsyncStreamCallback | None = None,
+    parallel_tool_calls: bool = True,
+    max_tool_workers: int = DEFAULT_TOOL_WORKERS,
+    early_tool_dispatch: bool = True,
+    budget: TurnBudget | None = None,
+    tool_mode: str = "chat",
+    tool_groups: Iterable[str] = (),
+    prompt_cache_key: str | None = None,
+    stall_policy: StallPolicy | None = None,
+    route: dict[str, Any] | None = None,
+    tool_callback: Callable[[dict[str, Any]], None] | None = None,
+    defer_log: bool = False,
+) -> TurnResult:
+    """
+    Run one complete Neuro turn on an asyncio event loop.
+
+    Mirrors run_turn, but streams through AsyncOpenAI, awaits coroutine
+    tools directly, runs blocking tools on the default executor and writes
+    the history log off the loop. Many turns can share one process.
+    """
+
+    if model == AUTO_MODEL:
+        return await run_auto_turn_async(
+            run_turn_async,
             client=client,
-            model=model,
-            input_payload=tool_output_payload,
-            previous_response_id=response_id,
+            user=user,
+            log_file=log_file,
+            previous_response_id=previous_response_id,
             instructions=instructions,
             emit_output=emit_output,
-            stream_callback=chained_stream_callback,
+            stream_callback=stream_callback,
+            parallel_tool_calls=parallel_tool_calls,
+            max_tool_workers=max_tool_workers,
+            early_tool_dispatch=early_tool_dispatch,
+            budget=budget,
+            tool_mode=tool_mode,
+            tool_groups=tool_groups,
+            prompt_cache_key=prompt_cache_key,
+            stall_policy=stall_policy,
+            tool_callback=tool_callback,
+            defer_log=defer_log,
         )
 
-        full_text += post_text
-        streamed_text = full_text
+    if log_file:
+        # history_search reads the history this turn is written to.
+        set_active_log(log_file)
 
-    _append_log(
-        log_file=log_file,
-        user=user,
-        ai_text=full_text,
-        tool_used=last_tool_name,
-        tool_input_len=last_tool_input_len,
-        tool_output_preview=last_tool_output_preview,
-    )
+    with trace_span("turn", model=model, mode=tool_mode) as span:
+        selection = tool_router.select(user, mode=tool_mode, sticky=tool_groups)
+        tracker = _TurnTracker(
+            model=model,
+            previous_response_id=previous_response_id,
+            selection=selection,
+            route=route,
+            tool_callback=tool_callback,
+        )
+        dispatcher = _AsyncToolDispatcher(
+            max_workers=max_tool_workers if parallel_tool_calls else 1,
+        )
 
-    return TurnResult(
-        text=full_text,
-        response_id=response_id,
-        tool_used=last_tool_name,
-        tool_input_len=last_tool_input_len,
-        tool_output_preview=last_tool_output_preview,
-    )
+        stream_options: dict[str, Any] = {
+            "client": client,
+            "model": model,
+            "instructions": (
+                instructions_for(tool_mode) if instructions is None else instructions
+            ),
+            "emit_output": emit_output,
+            "parallel_tool_calls": parallel_tool_calls,
+            "metrics": tracker.metrics,
+            # Routed once per turn; chained round trips reuse the same list.
+            "tools": selection.payload(),
+            "prompt_cache_key": prompt_cache_key or cache_key_for(tool_mode),
+            "stall_policy": stall_policy or StallPolicy.from_env(),
+        }
+        guard = BudgetGuard(budget or TurnBudget.from_env(), tracker.started)
+        first_dispatcher = _early_dispatcher(
+            early_tool_dispatch,
+            dispatcher,
+            guard,
+            0,
+        )
+
+        try:
+            try:
+                (
+                    full_text,
+                    response_id,
+                    tool_calls,
+                    _,
+                ) = await _stream_response_async(
+                    **stream_options,
+                    input_payload=user,
+                    previous_response_id=previous_response_id,
+                    stream_callback=stream_callback,
+                    dispatcher=first_dispatcher,
+                )
+
+            except BadRequestError as error:
+                if not _is_stale_thread_error(error, previous_response_id):
+                    raise
+
+                _warn_stale_thread()
+
+                (
+                    full_text,
+                    response_id,
+                    tool_calls,
+                    _,
+                ) = await _stream_response_async(
+                    **stream_options,
+                    input_payload=user,
+                    previous_response_id=None,
+                    stream_callback=stream_callback,
+                    dispatcher=first_dispatcher,
+                )
+
+            tracker.add_response(response_id)
+            streamed_text = full_text
+
+            while tool_calls:
+                exhausted = guard.exhausted(
+                    len(tracker.response_ids),
+                    dispatcher.max_repeats,
+                )
+
+                if exhausted:
+                    if emit_output:
+                        _warn_budget(exhausted)
+
+                    tool_output_payload = tracker.final_payload(
+                        dispatcher.skip(tool_calls, exhausted),
+                        exhausted,
+                    )
+                else:
+                    tool_output_payload = tracker.output_payload(
+                        await dispatcher.results(tool_calls, guard),
+                    )
+
+                def chained_stream_callback(text: str) -> Any:
+                    return stream_callback(streamed_text + text)
+
+                (
+                    post_text,
+                    response_id,
+                    tool_calls,
+                    _,
+                ) = await _stream_response_async(
+                    **stream_options,
+                    input_payload=tool_output_payload,
+                    previous_response_id=response_id,
+                    stream_callback=(
+                        chained_stream_callback if stream_callback else None
+                    ),
+                    tool_choice="none" if exhausted else "auto",
+                    dispatcher=_early_dispatcher(
+                        early_tool_dispatch and not exhausted,
+                        dispatcher,
+                        guard,
+                        len(tracker.response_ids),
+                    ),
+                )
+
+                tracker.add_response(response_id)
+                full_text += post_text
+                streamed_text = full_text
+
+                if exhausted:
+                    break
+
+        finally:
+            dispatcher.close()
+
+        # Non-blocking: the record is handed to the background log writer.
+        tracker.finish(log_file, user, full_text, defer=defer_log)
+        _trace_turn(span, tracker, full_text)
+
+    return tracker.result(full_text, response_id)
 
 
 def run_once(
     *,
     client: OpenAI,
     prompt: str,
-    log_file: str,
+    log_file: str | None,
     model: str = "gpt-5.6-sol",
     instructions: str | None = None,
     emit_output: bool = True,
     stream_callback: Callable[[str], None] | None = None,
+    parallel_tool_calls: bool = True,
+    budget: TurnBudget | None = None,
+    tool_mode: str = "chat",
+    tool_groups: Iterable[str] = (),
+    prompt_cache_key: str | None = None,
 ) -> TurnResult:
     """
     Run one inline Neuro request.
@@ -473,8 +1897,119 @@ def run_once(
         instructions=instructions,
         emit_output=emit_output,
         stream_callback=stream_callback,
+        parallel_tool_calls=parallel_tool_calls,
+        budget=budget,
+        tool_mode=tool_mode,
+        tool_groups=tool_groups,
+        prompt_cache_key=prompt_cache_key,
+    )
+
+
+async def run_once_async(
+    *,
+    client: AsyncOpenAI,
+    prompt: str,
+    log_file: str | None,
+    model: str = "gpt-5.6-sol",
+    instructions: str | None = None,
+    emit_output: bool = False,
+    stream_callback: AsyncStreamCallback | None = None,
+    parallel_tool_calls: bool = True,
+    budget: TurnBudget | None = None,
+    tool_mode: str = "chat",
+    tool_groups: Iterable[str] = (),
+    prompt_cache_key: str | None = None,
+) -> TurnResult:
+    """Async twin of run_once for embedding Neuro in asyncio services."""
+
+    return await run_turn_async(
+        client=client,
+        user=prompt,
+        model=model,
+        log_file=log_file,
+        previous_response_id=None,
+        instructions=instructions,
+        emit_output=emit_output,
+        stream_callback=stream_callback,
+        parallel_tool_calls=parallel_tool_calls,
+        budget=budget,
+        tool_mode=tool_mode,
+        tool_groups=tool_groups,
+        prompt_cache_key=prompt_cache_key,
+    )
+
+
+def _show_job(job: Job, stream_context: Callable[[], Any]) -> None:
+    """Print a finished background job's buffered output."""
+
+    console.print(
+        f"[bold cyan][job {job.id}][/] {job.status} after {job.elapsed_s:.1f}s: "
+        f"[dim]{escape(job.prompt[:80])}[/]"
     )
 
+    if job.error is not None:
+        console.print(f"[bold red]ERROR:[/] {escape(str(job.error))}\n")
+        return
+
+    with stream_context() as stream_callback:
+        stream_callback(job.text)
+
+
+def _foreground_job(job: Job, stream_context: Callable[[], Any]) -> TurnResult | None:
+    """
+    Reattach to a job's stream until it finishes.
+
+    Ctrl-C detaches and leaves the job running. Returns the job's result
+    once it has been seen in full, else None.
+    """
+
+    job.shown = True
+    console.print(f"[bold cyan][job {job.id}][/] [dim]{escape(job.prompt[:80])}[/]")
+
+    try:
+        with stream_context() as stream_callback:
+            job.attach(stream_callback)
+
+            try:
+                job.wait()
+            finally:
+                job.detach()
+    except KeyboardInterrupt:
+        job.shown = False
+        print(f"\n[job {job.id}] detached; still running.\n")
+        return None
+
+    if job.error is not None:
+        console.print(f"[bold red]ERROR:[/] {escape(str(job.error))}\n")
+        return None
+
+    return job.result
+
+
+def _finish_running_jobs(jobs: JobManager, timeout_s: float = 10.0) -> None:
+    """
+    Give running jobs a moment to finish before the REPL exits.
+
+    Jobs run on daemon threads, so whatever is still running afterwards
+    dies with the process, unlogged. Ctrl-C stops waiting.
+    """
+
+    running = jobs.running()
+
+    if not running:
+        return
+
+    print(f"[info] Waiting up to {timeout_s:.0f}s for {len(running)} background job(s)... (Ctrl-C to skip)")
+
+    try:
+        running = jobs.wait_running(timeout_s)
+    except KeyboardInterrupt:
+        running = jobs.running()
+
+    if running:
+        print(f"[info] Abandoning {len(running)} unfinished background job(s).")
+
+
 def run_repl(
     *,
     client: OpenAI,
@@ -484,10 +2019,20 @@ def run_repl(
     banner_fn: Optional[Callable[[dict], None]] = None,
     command_handler: Optional[Callable[[str], dict]] = None,
     stream_context_factory: Optional[Callable[[], Any]] = None,
+    profile: bool = False,
 ) -> None:
-    """Run Neuro's interactive conversation interface."""
+    """
+    Run Neuro's interactive conversation interface.
+
+    With profile=True (or after `:profile on`) every turn runs under
+    cProfile and tracemalloc; reports go next to the history log.
+
+    A prompt ending in `&` (or `:bg <prompt>`) runs as a background job
+    that forks the current thread; its output is shown at the next prompt,
+    or live after `:fg <id>`, which also continues the conversation from it.
+    """
 
-    log_path = pathlib.Path(log_file).expanduser()
+    log_path = jsonl_path(log_file)
     log_path.parent.mkdir(parents=True, exist_ok=True)
     log_path.touch(exist_ok=True)
 
@@ -505,8 +2050,35 @@ def run_repl(
         except Exception:
             pass
 
+    sticky_groups: frozenset[str] = frozenset()
+    jobs = JobManager()
+    stream_context = stream_context_factory or plain_stream
+
+    def background(prompt: str) -> None:
+        # Bound now: the job keeps the thread it was started from.
+        options = {
+            "client": client,
+            "user": prompt,
+            "model": current_model,
+            "log_file": log_file,
+            "previous_response_id": last_response_id,
+            "emit_output": False,
+            "tool_groups": sticky_groups,
+        }
+        job = jobs.start(
+            prompt,
+            lambda callback: run_turn(**options, stream_callback=callback),
+        )
+        print(f"[job {job.id}] running in the background (:jobs, :fg {job.id})\n")
+
     while True:
         try:
+            for job in jobs.take_finished():
+                _show_job(job, stream_context)
+
+            # Re-open the API connection while the user is still typing.
+            prewarm(client)
+
             user = (input_fn or input)("> ").strip()
 
             if not user:
@@ -523,6 +2095,7 @@ def run_repl(
 
                 if action.get("handled"):
                     if action.get("quit"):
+                        _finish_running_jobs(jobs)
                         print("Goodbye! 🚀")
                         break
 
@@ -544,6 +2117,7 @@ def run_repl(
 
                     if action.get("reset_thread"):
                         last_response_id = None
+                        sticky_groups = frozenset()
                         print("[info] Thread context cleared.\n")
 
                     if action.get("set_model"):
@@ -552,41 +2126,85 @@ def run_repl(
                             f"[info] Model set -> {current_model}\n"
                         )
 
+                    if "profile" in action:
+                        profile = action["profile"]
+                        print(
+                            f"[info] Profiling {'on' if profile else 'off'}\n"
+                        )
+
+                    if action.get("background"):
+                        background(action["background"])
+
+                    if action.get("list_jobs"):
+                        console.print(jobs_table(jobs.jobs()))
+
+                    if "foreground" in action:
+                        job = jobs.get(action["foreground"])
+
+                        if job is None:
+                            print("[info] No such job.\n")
+                        else:
+                            result = _foreground_job(job, stream_context)
+
+                            if result is not None:
+                                last_response_id = result.response_id
+                                sticky_groups = result.tool_groups
+                                print(f"[info] Continuing from job {job.id}.\n")
+
                     continue
 
             if user.lower() in {"reset", "/reset", "/new"}:
                 last_response_id = None
+                sticky_groups = frozenset()
                 print("🧹 Started a fresh thread.")
                 continue
 
-            if stream_context_factory:
-                with stream_context_factory() as stream_callback:
+            prompt = parse_background(user)
+
+            if prompt:
+                background(prompt)
+                continue
+
+            profiler = profile_turn(log_file) if profile else nullcontext()
+
+            # Rendering is inside the profiled block; it is often the cost.
+            with profiler:
+                if stream_context_factory:
+                    with stream_context_factory() as stream_callback:
+                        result = run_turn(
+                            client=client,
+                            user=user,
+                            model=current_model,
+                            log_file=log_file,
+                            previous_response_id=last_response_id,
+                            emit_output=False,
+                            stream_callback=stream_callback,
+                            tool_groups=sticky_groups,
+                        )
+                else:
                     result = run_turn(
                         client=client,
                         user=user,
                         model=current_model,
-                        log_file=str(log_path),
+                        log_file=log_file,
                         previous_response_id=last_response_id,
-                        emit_output=False,
-                        stream_callback=stream_callback,
+                        emit_output=True,
+                        stream_callback=None,
+                        tool_groups=sticky_groups,
                     )
-            else:
-                result = run_turn(
-                    client=client,
-                    user=user,
-                    model=current_model,
-                    log_file=str(log_path),
-                    previous_response_id=last_response_id,
-                    emit_output=True,
-                    stream_callback=None,
-                )
+
+            if profile:
+                print_profile(profiler.profile)
 
             last_response_id = result.response_id
+            # Follow-ups ("and the bedroom one?") keep last turn's tools.
+            sticky_groups = result.tool_groups
 
         except KeyboardInterrupt:
             print("\n[ctrl-c] (use :quit to exit)\n")
 
         except EOFError:
+            _finish_running_jobs(jobs)
             print("\nGoodbye! 🚀")
             break
 
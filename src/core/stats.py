@@ -0,0 +1,201 @@
+# src/core/stats.py
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "total_tokens",
+    "cached_tokens",
+    "reasoning_tokens",
+)
+
+
+@dataclass
+class TurnMetrics:
+    """Latency and token figures for one turn (seconds, token counts)."""
+
+    # Turn start, before tool routing and the request: the latencies below
+    # are what the user waits, not just the API's share of it.
+    started: float = field(default_factory=time.perf_counter)
+    ttfb_s: float | None = None  # turn start -> first stream event
+    ttft_s: float | None = None  # turn start -> first visible text delta
+    stream_s: float = 0.0  # time spent inside model streams (all round trips)
+    total_s: float = 0.0
+    round_trips: int = 0
+    stalls: int = 0  # streams resent after the watchdog gave up on them
+    hedges: int = 0  # requests raced against a hedged copy
+    hedge_wins: int = 0  # ...where the copy answered first
+    tool_durations: list[tuple[str, float]] = field(default_factory=list)
+    usage: dict[str, int] = field(
+        default_factory=lambda: {name: 0 for name in USAGE_FIELDS}
+    )
+
+    def mark_event(self) -> None:
+        if self.ttfb_s is None:
+            self.ttfb_s = time.perf_counter() - self.started
+
+    def mark_text(self) -> None:
+        if self.ttft_s is None:
+            self.ttft_s = time.perf_counter() - self.started
+
+    def add_stream(self, seconds: float, final: Any) -> None:
+        self.round_trips += 1
+        self.stream_s += seconds
+        self.add_usage(getattr(final, "usage", None))
+
+    def add_usage(self, usage: Any) -> None:
+        if usage is None:
+            return
+
+        input_details = getattr(usage, "input_tokens_details", None)
+        output_details = getattr(usage, "output_tokens_details", None)
+
+        values = {
+            "input_tokens": getattr(usage, "input_tokens", 0),
+            "output_tokens": getattr(usage, "output_tokens", 0),
+            "total_tokens": getattr(usage, "total_tokens", 0),
+            "cached_tokens": getattr(input_details, "cached_tokens", 0),
+            "reasoning_tokens": getattr(output_details, "reasoning_tokens", 0),
+        }
+
+        for name, value in values.items():
+            self.usage[name] += int(value or 0)
+
+    @property
+    def tool_s(self) -> float:
+        return sum(duration for _, duration in self.tool_durations)
+
+    def finish(self) -> None:
+        self.total_s = time.perf_counter() - self.started
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data.pop("started")
+        data["tool_s"] = self.tool_s
+        data["tool_durations"] = [
+            {"name": name, "duration_s": round(duration, 4)}
+            for name, duration in self.tool_durations
+        ]
+
+        for key in ("ttfb_s", "ttft_s", "stream_s", "total_s", "tool_s"):
+            if data[key] is not None:
+                data[key] = round(data[key], 4)
+
+        return data
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile; None for an empty sample."""
+
+    if not values:
+        return None
+
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class SessionStats:
+    """
+    Rolling window of turn metrics for the current process.
+
+    Discarded attempts (a fast auto-routed answer redone on the heavy
+    model) are kept apart: they count toward their model's latency, not as
+    turns of the session.
+    """
+
+    def __init__(self, window: int = 200):
+        self._turns: deque[tuple[str, TurnMetrics, bool]] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, model: str, metrics: TurnMetrics, *, discarded: bool = False) -> None:
+        with self._lock:
+            self._turns.append((model, metrics, discarded))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._turns.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(1 for *_, discarded in self._turns if not discarded)
+
+    def models(self) -> list[str]:
+        """Models seen in the window, in first-use order."""
+
+        with self._lock:
+            return list(dict.fromkeys(model for model, *_ in self._turns))
+
+    def turns(self, model: str | None = None) -> list[TurnMetrics]:
+        """Session turns, or every request answered by `model`."""
+
+        with self._lock:
+            return [
+                metrics
+                for turn_model, metrics, discarded in self._turns
+                if (not discarded if model is None else turn_model == model)
+            ]
+
+    def discarded(self, model: str) -> int:
+        """Attempts by `model` that were thrown away and redone."""
+
+        with self._lock:
+            return sum(
+                1
+                for turn_model, _, discarded in self._turns
+                if discarded and turn_model == model
+            )
+
+    def summary(self, model: str | None = None) -> dict[str, dict[str, float | None]]:
+        """p50/p95 for each latency figure plus per-turn token averages."""
+
+        turns = self.turns(model)
+
+        series: dict[str, list[float]] = {
+            "ttfb_s": [t.ttfb_s for t in turns if t.ttfb_s is not None],
+            "ttft_s": [t.ttft_s for t in turns if t.ttft_s is not None],
+            "stream_s": [t.stream_s for t in turns],
+            "tool_s": [t.tool_s for t in turns],
+            "total_s": [t.total_s for t in turns],
+            "round_trips": [float(t.round_trips) for t in turns],
+            "tool_run_s": [d for t in turns for _, d in t.tool_durations],
+            "input_tokens": [float(t.usage["input_tokens"]) for t in turns],
+            "cached_tokens": [float(t.usage["cached_tokens"]) for t in turns],
+            # Share of input served from the prompt cache, and whether that
+            # shows up in time-to-first-token.
+            "cached_pct": [
+                100 * t.usage["cached_tokens"] / t.usage["input_tokens"]
+                for t in turns
+                if t.usage["input_tokens"]
+            ],
+            "ttft_cached_s": [
+                t.ttft_s
+                for t in turns
+                if t.ttft_s is not None and t.usage["cached_tokens"]
+            ],
+            "ttft_uncached_s": [
+                t.ttft_s
+                for t in turns
+                if t.ttft_s is not None and not t.usage["cached_tokens"]
+            ],
+            "output_tokens": [float(t.usage["output_tokens"]) for t in turns],
+        }
+
+        return {
+            name: {
+                "n": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+            }
+            for name, values in series.items()
+        }
+
+
+session_stats = SessionStats()
@@ -0,0 +1,290 @@
+# src/core/tracing.py
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+# Spans nest through a context variable, so children find their parent
+# across awaits; work handed to a thread pool must go through `bind` (or
+# run_in_executor / asyncio.to_thread, which copy the context themselves).
+_current: contextvars.ContextVar["Span | None"] = contextvars.ContextVar(
+    "neuro_span",
+    default=None,
+)
+
+
+def _new_id() -> str:
+    return os.urandom(8).hex()
+
+
+class Span:
+    """One timed operation; attributes are plain JSON values."""
+
+    recording = True
+
+    def __init__(self, name: str, parent: "Span | None", attributes: dict[str, Any]) -> None:
+        self.name = name
+        self.trace_id = parent.trace_id if parent else _new_id()
+        self.span_id = _new_id()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.status = "ok"
+        self.error: str | None = None
+        self.start_us = time.time_ns() // 1000
+        self.duration_us = 0
+        self.thread = threading.current_thread()
+        self._started = time.perf_counter()
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def fail(self, error: BaseException | str) -> None:
+        self.status = "error"
+        self.error = error if isinstance(error, str) else f"{type(error).__name__}: {error}"
+
+    def finish(self) -> None:
+        self.duration_us = int((time.perf_counter() - self._started) * 1_000_000)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_us": self.start_us,
+            "duration_ms": round(self.duration_us / 1000, 3),
+            "status": self.status,
+            "error": self.error,
+            "thread": self.thread.name,
+            "attributes": self.attributes,
+        }
+
+
+class _NullSpan:
+    """Stand-in while tracing is off; callers guard costly attributes on `recording`."""
+
+    recording = False
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def fail(self, error: BaseException | str) -> None:
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class TraceExporter:
+    """
+    Append finished spans to a file, one at a time.
+
+    A ``.json`` path is written in Chrome trace-event format (open it in
+    chrome://tracing, Perfetto or Speedscope); anything else gets one span
+    per JSONL line. The Chrome array is left unterminated, which the
+    viewers accept, so a crashed run still leaves a readable trace.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path).expanduser()
+        self.chrome = self.path.suffix == ".json"
+        self._lock = threading.Lock()
+        self._file = None
+        self._named_threads: set[int] = set()
+        self._warned = False
+
+    def _open(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+
+            if self.chrome and self._file.tell() == 0:
+                self._file.write("[\n")
+
+        return self._file
+
+    def _chrome_events(self, span: Span) -> list[dict[str, Any]]:
+        pid = os.getpid()
+        tid = span.thread.native_id or span.thread.ident or 0
+        events = []
+
+        if tid not in self._named_threads:
+            self._named_threads.add(tid)
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": span.thread.name},
+                }
+            )
+
+        events.append(
+            {
+                "name": span.name,
+                "cat": span.name.split(".")[0],
+                "ph": "X",
+                "ts": span.start_us,
+                "dur": span.duration_us,
+                "pid": pid,
+                "tid": tid,
+                "args": {
+                    **span.attributes,
+                    "trace_id": span.trace_id,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "status": span.status,
+                    **({"error": span.error} if span.error else {}),
+                },
+            }
+        )
+        return events
+
+    def export(self, span: Span) -> None:
+        try:
+            with self._lock:
+                file = self._open()
+
+                if self.chrome:
+                    for event in self._chrome_events(span):
+                        file.write(json.dumps(event, default=str) + ",\n")
+                else:
+                    file.write(json.dumps(span.as_dict(), default=str) + "\n")
+
+                file.flush()
+        except OSError as error:
+            if not self._warned:
+                self._warned = True
+                print(f"[neuro] trace export failed: {error}", file=sys.stderr)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_exporter: TraceExporter | None = None
+_configured = False
+_config_lock = threading.Lock()
+
+
+def configure(path: str | Path | None) -> TraceExporter | None:
+    """Send spans to `path` (None turns tracing off); replaces any earlier exporter."""
+
+    global _exporter, _configured
+
+    with _config_lock:
+        if _exporter is not None:
+            _exporter.close()
+
+        _exporter = TraceExporter(path) if path else None
+        _configured = True
+        return _exporter
+
+
+def exporter() -> TraceExporter | None:
+    """The active exporter; first use reads NEURO_TRACE (a file path)."""
+
+    if not _configured:
+        configure(os.getenv("NEURO_TRACE") or None)
+
+    return _exporter
+
+
+def enabled() -> bool:
+    return exporter() is not None
+
+
+def current() -> Span | _NullSpan:
+    return _current.get() or NULL_SPAN
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | _NullSpan]:
+    """
+    Time the with-block as a child of the current span (or a new trace).
+
+    Yields NULL_SPAN when tracing is off. An exception leaving the block
+    marks the span failed and propagates unchanged.
+    """
+
+    sink = exporter()
+
+    if sink is None:
+        yield NULL_SPAN
+        return
+
+    opened = Span(name, _current.get(), attributes)
+    token = _current.set(opened)
+
+    try:
+        yield opened
+    except BaseException as error:
+        opened.fail(error)
+        raise
+    finally:
+        _current.reset(token)
+        opened.finish()
+        sink.export(opened)
+
+
+def bind(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Run `fn` later (e.g. on a pool thread) under the current span."""
+
+    if _current.get() is None:
+        return fn
+
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(fn, *args, **kwargs)
+
+
+def trace_session(session: Any, name: str = "http") -> Any:
+    """
+    Give every request made through a requests.Session its own span.
+
+    Attributes: method, url (without query), status, request and response
+    bytes. Returns the session, instrumented in place.
+    """
+
+    request = session.request
+
+    def traced_request(method: str, url: str, *args: Any, **kwargs: Any) -> Any:
+        with span(name, method=method.upper(), url=url.split("?", 1)[0]) as current_span:
+            response = request(method, url, *args, **kwargs)
+
+            if current_span.recording:
+                body = response.request.body if response.request is not None else None
+                current_span.set(
+                    status=response.status_code,
+                    request_bytes=len(body or b""),
+                    response_bytes=len(response.content or b""),
+                )
+
+                if response.status_code >= 400:
+                    current_span.fail(f"HTTP {response.status_code}")
+
+            return response
+
+    session.request = traced_request
+    return session
+
+
+def load(path: str | Path) -> list[dict[str, Any]]:
+    """Spans (JSONL) or trace events (Chrome) back from a trace file."""
+
+    text = Path(path).expanduser().read_text(encoding="utf-8")
+
+    if Path(path).suffix == ".json":
+        body = text.strip().rstrip(",")
+        return json.loads(body if body.endswith("]") else body + "]")
+
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
@@ -0,0 +1,219 @@
+# src/core/transport.py
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from typing import Any
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+try:
+    import h2  # noqa: F401  (pip install "httpx[http2]")
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class TransportConfig:
+    """HTTP pool, timeout and retry settings (env-overridable)."""
+
+    def __init__(self) -> None:
+        self.max_connections = _env_int("NEURO_HTTP_MAX_CONNECTIONS", 20)
+        self.max_keepalive = _env_int("NEURO_HTTP_MAX_KEEPALIVE", 10)
+        self.keepalive_expiry = _env_float("NEURO_HTTP_KEEPALIVE_EXPIRY", 120.0)
+        self.connect_timeout = _env_float("NEURO_HTTP_CONNECT_TIMEOUT", 5.0)
+        self.timeout = _env_float("NEURO_TIMEOUT", 600.0)
+        http2 = os.getenv("NEURO_HTTP2", "auto").lower()
+        self.http2 = HTTP2_AVAILABLE and http2 not in {"0", "false", "off"}
+        self.max_retries = _env_int("NEURO_MAX_RETRIES", 3)
+        self.retry_initial_delay = _env_float("NEURO_RETRY_INITIAL_DELAY", 0.25)
+        self.retry_max_delay = _env_float("NEURO_RETRY_MAX_DELAY", 4.0)
+        # Re-warm the pool before a prompt when nothing has used it for this long.
+        self.prewarm_idle = _env_float("NEURO_PREWARM_IDLE", 20.0)
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeouts(self) -> httpx.Timeout:
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+
+class _TunedRetries:
+    """Exponential backoff with configurable base/cap; honours Retry-After."""
+
+    # Class defaults keep copies made by client.with_options() working.
+    retry_initial_delay: float = 0.5
+    retry_max_delay: float = 8.0
+
+    def _calculate_retry_timeout(
+        self,
+        remaining_retries: int,
+        options: Any,
+        response_headers: httpx.Headers | None = None,
+    ) -> float:
+        retry_after = self._parse_retry_after_header(response_headers)
+
+        if retry_after is not None and 0 < retry_after <= 60:
+            return retry_after
+
+        attempt = min(options.get_max_retries(self.max_retries) - remaining_retries, 30)
+        delay = min(self.retry_initial_delay * (2.0 ** attempt), self.retry_max_delay)
+        # Full jitter in [delay/2, delay] avoids synchronized retries.
+        return delay * (0.5 + random.random() / 2)
+
+
+class NeuroOpenAI(_TunedRetries, OpenAI):
+    """OpenAI client on a shared keep-alive pool with tuned retries."""
+
+    neuro_http: httpx.Client
+
+
+class NeuroAsyncOpenAI(_TunedRetries, AsyncOpenAI):
+    neuro_http: httpx.AsyncClient
+
+
+class _Activity:
+    """When the shared pool last completed a response (monotonic time)."""
+
+    def __init__(self) -> None:
+        self.last = 0.0
+        self.lock = threading.Lock()
+        self.warming = False
+
+    def mark(self, *_args: Any) -> None:
+        self.last = time.monotonic()
+
+    async def amark(self, *_args: Any) -> None:
+        self.last = time.monotonic()
+
+
+_activity = _Activity()
+
+
+def build_client(config: TransportConfig | None = None, **kwargs: Any) -> NeuroOpenAI:
+    """Create the process-wide OpenAI client on a tuned httpx pool."""
+
+    config = config or TransportConfig()
+    http = DefaultHttpxClient(
+        limits=config.limits(),
+        timeout=config.timeouts(),
+        http2=config.http2,
+        event_hooks={"response": [_activity.mark]},
+    )
+    client = NeuroOpenAI(
+        http_client=http,
+        max_retries=config.max_retries,
+        timeout=config.timeouts(),
+        **kwargs,
+    )
+    client.neuro_http = http
+    client.retry_initial_delay = config.retry_initial_delay
+    client.retry_max_delay = config.retry_max_delay
+    client.prewarm_idle = config.prewarm_idle
+    return client
+
+
+def build_async_client(
+    config: TransportConfig | None = None,
+    **kwargs: Any,
+) -> NeuroAsyncOpenAI:
+    """Async twin of build_client for run_turn_async callers."""
+
+    config = config or TransportConfig()
+    http = DefaultAsyncHttpxClient(
+        limits=config.limits(),
+        timeout=config.timeouts(),
+        http2=config.http2,
+        event_hooks={"response": [_activity.amark]},
+    )
+    client = NeuroAsyncOpenAI(
+        http_client=http,
+        max_retries=config.max_retries,
+        timeout=config.timeouts(),
+        **kwargs,
+    )
+    client.neuro_http = http
+    client.retry_initial_delay = config.retry_initial_delay
+    client.retry_max_delay = config.retry_max_delay
+    return client
+
+
+def _warm(http: httpx.Client, url: str) -> None:
+    try:
+        # Any response will do: the point is DNS + TCP + TLS, after which the
+        # connection sits in the keep-alive pool for the next real request.
+        http.head(url, timeout=5.0)
+    except Exception:
+        pass
+    finally:
+        _activity.warming = False
+
+
+def prewarm(client: Any, *, force: bool = False) -> threading.Thread | None:
+    """
+    Open a pooled connection to the API in the background.
+
+    No-op for clients not built by build_client, while a warm-up is already
+    running, or when the pool was used within the idle threshold.
+    """
+
+    http = getattr(client, "neuro_http", None)
+
+    if not isinstance(http, httpx.Client):
+        return None
+
+    idle = time.monotonic() - _activity.last
+
+    with _activity.lock:
+        if _activity.warming:
+            return None
+
+        if not force and _activity.last and idle < getattr(client, "prewarm_idle", 20.0):
+            return None
+
+        _activity.warming = True
+
+    thread = threading.Thread(
+        target=_warm,
+        args=(http, str(client.base_url)),
+        name="neuro-prewarm",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def keep_warm(client: Any, stop: threading.Event) -> None:
+    """
+    Keep a long-running server's connection pool warm until `stop` is set.
+
+    Run on its own thread; prewarm is a no-op while the pool is in use, so
+    this only re-opens a connection before keep-alive expiry drops it.
+    """
+
+    interval = max(5.0, getattr(client, "prewarm_idle", 20.0))
+
+    while not stop.wait(interval):
+        prewarm(client)
@@ -0,0 +1,291 @@
+# src/core/turnlog.py
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import os
+import queue
+import shutil
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+DEFAULT_MAX_BYTES = int(os.getenv("NEURO_HISTORY_MAX_BYTES", str(10 * 1024 * 1024)))
+DEFAULT_BACKUPS = int(os.getenv("NEURO_HISTORY_BACKUPS", "5"))
+
+_STOP = object()
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in {"1", "true", "yes", "on"}
+
+
+def jsonl_path(log_file: str | Path) -> Path:
+    """
+    Where structured records for a configured history file go.
+
+    A legacy ``*.md`` history path gets a ``.jsonl`` sibling; anything else
+    is used as-is.
+    """
+
+    path = Path(log_file).expanduser()
+    return path.with_suffix(".jsonl") if path.suffix == ".md" else path
+
+
+def markdown_path(log_file: str | Path) -> Path | None:
+    """The optional Markdown mirror, or None when it is disabled."""
+
+    path = Path(log_file).expanduser()
+
+    if path.suffix == ".md":
+        return path
+
+    if _env_flag("NEURO_HISTORY_MARKDOWN"):
+        return path.with_suffix(".md")
+
+    return None
+
+
+def render_markdown(record: dict[str, Any]) -> str:
+    """Render one turn record in the historical history.md layout."""
+
+    text = (
+        "\n### turn\n"
+        f"**You:** {record.get('user', '')}\n\n"
+        f"**AI:** {record.get('text', '')}\n"
+    )
+
+    tool_calls = record.get("tool_calls") or []
+
+    if tool_calls:
+        last = tool_calls[-1]
+        text += (
+            f"\n_Tool used_: {', '.join(call['name'] for call in tool_calls)}\n"
+            f"_Input bytes_: {last.get('args_bytes', 0)}\n"
+            f"_Output_: {last.get('output_preview', '')}\n"
+        )
+
+    return text
+
+
+class TurnLogWriter:
+    """
+    Append-only JSONL turn log written from a background thread.
+
+    Callers enqueue records and return immediately, so rendering never
+    waits on disk. The file rotates once it passes ``max_bytes``; archives
+    are gzip-compressed as ``<name>.1.gz`` (newest) .. ``<name>.N.gz``.
+    The Markdown mirror, when kept, rotates the same way on its own size.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backups: int = DEFAULT_BACKUPS,
+        markdown: str | Path | None = None,
+        sinks: list[Callable[[dict[str, Any]], None]] | None = None,
+    ):
+        self.path = Path(path).expanduser()
+        # Extra consumers (e.g. the SQLite history store) fed on this thread.
+        self.sinks = list(sinks or [])
+        self.max_bytes = max_bytes
+        self.backups = max(0, backups)
+        self.markdown = Path(markdown).expanduser() if markdown else None
+        self._queue: queue.Queue = queue.Queue()
+        self._file = None
+        self._warned = False
+        self._sink_warned: set[str] = set()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"neuro-log:{self.path.name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def submit(self, record: dict[str, Any]) -> None:
+        self._queue.put(record)
+
+    def flush(self) -> None:
+        """Block until every submitted record has been written."""
+        self._queue.join()
+
+    def close(self, timeout: float = 5.0) -> None:
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+
+            try:
+                if record is _STOP:
+                    if self._file:
+                        self._file.close()
+                    return
+
+                self._write(record)
+            except Exception as error:
+                if not self._warned:
+                    self._warned = True
+                    print(f"[neuro] history log write failed: {error}", file=sys.stderr)
+            finally:
+                self._queue.task_done()
+
+    def _open(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+        return self._file
+
+    def _write(self, record: dict[str, Any]) -> None:
+        file = self._open()
+        file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        file.flush()
+
+        if self.markdown is not None:
+            self.markdown.parent.mkdir(parents=True, exist_ok=True)
+            with self.markdown.open("a", encoding="utf-8") as md:
+                md.write(render_markdown(record))
+                markdown_size = md.tell()
+
+            if self._full(markdown_size):
+                self._rotate(self.markdown)
+
+        # Rotation first: a failing sink must not let the log grow forever.
+        if self._full(file.tell()):
+            self._file.close()
+            self._file = None
+            self._rotate(self.path)
+
+        for sink in self.sinks:
+            try:
+                sink(record)
+            except Exception as error:
+                self._sink_failed(sink, error)
+
+    def _sink_failed(self, sink: Callable[[dict[str, Any]], None], error: Exception) -> None:
+        # Warned once per sink, so a broken history DB does not drown the
+        # terminal but does not hide other failures either.
+        name = getattr(sink, "__qualname__", None) or type(sink).__name__
+
+        if name not in self._sink_warned:
+            self._sink_warned.add(name)
+            print(f"[neuro] history sink {name} failed: {error}", file=sys.stderr)
+
+    def _full(self, size: int) -> bool:
+        return self.max_bytes > 0 and size >= self.max_bytes
+
+    def _archive(self, path: Path, index: int) -> Path:
+        return path.with_name(f"{path.name}.{index}.gz")
+
+    def _rotate(self, path: Path) -> None:
+        if self.backups == 0:
+            path.unlink(missing_ok=True)
+            return
+
+        self._archive(path, self.backups).unlink(missing_ok=True)
+
+        for index in range(self.backups - 1, 0, -1):
+            if self._archive(path, index).exists():
+                self._archive(path, index).replace(self._archive(path, index + 1))
+
+        with path.open("rb") as source, gzip.open(self._archive(path, 1), "wb") as target:
+            shutil.copyfileobj(source, target)
+
+        path.unlink()
+
+
+_writers: dict[Path, TurnLogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def _default_sinks(log_file: str | Path) -> list[Callable[[dict[str, Any]], None]]:
+    if os.getenv("NEURO_HISTORY_DB", "").lower() in {"off", "0", "none"}:
+        return []
+
+    from .history import open_store
+
+    try:
+        return [open_store(log_file)]
+    except Exception as error:
+        print(f"[neuro] history search store unavailable: {error}", file=sys.stderr)
+        return []
+
+
+def default_log_file() -> Path:
+    """The history file used when none is passed explicitly."""
+
+    neuro_home = Path(os.getenv("NEURO_HOME", Path.home() / ".neuro")).expanduser()
+    return Path(
+        os.getenv("NEURO_HISTORY_FILE", neuro_home / "history.jsonl")
+    ).expanduser()
+
+
+# History file of the most recent turn in this process.
+_active_log: Path | None = None
+
+
+def set_active_log(log_file: str | Path) -> None:
+    global _active_log
+    _active_log = jsonl_path(log_file)
+
+
+def active_log_file() -> Path:
+    """The history file turns are being written to, else the default one."""
+
+    return _active_log or default_log_file()
+
+
+def get_writer(log_file: str | Path) -> TurnLogWriter:
+    """Shared writer for a configured history file (one thread per file)."""
+
+    path = jsonl_path(log_file)
+
+    with _writers_lock:
+        writer = _writers.get(path)
+
+        if writer is None:
+            writer = TurnLogWriter(
+                path,
+                markdown=markdown_path(log_file),
+                sinks=_default_sinks(log_file),
+            )
+            _writers[path] = writer
+
+        return writer
+
+
+def read_records(log_file: str | Path) -> list[dict[str, Any]]:
+    """Load the current (unrotated) JSONL log."""
+
+    path = jsonl_path(log_file)
+
+    if not path.exists():
+        return []
+
+    records = []
+
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+
+    return records
+
+
+@atexit.register
+def _close_writers() -> None:
+    with _writers_lock:
+        writers = list(_writers.values())
+
+    for writer in writers:
+        writer.close()
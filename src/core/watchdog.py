@@ -0,0 +1,492 @@
+# src/core/watchdog.py
+from __future__ import annotations
+
+import asyncio
+import itertools
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from .env import env_number
+
+# Events the API sends before the model produces anything. A hedge races
+# on the first event past these, not on the (always quick) acknowledgement.
+PREAMBLE_EVENTS = frozenset(
+    {"response.created", "response.queued", "response.in_progress"}
+)
+
+
+@dataclass
+class StallPolicy:
+    """
+    When a streaming request counts as stalled, and what to do about it.
+
+    first_event_s:  no event at all this long after sending -> stalled.
+    idle_s:         no event this long after the previous one -> stalled.
+    retries:        stalled requests resent (with the same input) per call.
+    hedge_after_s:  no output this long after sending -> send one hedged
+                    copy of the request and keep whichever answers first.
+
+    None disables a threshold. Defaults come from NEURO_STALL_FIRST_EVENT,
+    NEURO_STALL_IDLE, NEURO_STALL_RETRIES and NEURO_HEDGE_AFTER. Only the
+    first-event check is on by default: reasoning models can think for
+    minutes between events, and a resend pays for the whole turn again,
+    so the idle check and hedging stay off until their variable is set.
+    Any event, including reasoning and in-progress ones, resets the idle
+    clock.
+    """
+
+    first_event_s: float | None = 30.0
+    idle_s: float | None = None
+    retries: int = 1
+    hedge_after_s: float | None = None
+
+    @classmethod
+    def from_env(cls) -> "StallPolicy":
+        return cls(
+            first_event_s=env_number("NEURO_STALL_FIRST_EVENT", 30.0),
+            idle_s=env_number("NEURO_STALL_IDLE", None),
+            retries=int(env_number("NEURO_STALL_RETRIES", 1) or 0),
+            hedge_after_s=env_number("NEURO_HEDGE_AFTER", None),
+        )
+
+    @property
+    def active(self) -> bool:
+        return any(
+            value is not None
+            for value in (self.first_event_s, self.idle_s, self.hedge_after_s)
+        )
+
+
+class HedgeBudget:
+    """
+    Cap on extra spend from hedged requests.
+
+    Every request earns `ratio` of a hedge, banked up to `burst`; a hedge
+    spends one. With the default NEURO_HEDGE_MAX_RATIO=0.1, at most about
+    one request in ten is duplicated over any longer run.
+    """
+
+    def __init__(self, ratio: float = 0.1, burst: float = 2.0) -> None:
+        self.ratio = max(0.0, ratio)
+        self.burst = max(1.0, burst)
+        self.credits = 1.0
+        self.requests = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def note_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.credits = min(self.burst, self.credits + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.credits < 1.0:
+                return False
+
+            self.credits -= 1.0
+            self.hedges += 1
+            return True
+
+
+hedge_budget = HedgeBudget(ratio=env_number("NEURO_HEDGE_MAX_RATIO", 0.1) or 0.0)
+
+
+class StreamStalled(Exception):
+    """A streaming request went quiet past its StallPolicy threshold."""
+
+    def __init__(self, phase: str, waited_s: float) -> None:
+        super().__init__(f"no {phase} for {waited_s:.1f}s")
+        self.phase = phase
+        self.waited_s = waited_s
+
+
+class _Attempt:
+    """One copy of the request in a race: its clock and early events."""
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.started = time.perf_counter()
+        self.buffer: list[Any] = []
+        self.dead = False
+        self.handle: Any = None  # thread state or asyncio.Task
+
+
+class _Race:
+    """
+    Clocks and winner selection shared by the sync and async watchers.
+
+    Items arrive as (attempt, kind, payload) with kind "event", "final" or
+    "error"; accept() returns the events the caller should see.
+    """
+
+    def __init__(self, policy: StallPolicy, budget: HedgeBudget) -> None:
+        self.policy = policy
+        self.budget = budget
+        self.attempts: list[_Attempt] = []
+        self.winner: _Attempt | None = None
+        self.last_event: float | None = None
+        self.final: Any = None
+        self.done = False
+        self._hedge_denied = False
+
+    @property
+    def hedged(self) -> bool:
+        return len(self.attempts) > 1
+
+    def add_attempt(self) -> _Attempt:
+        if not self.attempts:
+            self.budget.note_request()  # hedges do not earn more hedges
+
+        attempt = _Attempt(len(self.attempts))
+        self.attempts.append(attempt)
+        return attempt
+
+    def wants_hedge(self) -> bool:
+        if self.winner is not None or self.hedged or self._hedge_denied:
+            return False
+
+        if self.policy.hedge_after_s is None:
+            return False
+
+        if not self.budget.try_spend():
+            self._hedge_denied = True
+            return False
+
+        return True
+
+    def deadline(self) -> tuple[float | None, str]:
+        """Next moment something must happen, and what it is."""
+
+        policy = self.policy
+        candidates: list[tuple[float, str]] = []
+
+        if self.last_event is None:
+            if policy.first_event_s is not None:
+                candidates.append(
+                    (self.attempts[-1].started + policy.first_event_s, "first event")
+                )
+        elif policy.idle_s is not None:
+            candidates.append((self.last_event + policy.idle_s, "event"))
+
+        if (
+            self.winner is None
+            and not self.hedged
+            and not self._hedge_denied
+            and policy.hedge_after_s is not None
+        ):
+            candidates.append((self.attempts[0].started + policy.hedge_after_s, "hedge"))
+
+        if not candidates:
+            return None, ""
+
+        return min(candidates)
+
+    def stalled(self, phase: str) -> StreamStalled:
+        since = self.last_event if self.last_event is not None else self.attempts[-1].started
+        return StreamStalled(phase, time.perf_counter() - since)
+
+    def _crown(self, attempt: _Attempt) -> list[Any]:
+        self.winner = attempt
+        events, attempt.buffer = attempt.buffer, []
+        return events
+
+    def losers(self) -> list[_Attempt]:
+        return [a for a in self.attempts if a is not self.winner and not a.dead]
+
+    def accept(self, attempt: _Attempt, kind: str, payload: Any) -> list[Any]:
+        if attempt.dead or (self.winner is not None and attempt is not self.winner):
+            return []
+
+        if kind == "error":
+            attempt.dead = True
+
+            if attempt is self.winner or not any(not a.dead for a in self.attempts):
+                raise payload
+
+            return []
+
+        if kind == "final":
+            events = self._crown(attempt) if self.winner is None else []
+            self.final = payload
+            self.done = True
+            return events
+
+        # Every event is a keep-alive, not just output: reasoning and
+        # in-progress events prove the request is still being worked on.
+        self.last_event = time.perf_counter()
+
+        if self.winner is None:
+            attempt.buffer.append(payload)
+
+            if getattr(payload, "type", None) in PREAMBLE_EVENTS:
+                return []
+
+            return self._crown(attempt)
+
+        return [payload]
+
+
+class _Readers:
+    """
+    Reusable daemon threads for stream producers.
+
+    The SDK builds its response models' validators once per thread, which
+    costs a fresh thread well over 100ms on its first response; parked
+    readers keep that work. An idle reader is reused, otherwise a new one
+    is started, so a stuck read never delays another stream.
+    """
+
+    def __init__(self, idle_s: float = 300.0) -> None:
+        self.idle_s = idle_s
+        self._idle: list[queue.SimpleQueue] = []
+        self._lock = threading.Lock()
+        self._names = itertools.count()
+
+    def submit(self, job: Callable[[], None]) -> None:
+        with self._lock:
+            inbox = self._idle.pop() if self._idle else None
+
+        if inbox is None:
+            inbox = queue.SimpleQueue()
+            threading.Thread(
+                target=self._serve,
+                args=(inbox,),
+                name=f"neuro-stream-{next(self._names)}",
+                daemon=True,
+            ).start()
+
+        inbox.put(job)
+
+    def _serve(self, inbox: queue.SimpleQueue) -> None:
+        while True:
+            try:
+                job = inbox.get(timeout=self.idle_s)
+            except queue.Empty:
+                with self._lock:
+                    if inbox in self._idle:
+                        self._idle.remove(inbox)
+                        return
+
+                continue  # handed a job just as we timed out
+
+            job()
+
+            with self._lock:
+                self._idle.append(inbox)
+
+
+_readers = _Readers()
+
+
+class WatchedStream:
+    """
+    Iterate a Responses stream under a StallPolicy.
+
+    `open_stream` returns a fresh stream context manager each call (the
+    hedge needs a second one). Events are read on reader threads so the
+    thresholds hold even while a socket read blocks. Raises StreamStalled;
+    after iteration, `final` holds the winning response.
+    """
+
+    def __init__(
+        self,
+        open_stream: Callable[[], Any],
+        policy: StallPolicy,
+        budget: HedgeBudget = hedge_budget,
+    ) -> None:
+        self._open = open_stream
+        self.policy = policy
+        self._race = _Race(policy, budget)
+        self.final: Any = None
+
+    @property
+    def hedged(self) -> bool:
+        return self._race.hedged
+
+    @property
+    def hedge_won(self) -> bool:
+        return self._race.winner is not None and self._race.winner.index > 0
+
+    def _start(self, items: queue.Queue) -> None:
+        attempt = self._race.add_attempt()
+        cancelled = threading.Event()
+        state = {"cancelled": cancelled, "stream": None}
+        attempt.handle = state
+
+        def produce() -> None:
+            try:
+                with self._open() as stream:
+                    state["stream"] = stream
+
+                    for event in stream:
+                        if cancelled.is_set():
+                            return
+
+                        items.put((attempt, "event", event))
+
+                    final = stream.get_final_response()
+
+                items.put((attempt, "final", final))
+            except BaseException as error:
+                if not cancelled.is_set():
+                    items.put((attempt, "error", error))
+
+        _readers.submit(produce)
+
+    @staticmethod
+    def _cancel(attempt: _Attempt) -> None:
+        attempt.dead = True
+        state = attempt.handle
+        state["cancelled"].set()
+        close = getattr(state["stream"], "close", None)
+
+        if close is not None:
+            try:
+                close()  # unblocks a pending socket read
+            except Exception:
+                pass
+
+    def __iter__(self) -> Iterator[Any]:
+        if not self.policy.active:
+            self._race.add_attempt()
+
+            with self._open() as stream:
+                yield from stream
+                self.final = stream.get_final_response()
+
+            return
+
+        race = self._race
+        items: queue.Queue = queue.Queue()
+        self._start(items)
+
+        try:
+            while not race.done:
+                when, phase = race.deadline()
+                timeout = None if when is None else max(0.0, when - time.perf_counter())
+
+                try:
+                    attempt, kind, payload = items.get(timeout=timeout)
+                except queue.Empty:
+                    if phase == "hedge" and race.wants_hedge():
+                        self._start(items)
+                        continue
+
+                    if phase == "hedge":
+                        continue
+
+                    raise race.stalled(phase) from None
+
+                events = race.accept(attempt, kind, payload)
+
+                if race.winner is not None:
+                    for loser in race.losers():
+                        self._cancel(loser)
+
+                yield from events
+
+            self.final = race.final
+        finally:
+            # Losers, and everything if the caller stopped early or we raised.
+            for attempt in race.attempts:
+                if attempt is not race.winner or not race.done:
+                    self._cancel(attempt)
+
+
+class WatchedAsyncStream:
+    """Async twin of WatchedStream; attempts are tasks on the running loop."""
+
+    def __init__(
+        self,
+        open_stream: Callable[[], Any],
+        policy: StallPolicy,
+        budget: HedgeBudget = hedge_budget,
+    ) -> None:
+        self._open = open_stream
+        self.policy = policy
+        self._race = _Race(policy, budget)
+        self.final: Any = None
+
+    @property
+    def hedged(self) -> bool:
+        return self._race.hedged
+
+    @property
+    def hedge_won(self) -> bool:
+        return self._race.winner is not None and self._race.winner.index > 0
+
+    def _start(self, items: asyncio.Queue) -> None:
+        attempt = self._race.add_attempt()
+
+        async def produce() -> None:
+            try:
+                async with self._open() as stream:
+                    async for event in stream:
+                        items.put_nowait((attempt, "event", event))
+
+                    final = await stream.get_final_response()
+
+                items.put_nowait((attempt, "final", final))
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                items.put_nowait((attempt, "error", error))
+
+        attempt.handle = asyncio.ensure_future(produce())
+
+    @staticmethod
+    def _cancel(attempt: _Attempt) -> None:
+        attempt.dead = True
+        attempt.handle.cancel()
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        if not self.policy.active:
+            self._race.add_attempt()
+
+            async with self._open() as stream:
+                async for event in stream:
+                    yield event
+
+                self.final = await stream.get_final_response()
+
+            return
+
+        race = self._race
+        items: asyncio.Queue = asyncio.Queue()
+        self._start(items)
+
+        try:
+            while not race.done:
+                when, phase = race.deadline()
+                timeout = None if when is None else max(0.0, when - time.perf_counter())
+
+                try:
+                    attempt, kind, payload = await asyncio.wait_for(items.get(), timeout)
+                except asyncio.TimeoutError:
+                    if phase == "hedge" and race.wants_hedge():
+                        self._start(items)
+                        continue
+
+                    if phase == "hedge":
+                        continue
+
+                    raise race.stalled(phase) from None
+
+                events = race.accept(attempt, kind, payload)
+
+                if race.winner is not None:
+                    for loser in race.losers():
+                        self._cancel(loser)
+
+                for event in events:
+                    yield event
+
+            self.final = race.final
+        finally:
+            for attempt in race.attempts:
+                if not attempt.handle.done():
+                    self._cancel(attempt)
@@ -1,4 +1,8 @@
 # src/tools/__init__.py
-# Import tool modules so they register themselves with the registry at startup.
-from .homeassistant import *  # noqa: F401,F403
-from .sandbox import *        # noqa: F401,F403
+# Register the built-in tools. By default only their schemas are registered
+# (from manifest.json); each module is imported on its first call. Set
+# NEURO_LAZY_TOOLS=0 to import every module at startup instead.
+from .manifest import lazy_tools_enabled, load_all, load_manifest
+
+if not (lazy_tools_enabled() and load_manifest()):
+    load_all()
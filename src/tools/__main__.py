@@ -0,0 +1,5 @@
+# src/tools/__main__.py
+# `python -m src.tools` regenerates manifest.json from the tool modules.
+from .manifest import write_manifest
+
+print(f"wrote {write_manifest()}")
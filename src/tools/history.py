@@ -0,0 +1,49 @@
+# src/tools/history.py
+from ..core.history import open_store
+from ..core.registry import register_tool, ToolSpec
+from ..core.turnlog import active_log_file
+
+
+def history_search(query: str, k: int = 5):
+    """Top-k past turns matching a free-text query, as short snippets."""
+    k = max(1, min(int(k or 5), 20))
+    results = open_store(active_log_file()).search(query, limit=k)
+    return {
+        "query": query,
+        "results": [
+            {
+                "ts": r["ts"],
+                "you": r["user"],
+                "snippet": r["snippet"],
+                "tools": r["tools"],
+            }
+            for r in results
+        ],
+    }
+
+
+register_tool(
+    ToolSpec(
+        name="history_search",
+        kind="function",
+        description=(
+            "Search the user's past Neuro conversations (all sessions) and return the "
+            "most relevant snippets. Use when the user refers to something discussed before."
+        ),
+        parameters={
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Keywords to look for."},
+                "k": {"type": "integer", "minimum": 1, "maximum": 20, "default": 5},
+            },
+            "required": ["query"],
+        },
+        runner=history_search,
+        groups={"history"},
+        keywords=(
+            "remember", "recall", "earlier", "previous", "last time",
+            "yesterday", "history", "discussed", "we talked", "you said", "i said",
+            "told you",
+        ),
+    )
+)
@@ -7,13 +7,14 @@ import time
 import re
 import difflib
 from datetime import datetime
-from ..core.registry import register_tool, ToolSpec
+from ..core.registry import register_tool, ToolSpec, CachePolicy
+from ..core.tracing import trace_session
 
 # ----------- HTTP client (REST) -----------
 HA_BASE = (os.getenv("HA_BASE_URL", "http://localhost:8123") or "").rstrip("/")
 HA_TOKEN = os.getenv("HA_TOKEN", "") or ""
 
-_session = requests.Session()
+_session = trace_session(requests.Session(), "ha.http")
 # Always send JSON; add Authorization only if present.
 _session.headers.update({"Content-Type": "application/json"})
 if HA_TOKEN:
@@ -387,7 +388,67 @@ def _ws_status():
     }
 
 
+# ----------- Result caching -----------
+# Reads are cached briefly (see CachePolicy); anything that can change state
+# invalidates by tag. "ha:states" covers whole-inventory reads, "ha:entity"
+# covers every single-entity read, "entity:<id>" one entity.
+def _ha_cacheable(result) -> bool:
+    if not isinstance(result, (dict, list)):
+        return False
+    if isinstance(result, dict):
+        if "error" in result:
+            return False
+        status = result.get("status")
+        if isinstance(status, int) and status >= 400:
+            return False
+    return True
+
+
+def _entity_ids(value) -> list:
+    if isinstance(value, str):
+        return [e.strip() for e in value.split(",") if e.strip()]
+    if isinstance(value, (list, tuple)):
+        return [str(e) for e in value]
+    return []
+
+
+def _state_tags(args: dict):
+    entity_id = (args or {}).get("entity_id")
+    return {"ha:entity", *(f"entity:{e}" for e in _entity_ids(entity_id))}
+
+
+def _service_invalidates(args: dict):
+    """State a service call may have changed: its targets, plus any inventory view."""
+    args = args or {}
+    entities = []
+    for holder in (args, args.get("service_data"), args.get("data"), args.get("target")):
+        if isinstance(holder, dict):
+            entities += _entity_ids(holder.get("entity_id"))
+    target = args.get("target") if isinstance(args.get("target"), dict) else {}
+    if not entities or target.get("area_id") or target.get("device_id"):
+        return {"ha:states", "ha:entity"}
+    return {"ha:states", *(f"entity:{e}" for e in entities)}
+
+
+def _everything(_args=None):
+    return {"ha:states", "ha:entity"}
+
+
 # ----------- Register tools -----------
+# Router group: every HA tool is offered together (resolve -> state -> service
+# chains need all of them) whenever a prompt sounds like home control.
+HA_GROUPS = {"homeassistant"}
+HA_KEYWORDS = (
+    "home assistant", "homeassistant", "hass", "ha ", "light", "lamp", "bulb", "switch",
+    "plug", "outlet", "turn on", "turn off", "toggle", "dim", "bright", "thermostat",
+    "temperature", "climate", "heat", "cool", "ac ", "hvac", "fan", "humid", "sensor",
+    "door", "window", "lock", "unlock", "garage", "blind", "shade", "curtain", "cover",
+    "alarm", "camera", "motion", "presence", "vacuum", "media", "speaker", "tv",
+    "scene", "script", "automation", "entity", "entities", "device", "room",
+    "kitchen", "bedroom", "living room", "bathroom", "office", "hallway", "porch",
+    "house", "battery", "energy", "power", "event", "template", "subscribe",
+    "websocket",
+)
 register_tool(
     ToolSpec(
         name="ha_service",
@@ -418,6 +479,9 @@ register_tool(
             "required": ["domain", "service"],
         },
         runner=ha_service,
+        invalidates=_service_invalidates,
+        groups=HA_GROUPS,
+        keywords=HA_KEYWORDS,
     )
 )
 
@@ -428,6 +492,9 @@ register_tool(
         description="Get state and attributes of a single entity_id.",
         parameters={"type": "object", "properties": {"entity_id": {"type": "string"}}, "required": ["entity_id"]},
         runner=ha_get_state,
+        cache=CachePolicy(ttl=10, tags=_state_tags, accept=_ha_cacheable),
+        groups=HA_GROUPS,
+        keywords=HA_KEYWORDS,
     )
 )
 
@@ -442,6 +509,9 @@ register_tool(
             "required": ["event_type"],
         },
         runner=ha_fire_event,
+        invalidates=_everything,
+        groups=HA_GROUPS,
+        keywords=HA_KEYWORDS,
     )
 )
 
@@ -452,6 +522,9 @@ register_tool(
         description="Render a Jinja template on the HA server.",
         parameters={"type": "object", "properties": {"template": {"type": "string"}}, "required": ["template"]},
         runner=ha_template,
+        cache=CachePolicy(ttl=10, tags=_everything, accept=_ha_cacheable),
+        groups=HA_GROUPS,
+        keywords=HA_KEYWORDS,
     )
 )
 
@@ -462,6 +535,9 @@ register_tool(
         description="Check Home Assistant connectivity and summarize entity inventory.",
         parameters={"type": "object", "properties": {}},
         runner=ha_health,
+        cache=CachePolicy(ttl=30, tags=lambda _args: {"ha:states"}, accept=_ha_cacheable),
+        groups=HA_GROUPS,
+        keywords=HA_KEYWORDS,
     )
 )
 
@@ -472,6 +548,9 @@ register_tool(
         description="List entities (optionally filtered by domain).",
         parameters={"type": "object", "properties": {"domain": {"type": "string"}}},
         runner=ha_list_states,
+        cache=CachePolicy(ttl=30, tags=lambda _args: {"ha:states"}, accept=_ha_cacheable),
+        groups=HA_GROUPS,
+        keywords=HA_KEYWORDS,
     )
 )
 
@@ -490,6 +569,9 @@ register_tool(
             "required": ["name"],
         },
         runner=ha_resolve,
+        cache=CachePolicy(ttl=30, tags=lambda _args: {"ha:states"}, accept=_ha_cacheable),
+        groups=HA_GROUPS,
+        keywords=HA_KEYWORDS,
     )
 )
 
@@ -506,6 +588,8 @@ register_tool(
             },
         },
         runner=_ws_subscribe,
+        groups=HA_GROUPS,
+        keywords=HA_KEYWORDS,
     )
 )
 
@@ -516,6 +600,8 @@ register_tool(
         description="Stop HA WebSocket listener.",
         parameters={"type": "object", "properties": {}},
         runner=_ws_stop,
+        groups=HA_GROUPS,
+        keywords=HA_KEYWORDS,
     )
 )
 
@@ -526,5 +612,7 @@ register_tool(
         description="Report WebSocket connection and current subscriptions.",
         parameters={"type": "object", "properties": {}},
         runner=_ws_status,
+        groups=HA_GROUPS,
+        keywords=HA_KEYWORDS,
     )
 )
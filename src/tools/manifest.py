@@ -0,0 +1,101 @@
+# src/tools/manifest.py
+"""
+Lightweight tool manifest.
+
+manifest.json holds the schema of every built-in tool, so the registry can
+offer them to the model without importing their modules (which open HTTP
+sessions, load .env and create directories). A module is imported the first
+time one of its tools is called.
+
+Regenerate after changing a tool's schema, groups or keywords:
+
+    python -m src.tools
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+from pathlib import Path
+
+from ..core.registry import all_tools, register_lazy_tool
+
+MANIFEST_PATH = Path(__file__).with_name("manifest.json")
+
+TOOL_MODULES = (
+    "src.tools.homeassistant",
+    "src.tools.sandbox",
+    "src.tools.history",
+)
+
+
+def lazy_tools_enabled() -> bool:
+    """NEURO_LAZY_TOOLS=0 imports every tool module up front."""
+
+    return os.getenv("NEURO_LAZY_TOOLS", "1").lower() not in {"0", "false", "no", "off"}
+
+
+def build_manifest() -> list[dict]:
+    """Import every tool module and describe what it registers."""
+
+    load_all()
+    entries = []
+
+    for spec in all_tools().values():
+        module = getattr(spec.runner, "__module__", None)
+
+        if module not in TOOL_MODULES:
+            continue
+
+        entries.append(
+            {
+                "name": spec.name,
+                "module": module,
+                "description": spec.description,
+                "parameters": spec.parameters,
+                "groups": sorted(spec.groups),
+                "keywords": list(spec.keywords),
+            }
+        )
+
+    return entries
+
+
+def write_manifest(path: Path = MANIFEST_PATH) -> Path:
+    path.write_text(
+        json.dumps(build_manifest(), indent=2, ensure_ascii=False) + "\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> int:
+    """
+    Register lazy placeholders for every manifest entry; returns the count
+    (0 when there is no manifest, so the caller can import eagerly instead).
+    """
+
+    try:
+        entries = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return 0
+
+    for entry in entries:
+        register_lazy_tool(
+            name=entry["name"],
+            module=entry["module"],
+            description=entry["description"],
+            parameters=entry.get("parameters"),
+            groups=entry.get("groups"),
+            keywords=entry.get("keywords"),
+        )
+
+    return len(entries)
+
+
+def load_all() -> None:
+    """Import every tool module now (daemons, tests, NEURO_LAZY_TOOLS=0)."""
+
+    for module in TOOL_MODULES:
+        importlib.import_module(module)
@@ -8,6 +8,7 @@ import subprocess
 from pathlib import Path
 from typing import List, Optional, Union
 from ..core.registry import register_tool, ToolSpec
+from ..core.tracing import span
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -134,13 +135,20 @@ def code_exec(
         cmd += _string_list(args)
 
         try:
-            run = subprocess.run(
-                cmd,
-                input=_to_text(stdin).encode("utf-8") if stdin is not None else None,
-                cwd=str(workdir),
-                capture_output=True,
-                timeout=max(1, int(timeout)),
-            )
+            stdin_bytes = _to_text(stdin).encode("utf-8") if stdin is not None else None
+            with span("sandbox.exec", file=file_path.name, code_bytes=len(code_text),
+                      stdin_bytes=len(stdin_bytes or b""), timeout=timeout) as proc_span:
+                run = subprocess.run(
+                    cmd,
+                    input=stdin_bytes,
+                    cwd=str(workdir),
+                    capture_output=True,
+                    timeout=max(1, int(timeout)),
+                )
+                proc_span.set(exit_code=run.returncode, stdout_bytes=len(run.stdout),
+                              stderr_bytes=len(run.stderr))
+                if run.returncode:
+                    proc_span.fail(f"exit code {run.returncode}")
             out = {
                 "exit_code": run.returncode,
                 "stdout": run.stdout.decode("utf-8", "replace"),
@@ -182,6 +190,14 @@ def code_write(path: str, content: Union[str, dict, list], cwd: Optional[str] =
         return {"error": f"{type(e).__name__}: {e}"}
 
 # ---------------- Tool registrations ----------------
+# Router group: offered when a prompt mentions code, files or computation.
+SANDBOX_GROUPS = {"sandbox"}
+SANDBOX_KEYWORDS = (
+    "code", "python", "script", "program", "run ", "execut", "comput", "calculat",
+    "math", "sum ", "average", "sort", "parse", "csv", "json", "regex", "file",
+    "write", "save", "plot", "simulat", "algorithm", "function", "sandbox",
+)
+
 register_tool(ToolSpec(
     name="code_exec",
     kind="function",
@@ -199,7 +215,9 @@ register_tool(ToolSpec(
         },
         "required": ["code"]
     },
-    runner=code_exec
+    runner=code_exec,
+    groups=SANDBOX_GROUPS,
+    keywords=SANDBOX_KEYWORDS,
 ))
 
 register_tool(ToolSpec(
@@ -215,5 +233,7 @@ register_tool(ToolSpec(
         },
         "required": ["path", "content"]
     },
-    runner=code_write
+    runner=code_write,
+    groups=SANDBOX_GROUPS,
+    keywords=SANDBOX_KEYWORDS,
 ))
@@ -2,6 +2,7 @@
 import os, sys, time, pathlib
 import pytest
 from dotenv import load_dotenv
+from prompt_toolkit.application import create_app_session
 
 # Make "src" importable (project root on PYTHONPATH)
 ROOT = pathlib.Path(__file__).resolve().parents[1]
@@ -10,6 +11,42 @@ load_dotenv()  # load HA_BASE_URL, HA_TOKEN from your .env at project root
 
 # Import after sys.path tweak
 from src.tools.homeassistant import ha_health, _ws_status  # type: ignore
+from src.core import registry
+from src.core.registry import ToolSpec, register_tool
+
+
+@pytest.fixture(autouse=True)
+def prompt_session():
+    """
+    A fresh prompt_toolkit session per test.
+
+    The default session binds its output to whatever sys.stdout is when
+    first used; under capsys that stream is closed once the test ends, and
+    a later patch_stdout would flush into it.
+    """
+    with create_app_session():
+        yield
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """A throwaway structured history log."""
+    return str(tmp_path / "history.jsonl")
+
+
+@pytest.fixture
+def temp_tool():
+    """Register throwaway tools and remove them afterwards."""
+    added = []
+
+    def add(name, runner=lambda: {}, **kwargs):
+        register_tool(ToolSpec(name=name, kind="function", description=name, runner=runner, **kwargs))
+        added.append(name)
+
+    yield add
+
+    for name in added:
+        registry.unregister_tool(name)
 
 
 @pytest.fixture(scope="session")
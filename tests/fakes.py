@@ -0,0 +1,159 @@
+# tests/fakes.py
+"""Offline stand-ins for the OpenAI Responses streaming client."""
+
+from __future__ import annotations
+
+import json
+import time
+from types import SimpleNamespace
+from typing import Any
+
+
+def text(value: str) -> dict:
+    return {"type": "message", "text": value}
+
+
+def call(name: str, args: dict | None = None, call_id: str | None = None) -> dict:
+    return {
+        "type": "function_call",
+        "name": name,
+        "arguments": json.dumps(args or {}),
+        "call_id": call_id or f"call_{name}",
+    }
+
+
+def _item(spec: dict, index: int) -> SimpleNamespace:
+    if spec["type"] == "function_call":
+        return SimpleNamespace(
+            type="function_call",
+            id=f"fc_{index}",
+            call_id=spec["call_id"],
+            name=spec["name"],
+            arguments=spec["arguments"],
+        )
+
+    return SimpleNamespace(type="message", id=f"msg_{index}")
+
+
+def events_for(items: list[dict], response_id: str) -> tuple[list[Any], Any]:
+    """Build the event sequence and final response for one scripted reply."""
+
+    events: list[Any] = []
+    output = []
+
+    for index, spec in enumerate(items):
+        item = _item(spec, index)
+        output.append(item)
+
+        if spec["type"] == "function_call":
+            pending = SimpleNamespace(**{**vars(item), "arguments": ""})
+            events.append(
+                SimpleNamespace(type="response.output_item.added", item=pending)
+            )
+            events.append(
+                SimpleNamespace(
+                    type="response.function_call_arguments.delta",
+                    item_id=item.id,
+                    delta=item.arguments,
+                )
+            )
+            events.append(
+                SimpleNamespace(type="response.output_item.done", item=item)
+            )
+        else:
+            for word in spec["text"].split(" "):
+                events.append(
+                    SimpleNamespace(
+                        type="response.output_text.delta",
+                        delta=word + " ",
+                    )
+                )
+
+    final = SimpleNamespace(
+        id=response_id,
+        output=output,
+        usage=SimpleNamespace(
+            input_tokens=10,
+            output_tokens=5,
+            total_tokens=15,
+            input_tokens_details=SimpleNamespace(cached_tokens=0),
+            output_tokens_details=SimpleNamespace(reasoning_tokens=0),
+        ),
+    )
+    return events, final
+
+
+class FakeStream:
+    def __init__(self, events: list[Any], final: Any):
+        self._events = events
+        self._final = final
+
+    def __enter__(self) -> "FakeStream":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def __iter__(self):
+        return iter(self._events)
+
+    def get_final_response(self) -> Any:
+        return self._final
+
+
+class FakeResponses:
+    def __init__(self, client: "FakeClient"):
+        self._client = client
+
+    def stream(self, **options: Any) -> FakeStream:
+        self._client.requests.append(options)
+        index = len(self._client.requests)
+        items = self._client.script.pop(0)
+        events, final = events_for(items, f"resp_{index}")
+
+        if self._client.delay:
+            time.sleep(self._client.delay)  # lets concurrent turns overlap
+
+        return FakeStream(events, final)
+
+
+class FakeClient:
+    """Replays a scripted list of responses, one per stream request."""
+
+    def __init__(self, script: list[list[dict]], delay: float = 0.0):
+        self.script = list(script)
+        self.requests: list[dict] = []
+        self.delay = delay
+        self.responses = FakeResponses(self)
+
+
+class FakeAsyncStream(FakeStream):
+    async def __aenter__(self) -> "FakeAsyncStream":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    async def __aiter__(self):
+        for event in self._events:
+            yield event
+
+    async def get_final_response(self) -> Any:
+        return self._final
+
+
+class FakeAsyncResponses(FakeResponses):
+    def stream(self, **options: Any) -> FakeAsyncStream:
+        self._client.requests.append(options)
+        index = len(self._client.requests)
+        items = self._client.script.pop(0)
+        events, final = events_for(items, f"resp_{index}")
+        return FakeAsyncStream(events, final)
+
+
+class FakeAsyncClient(FakeClient):
+    """AsyncOpenAI-shaped variant of FakeClient."""
+
+    def __init__(self, script: list[list[dict]]):
+        super().__init__(script)
+        self.responses = FakeAsyncResponses(self)
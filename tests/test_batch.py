@@ -0,0 +1,84 @@
+# tests/test_batch.py
+import json
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+from src.cli.batch import load_items, run_batch
+from src.core.runtime import run_once
+from tests.fakes import FakeClient, text
+
+
+def _write(path, rows):
+    path.write_text("\n".join(json.dumps(r) for r in rows) + "\n", encoding="utf-8")
+
+
+def test_load_items_accepts_repo_request_format(tmp_path):
+    src = tmp_path / "in.jsonl"
+    _write(src, ["plain", {"id": "a", "prompt": "p"}, {"request_id": "r1", "title": "T", "body": "B"}])
+
+    items = load_items(src)
+    assert [(i.id, i.prompt) for i in items] == [("1", "plain"), ("a", "p"), ("r1", "T\n\nB")]
+
+
+def test_batch_concurrency_failures_and_resume(tmp_path):
+    src = tmp_path / "in.jsonl"
+    out = tmp_path / "out.jsonl"
+    _write(src, [{"id": str(n), "prompt": f"p{n}"} for n in range(6)])
+
+    active, peak, calls = [0], [0], []
+    lock = threading.Lock()
+
+    def runner(*, prompt, **kwargs):
+        with lock:
+            calls.append(prompt)
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        if prompt == "p3":
+            raise RuntimeError("flaky")
+        return SimpleNamespace(text=f"answer {prompt}", response_id="r", tools_used=[])
+
+    failures = run_batch(
+        client=None, input_path=src, output_path=out, log_file="unused",
+        model="m", concurrency=3, runner=runner,
+    )
+
+    records = [json.loads(line) for line in out.read_text().splitlines()]
+    assert failures == 1
+    assert peak[0] == 3
+    assert len(records) == 6
+    assert {r["id"] for r in records if not r["ok"]} == {"3"}
+
+    # Resume only retries what did not succeed.
+    calls.clear()
+    failures = run_batch(
+        client=None, input_path=src, output_path=out, log_file="unused",
+        model="m", concurrency=3, runner=runner,
+    )
+    assert calls == ["p3"]
+    assert failures == 1
+
+
+def test_concurrent_turns_keep_progress_and_stdout(tmp_path, capsys):
+    src = tmp_path / "in.jsonl"
+    out = tmp_path / "out.jsonl"
+    _write(src, [{"id": str(n), "prompt": f"p{n}"} for n in range(8)])
+    stdout, stderr = sys.stdout, sys.stderr
+
+    failures = run_batch(
+        client=FakeClient([[text("done")]] * 8, delay=0.02),
+        input_path=src, output_path=out, log_file=str(tmp_path / "h.jsonl"),
+        model="m", concurrency=4,
+    )
+    print("after the batch")
+
+    assert failures == 0
+    assert (sys.stdout, sys.stderr) == (stdout, stderr)
+    captured = capsys.readouterr()
+    assert all(f"[batch] {n}/8 " in captured.err for n in range(1, 9))
+    assert "after the batch" in captured.out
+    assert [json.loads(line)["text"] for line in out.read_text().splitlines()] == ["done"] * 8
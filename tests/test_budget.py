@@ -0,0 +1,118 @@
+# tests/test_budget.py
+import asyncio
+import json
+import threading
+
+from src.core.budget import TurnBudget
+from src.core.runtime import run_turn, run_turn_async
+from src.core.turnlog import get_writer, read_records
+from tests.fakes import FakeAsyncClient, FakeClient, call, text
+
+
+def test_round_trip_limit_ends_with_final_answer(log_file, temp_tool):
+    seen = []
+    temp_tool("test_step", lambda n: seen.append(n) or {"n": n})
+
+    client = FakeClient(
+        [
+            [call("test_step", {"n": 1}, "c1")],
+            [call("test_step", {"n": 2}, "c2")],
+            [text("partial answer")],
+        ]
+    )
+    result = run_turn(
+        client=client,
+        user="go",
+        log_file=log_file,
+        emit_output=False,
+        budget=TurnBudget(max_round_trips=3, deadline_s=None),
+    )
+
+    assert seen == [1]
+    assert result.text.strip() == "partial answer"
+    assert "max_round_trips" in result.budget_exhausted
+
+    final = client.requests[-1]
+    assert final["tool_choice"] == "none"
+    assert json.loads(final["input"][0]["output"])["error"] == "not executed"
+    assert final["input"][-1]["role"] == "developer"
+
+    get_writer(log_file).flush()
+    record = read_records(log_file)[-1]
+    assert record["budget_exhausted"] == result.budget_exhausted
+    assert record["tool_calls"][-1]["skipped"] is True
+
+
+def test_identical_calls_reuse_previous_result(log_file, temp_tool):
+    runs = []
+    temp_tool("test_lookup", lambda q: runs.append(q) or {"answer": 42})
+
+    client = FakeClient(
+        [
+            [call("test_lookup", {"q": "x"}, "c1")],
+            [call("test_lookup", {"q": "x"}, "c2")],
+            [call("test_lookup", {"q": "x"}, "c3")],
+            [text("it is 42")],
+        ]
+    )
+    result = run_turn(
+        client=client,
+        user="ask",
+        log_file=log_file,
+        emit_output=False,
+        budget=TurnBudget(max_round_trips=None, deadline_s=None, repeat_limit=2),
+    )
+
+    assert runs == ["x"]
+    assert len(client.requests) == 4
+
+    repeat = json.loads(client.requests[2]["input"][0]["output"])
+    assert repeat["repeated_call"] is True
+    assert repeat["result"] == {"answer": 42}
+
+    assert "loop" in result.budget_exhausted
+    assert client.requests[3]["tool_choice"] == "none"
+
+
+def test_tool_deadline_returns_error_and_continues(log_file, temp_tool):
+    release = threading.Event()
+    temp_tool("test_hang", lambda: release.wait(5))
+
+    client = FakeClient([[call("test_hang", {}, "c1")], [text("gave up")]])
+
+    try:
+        result = run_turn(
+            client=client,
+            user="hang",
+            log_file=log_file,
+            emit_output=False,
+            budget=TurnBudget(tool_deadline_s=0.05),
+        )
+    finally:
+        release.set()
+
+    output = json.loads(client.requests[1]["input"][0]["output"])
+    assert output["error"] == "tool deadline exceeded"
+    assert result.text.strip() == "gave up"
+    assert result.budget_exhausted is None
+
+
+def test_async_tool_deadline(log_file, temp_tool):
+    async def slow():
+        await asyncio.sleep(5)
+
+    temp_tool("test_slow", slow)
+
+    client = FakeAsyncClient([[call("test_slow", {}, "c1")], [text("done")]])
+    result = asyncio.run(
+        run_turn_async(
+            client=client,
+            user="wait",
+            log_file=log_file,
+            budget=TurnBudget(tool_deadline_s=0.05),
+        )
+    )
+
+    output = json.loads(client.requests[1]["input"][0]["output"])
+    assert output["error"] == "tool deadline exceeded"
+    assert result.text.strip() == "done"
@@ -0,0 +1,91 @@
+# tests/test_cassette.py
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.core.cassette import (
+    Cassette,
+    CassetteMismatch,
+    RecordingClient,
+    ReplayAsyncClient,
+    ReplayClient,
+    replay_tools,
+)
+from src.core.runtime import run_turn, run_turn_async
+from tests.fakes import FakeClient, call, text
+
+
+@pytest.fixture
+def thermostat(temp_tool):
+    calls = []
+    temp_tool(
+        "test_thermostat",
+        lambda degrees: calls.append(degrees) or {"set": degrees},
+        parameters={"type": "object", "properties": {"degrees": {"type": "integer"}}},
+    )
+    return calls
+
+
+def test_recorded_turn_replays_without_api_or_tools(tmp_path, log_file, thermostat):
+    path = tmp_path / "turn.cassette.jsonl"
+    live = RecordingClient(
+        FakeClient([[call("test_thermostat", {"degrees": 21}, "t1")], [text("Set to 21.")]]),
+        path,
+    )
+    recorded = run_turn(client=live, user="make it 21", log_file=log_file, emit_output=False)
+
+    cassette = Cassette.load(path)
+    assert len(cassette.interactions) == 2
+    assert json.loads(cassette.tool_outputs()["test_thermostat"][0]) == {"set": 21}
+
+    replay = ReplayClient(cassette, speed=0)
+
+    with replay_tools(cassette):
+        replayed = run_turn(client=replay, user="make it 21", log_file=log_file, emit_output=False)
+
+    assert thermostat == [21]  # only the live run touched the device
+    assert replayed.text == recorded.text
+    assert replayed.tools_used == ["test_thermostat"]
+    assert replay.requests[1]["input"] == live._client.requests[1]["input"]
+
+
+def interaction(events, response_id="resp_1"):
+    return {
+        "request": {"input": "hi", "previous_response_id": None},
+        "events": [[offset, {"type": "response.output_text.delta", "delta": word}] for offset, word in events],
+        "final": {"id": response_id, "output": [{"type": "message", "id": "m"}], "usage": None},
+    }
+
+
+def test_replay_speed_follows_recorded_offsets(log_file):
+    cassette = Cassette([interaction([(0.0, "a "), (0.3, "b")])])
+
+    started = time.perf_counter()
+    result = run_turn(client=ReplayClient(cassette, speed=1), user="hi", log_file=log_file, emit_output=False)
+    paced = time.perf_counter() - started
+
+    assert result.text == "a b"
+    assert paced >= 0.3
+    assert result.metrics.ttft_s < 0.2
+
+    started = time.perf_counter()
+    run_turn(client=ReplayClient(cassette, speed=0), user="hi", log_file=log_file, emit_output=False)
+    assert time.perf_counter() - started < 0.3
+
+
+def test_strict_replay_rejects_unrecorded_requests(log_file):
+    client = ReplayClient(Cassette([interaction([(0.0, "x")])]), strict=True)
+
+    with pytest.raises(CassetteMismatch):
+        run_turn(client=client, user="something else", log_file=log_file, emit_output=False)
+
+
+def test_async_replay(log_file):
+    cassette = Cassette([interaction([(0.0, "async "), (0.01, "ok")])])
+    result = asyncio.run(
+        run_turn_async(client=ReplayAsyncClient(cassette), user="hi", log_file=log_file)
+    )
+
+    assert result.text == "async ok"
@@ -0,0 +1,115 @@
+# tests/test_daemon.py
+import socket
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.cli import daemon
+from tests.fakes import FakeClient, text
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+@pytest.fixture
+def short_dir():
+    # AF_UNIX paths are limited to ~100 bytes; pytest's tmp_path can exceed it.
+    with tempfile.TemporaryDirectory(dir="/tmp") as path:
+        yield Path(path)
+
+
+@pytest.fixture
+def running(short_dir):
+    client = FakeClient([])
+    server = daemon.NeuroDaemon(
+        short_dir / "neuro.sock",
+        client=client,
+        log_file=str(short_dir / "history.jsonl"),
+        default_model="test-model",
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server, client
+
+    server.shutdown()
+    server.server_close()
+    thread.join(timeout=5)
+
+
+def test_streams_answer_through_socket(running):
+    server, client = running
+    client.script.append([text("hello from the daemon")])
+    seen = []
+
+    answer = daemon.ask(
+        prompt="hi",
+        model="",
+        command_mode=False,
+        use_cache=False,
+        context=None,
+        on_text=seen.append,
+        path=server.path,
+    )
+
+    assert answer == "hello from the daemon"
+    assert seen and seen[-1].strip() == answer
+    assert client.requests[0]["model"] == "test-model"
+
+    status = daemon.request({"op": "ping"}, path=server.path)
+    assert status["served"] == 1
+
+
+def test_concurrent_silent_asks_leave_stdout_alone(running):
+    server, client = running
+    client.script += [[text("ls -la")]] * 6
+    client.delay = 0.02
+    stdout, stderr = sys.stdout, sys.stderr
+    answers = []
+
+    def ask():
+        answers.append(
+            daemon.ask(
+                prompt="list files", model="m", command_mode=True,
+                use_cache=False, context=None, path=server.path,
+            )
+        )
+
+    threads = [threading.Thread(target=ask) for _ in range(6)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join(5)
+
+    assert answers == ["ls -la"] * 6
+    assert (sys.stdout, sys.stderr) == (stdout, stderr)
+
+
+def test_errors_come_back_as_events(running):
+    server, _ = running  # empty script: the fake client raises
+
+    with pytest.raises(RuntimeError):
+        daemon.ask(prompt="hi", model="m", command_mode=False, use_cache=False, context=None, path=server.path)
+
+
+def test_missing_or_stale_socket_is_unavailable(short_dir):
+    path = short_dir / "neuro.sock"
+
+    with pytest.raises(daemon.DaemonUnavailable):
+        daemon.request({"op": "ping"}, path=path)
+
+    # A socket file nobody listens on (e.g. after a crash).
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+
+    with pytest.raises(daemon.DaemonUnavailable):
+        daemon.request({"op": "ping"}, path=path)
+
+    server = daemon.NeuroDaemon(path, client=None, log_file="", default_model="m")
+    server.server_close()
+    assert not path.exists()
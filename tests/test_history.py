@@ -0,0 +1,71 @@
+# tests/test_history.py
+import json
+
+from src.core.history import HistoryStore, history_db_path
+from src.core.runtime import run_turn
+from src.core.turnlog import get_writer
+from tests.fakes import FakeClient, text
+
+
+def _record(user, reply, tools=()):
+    return {
+        "ts": "2026-01-01T00:00:00+00:00",
+        "model": "m",
+        "response_id": "r",
+        "user": user,
+        "text": reply,
+        "tool_calls": [{"name": t} for t in tools],
+    }
+
+
+def test_search_ranks_and_snippets(tmp_path):
+    store = HistoryStore(tmp_path / "h.db")
+    store.add(_record("what is the boiler pressure", "The boiler pressure is 1.4 bar.", ["ha_get_state"]))
+    store.add(_record("tell me a joke", "Why did the boiler break up with the kettle?"))
+    store.add(_record("weather tomorrow", "Sunny."))
+
+    results = store.search("boiler pressure")
+    assert [r["user"] for r in results][:1] == ["what is the [boiler] [pressure]"]
+    assert results[0]["tools"] == "ha_get_state"
+
+    # No turn has both words; fall back to any-term matches.
+    assert {r["id"] for r in store.search("kettle sunny")} == {2, 3}
+    # FTS syntax in user input is treated as plain words.
+    assert store.search('boiler" OR (') != []
+    assert store.search("???") == []
+
+
+def test_turns_are_indexed_alongside_the_log(tmp_path):
+    log_file = tmp_path / "history.jsonl"
+    client = FakeClient([[text("The garage door is closed.")]])
+    run_turn(client=client, user="is the garage open?", log_file=str(log_file), emit_output=False)
+    get_writer(log_file).flush()
+
+    store = HistoryStore(history_db_path(log_file))
+    (hit,) = store.search("garage")
+    assert "[garage]" in hit["snippet"]
+
+
+def test_history_search_tool(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEURO_HISTORY_DB", str(tmp_path / "tool.db"))
+    from src.core.runtime import _run_registered_tool
+    from src.core.history import open_store
+    from src.core.turnlog import default_log_file
+
+    open_store(default_log_file()).add(_record("remind me about the dentist", "Dentist is on Friday."))
+    out = json.loads(
+        _run_registered_tool({"name": "history_search", "kind": "function_call"}, '{"query": "dentist", "k": 3}')
+    )
+    assert out["results"][0]["snippet"].startswith("[Dentist]")
+
+
+def test_history_search_reads_the_active_log(log_file, monkeypatch):
+    monkeypatch.delenv("NEURO_HISTORY_DB", raising=False)
+    from src.core.runtime import _run_registered_tool
+
+    client = FakeClient([[text("The plumber comes on Tuesday.")]])
+    run_turn(client=client, user="when is the plumber coming?", log_file=log_file, emit_output=False)
+    get_writer(log_file).flush()
+
+    out = json.loads(_run_registered_tool({"name": "history_search", "kind": "function_call"}, '{"query": "plumber"}'))
+    assert "[plumber]" in out["results"][0]["you"]
@@ -0,0 +1,116 @@
+# tests/test_jobs.py
+import threading
+
+import pytest
+
+from src.cli.commands import command_handler_factory
+from src.core.jobs import JobManager, parse_background
+from src.core.runtime import run_repl
+from tests.fakes import FakeClient, call, text
+
+
+@pytest.fixture
+def gate(temp_tool):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_probe():
+        started.set()
+        release.wait(5)
+        return {"ok": True}
+
+    temp_tool("test_slow_probe", slow_probe)
+    yield started, release
+    release.set()
+
+
+def test_background_turn_keeps_prompt_free(tmp_path, capsys, gate):
+    started, release = gate
+    log_file = str(tmp_path / "history.jsonl")
+    client = FakeClient(
+        [
+            [call("test_slow_probe", {}, "a")],  # job 1, first round trip
+            [text("foreground answer")],
+            [text("job answer")],  # job 1, after its tool
+            [text("follow up answer")],
+        ]
+    )
+
+    def after_tool_started():
+        assert started.wait(5)
+        return "hello"
+
+    def after_release():
+        release.set()
+        return ":fg 1"
+
+    steps = iter([lambda: "probe the network &", after_tool_started, lambda: ":jobs", after_release, lambda: "and then?"])
+
+    def input_fn(_prompt):
+        try:
+            return next(steps)()
+        except StopIteration:
+            raise EOFError
+
+    run_repl(
+        client=client,
+        log_file=log_file,
+        input_fn=input_fn,
+        command_handler=command_handler_factory(lambda: {"model": "m", "log_file": log_file}),
+    )
+
+    out = capsys.readouterr()
+    assert "[job 1] running in the background" in out.out
+    assert "job answer" in out.out
+    assert "running" in out.err  # :jobs while the tool was still busy
+    # The job forked the empty thread; :fg continued the REPL from its answer.
+    assert client.requests[0]["previous_response_id"] is None
+    assert client.requests[1]["previous_response_id"] is None
+    assert client.requests[3]["previous_response_id"] == "resp_3"
+
+
+def test_finished_jobs_are_reported_once():
+    jobs = JobManager()
+    ok = jobs.start("fine", lambda callback: callback("partial") or None)
+    bad = jobs.start("broken", lambda callback: 1 / 0)
+    ok.wait()
+    bad.wait()
+
+    assert {job.id: job.status for job in jobs.take_finished()} == {1: "done", 2: "failed"}
+    assert ok.text == "partial"
+    assert isinstance(bad.error, ZeroDivisionError)
+    assert jobs.take_finished() == []
+
+
+def test_exit_waits_for_running_jobs(tmp_path, capsys, gate):
+    started, release = gate
+    log_file = str(tmp_path / "history.jsonl")
+    client = FakeClient([[call("test_slow_probe", {}, "a")], [text("job answer")]])
+    steps = iter(["probe the network &", ":quit"])
+
+    def input_fn(_prompt):
+        line = next(steps)
+
+        if line == ":quit":
+            assert started.wait(5)
+            threading.Timer(0.2, release.set).start()
+
+        return line
+
+    run_repl(
+        client=client,
+        log_file=log_file,
+        input_fn=input_fn,
+        command_handler=command_handler_factory(lambda: {"model": "m", "log_file": log_file}),
+    )
+
+    out = capsys.readouterr().out
+    assert "Waiting up to" in out and "Abandoning" not in out
+    assert len(client.requests) == 2  # the job finished its turn before exit
+
+
+@pytest.mark.parametrize(
+    "line, prompt",
+    [("check logs &", "check logs"), ("make && make test", None), ("a & b", None), ("&", None)],
+)
+def test_parse_background(line, prompt):
+    assert parse_background(line) == prompt
@@ -0,0 +1,74 @@
+# tests/test_latency.py
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from benchmarks.fake_responses import FakeResponsesServer, Timing
+from benchmarks.latency import BASELINE_PATH, BENCH_TOOL, SCENARIOS, Bench, bench_tool, compare, run
+
+
+def test_fake_server_drives_sdk_turns():
+    with Bench() as bench, bench_tool():
+        plain = bench.turn("hello [words=12]")
+        chain = bench.turn(f"probe [tool={BENCH_TOOL}] [calls=2] [words=5]")
+
+        assert len(plain.text.split()) == 12
+        assert chain.tools_used == [BENCH_TOOL, BENCH_TOOL]
+        assert len(chain.text.split()) == 5
+        assert chain.metrics.round_trips == 2
+        assert bench.server.requests == 3
+
+
+def test_fake_server_applies_timing():
+    with Bench(Timing(ttft_s=0.15)) as bench:
+        result = bench.turn("hi [words=3]")
+
+    assert result.metrics.ttft_s >= 0.15
+
+
+def test_fake_server_only_serves_streamed_responses():
+    with FakeResponsesServer() as server:
+        request = urllib.request.Request(
+            f"{server.base_url}/responses",
+            data=json.dumps({"input": "hi"}).encode(),
+            method="POST",
+        )
+
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(request, timeout=5)
+
+    assert error.value.code == 404
+
+
+def test_run_reports_the_median_of_repeats(monkeypatch):
+    samples = iter([5.0, 1.0, 3.0])
+    monkeypatch.setitem(SCENARIOS, "probe", lambda runs: {"probe.median_ms": next(samples)})
+
+    assert run(["probe"], runs=1, repeat=3) == {"probe.median_ms": 3.0}
+
+
+def test_compare_flags_slower_and_lower_throughput():
+    baseline = {"turn.median_ms": 20.0, "events.runtime_overhead_us": 30.0, "concurrency.8_sessions_turns_per_s": 30.0}
+
+    assert compare({"turn.median_ms": 31.0, "events.runtime_overhead_us": 60.0}, baseline, 0.5) == []
+
+    regressions = compare(
+        {"turn.median_ms": 36.0, "events.runtime_overhead_us": 196.0, "concurrency.8_sessions_turns_per_s": 14.0},
+        baseline,
+        0.5,
+    )
+    assert [line.split(":")[0] for line in regressions] == [
+        "turn.median_ms",
+        "events.runtime_overhead_us",
+        "concurrency.8_sessions_turns_per_s",
+    ]
+
+
+@pytest.mark.benchmark
+def test_latency_within_baseline():
+    baseline = json.loads(BASELINE_PATH.read_text())["results"]
+    results = run(["turn", "events", "tool_chain", "concurrency"], runs=10, repeat=3)
+    regressions = compare(results, baseline, 0.5)
+    assert not regressions, regressions
@@ -0,0 +1,135 @@
+# tests/test_mapreduce.py
+import io
+import re
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+from src.cli.mapreduce import iter_chunks, map_reduce
+from src.core.runtime import run_once
+from tests.fakes import FakeClient, text
+
+
+def test_chunks_respect_line_boundaries():
+    lines = [f"line {n:03d}\n" for n in range(1, 31)]  # 9 chars each
+    chunks = list(iter_chunks(iter(lines), max_chars=40))
+
+    assert "".join(c.text for c in chunks) == "".join(lines)
+    assert all(len(c.text) <= 40 for c in chunks)
+    assert (chunks[0].first_line, chunks[0].last_line) == (1, 4)
+    assert (chunks[1].first_line, chunks[-1].last_line) == (5, 30)
+
+
+def test_oversized_line_is_split_at_whitespace():
+    long_line = " ".join(["word"] * 50) + "\n"
+    chunks = list(iter_chunks(["head\n", long_line], max_chars=60))
+
+    assert "".join(c.text for c in chunks) == "head\n" + long_line
+    assert all(len(c.text) <= 60 for c in chunks)
+    assert chunks[-1].last_line == 2
+
+
+def test_map_reduce_runs_chunks_concurrently_and_reduces():
+    lines = [f"{'ERROR' if n % 10 == 0 else 'ok'} event {n}\n" for n in range(200)]
+    active, peak, prompts = [0], [0], []
+    lock = threading.Lock()
+    logged = []
+
+    def runner(*, prompt, log_file, stream_callback=None, tool_mode, **kwargs):
+        assert tool_mode == "none"
+        with lock:
+            prompts.append(prompt)
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+
+        if log_file:
+            logged.append(prompt)
+            return SimpleNamespace(text=f"total errors: {prompt.count('ERROR')}")
+
+        part = prompt.split("--- part ", 1)[1]
+        errors = re.findall(r"ERROR event \d+", part)
+        return SimpleNamespace(text="; ".join(errors) or "NONE")
+
+    progress = io.StringIO()
+    result = map_reduce(
+        client=None,
+        instruction="list errors",
+        lines=iter(lines),
+        log_file="history.jsonl",
+        model="m",
+        concurrency=3,
+        chunk_tokens=250,  # 1000 chars per chunk
+        runner=runner,
+        progress=progress,
+    )
+
+    assert result.chunks == 3
+    assert 1 < peak[0] <= 3
+    assert len(logged) == 1  # only the final reduce goes to history
+    assert result.text == "total errors: 20"
+    assert "[map-reduce] mapped" in progress.getvalue()
+
+
+def test_map_reduce_records_failed_parts(tmp_path):
+    def runner(*, prompt, log_file, **kwargs):
+        if "part 2 " in prompt and not log_file:
+            raise RuntimeError("boom")
+        return SimpleNamespace(text="summary" if log_file else "note")
+
+    lines = [("x" * 99) + "\n" for _ in range(30)]
+    result = map_reduce(
+        client=None,
+        instruction="summarize",
+        lines=lines,
+        log_file=str(tmp_path / "h.jsonl"),
+        model="m",
+        chunk_tokens=250,
+        runner=runner,
+        progress=None,
+    )
+
+    assert result.failed == [1]
+    assert result.text == "summary"
+
+
+def test_map_calls_send_no_tools(tmp_path):
+    client = FakeClient([[text("NONE")], [text("nothing found")]])
+    result = map_reduce(
+        client=client,
+        instruction="find secrets",
+        lines=["harmless\n"],
+        log_file=str(tmp_path / "h.jsonl"),
+        model="m",
+        runner=run_once,
+        progress=None,
+    )
+
+    assert result.relevant == 0
+    assert result.text == "nothing found"
+    assert all("tools" not in request for request in client.requests)
+
+
+def test_concurrent_map_turns_leave_stdout_alone(tmp_path, capsys):
+    stdout, stderr = sys.stdout, sys.stderr
+    client = FakeClient([[text("note")]] * 12 + [[text("final answer")]], delay=0.02)
+
+    result = map_reduce(
+        client=client,
+        instruction="summarize",
+        lines=[("x" * 99) + "\n" for _ in range(120)],
+        log_file=str(tmp_path / "h.jsonl"),
+        model="m",
+        concurrency=4,
+        chunk_tokens=250,
+        runner=run_once,
+        progress=None,
+    )
+    print(result.text)
+
+    assert result.chunks == 12
+    assert (sys.stdout, sys.stderr) == (stdout, stderr)
+    assert "final answer" in capsys.readouterr().out
@@ -0,0 +1,109 @@
+# tests/test_model_router.py
+import asyncio
+from types import SimpleNamespace
+
+from src.core.model_router import FAST_MODEL, HEAVY_MODEL, ModelRouter, model_router
+from src.core.runtime import run_turn, run_turn_async
+from src.core.stats import session_stats
+from src.core.turnlog import get_writer, read_records
+from tests.fakes import FakeAsyncClient, FakeClient, call, text
+
+
+def test_classify_short_prompts_fast_and_complex_ones_heavy():
+    router = ModelRouter(fast_model="small", heavy_model="big", fast_max_words=10)
+
+    assert router.classify("what time is it in Tokyo").tier == "fast"
+    assert router.classify("list files by size", command_mode=True).tier == "fast"
+    assert router.classify("explain how TCP slow start works").tier == "heavy"
+    assert router.classify(" ".join(["word"] * 11)).reason.startswith("long prompt")
+    assert router.classify("fix this\n```\nx = 1\n```").tier == "heavy"
+
+
+def test_check_flags_answers_worth_redoing():
+    router = ModelRouter()
+
+    def result(value, **kwargs):
+        return SimpleNamespace(text=value, budget_exhausted=None, tool_output_preview="", **kwargs)
+
+    assert router.check(result("Paris")) is None
+    assert router.check(result("  ")) == "empty answer"
+    assert router.check(result("I'm not sure, sorry.")) == "answer sounds unsure"
+    assert router.check(result("ls -S"), command_mode=True) is None
+    assert router.check(result("```bash\nls -S\n```"), command_mode=True) == "not a bare shell command"
+
+
+def test_auto_routes_to_fast_model_and_logs_route(log_file):
+    client = FakeClient([[text("Paris")]])
+    result = run_turn(client=client, user="capital of France?", model="auto", log_file=log_file, emit_output=False)
+
+    assert result.text.strip() == "Paris"
+    assert [r["model"] for r in client.requests] == [FAST_MODEL]
+
+    get_writer(log_file).flush()
+    record = read_records(log_file)[-1]
+    assert record["model"] == FAST_MODEL
+    assert record["route"]["tier"] == "fast"
+
+
+def test_auto_escalates_failed_fast_answer(log_file):
+    before = model_router.stats().get("escalated", 0)
+    session_stats.clear()
+    seen = []
+    client = FakeClient([[text("I don't know.")], [text("Canberra")]])
+    result = run_turn(
+        client=client, user="capital of Australia?", model="auto", log_file=log_file,
+        emit_output=False, stream_callback=seen.append,
+    )
+
+    assert result.text.strip() == "Canberra"
+    assert [r["model"] for r in client.requests] == [FAST_MODEL, HEAVY_MODEL]
+    assert model_router.stats()["escalated"] == before + 1
+
+    # One turn in the history; the redone fast attempt is routing metadata.
+    get_writer(log_file).flush()
+    records = read_records(log_file)
+    assert [r["model"] for r in records] == [HEAVY_MODEL]
+    assert records[0]["route"]["escalated"] == "answer sounds unsure"
+    assert records[0]["route"]["discarded"]["model"] == FAST_MODEL
+    assert records[0]["route"]["discarded"]["response_id"] == "resp_1"
+
+    # The fast attempt was buffered, never shown; its latency still counts.
+    assert not any("know" in chunk for chunk in seen)
+    assert len(session_stats) == 1
+    assert session_stats.discarded(FAST_MODEL) == 1
+    assert len(session_stats.turns(FAST_MODEL)) == 1
+
+
+def test_kept_fast_answer_is_replayed_and_respects_defer_log(log_file):
+    seen = []
+    client = FakeClient([[text("Paris")]])
+    result = run_turn(
+        client=client, user="capital of France?", model="auto", log_file=log_file,
+        emit_output=False, stream_callback=seen.append, defer_log=True,
+    )
+
+    assert seen == [result.text]
+    get_writer(log_file).flush()
+    assert read_records(log_file) == []
+
+    result.commit()
+    get_writer(log_file).flush()
+    assert [r["model"] for r in read_records(log_file)] == [FAST_MODEL]
+
+
+def test_auto_never_redoes_side_effecting_tools(log_file, temp_tool):
+    runs = []
+    temp_tool("test_switch", lambda: runs.append(1) or {"ok": True})
+
+    client = FakeClient([[call("test_switch")], [text("")]])
+    run_turn(client=client, user="flip it", model="auto", log_file=log_file, emit_output=False)
+
+    assert runs == [1]
+    assert len(client.requests) == 2
+
+
+def test_auto_routes_async_turns(log_file):
+    client = FakeAsyncClient([[text("why: because")]])
+    asyncio.run(run_turn_async(client=client, user="why is the sky blue?", model="auto", log_file=log_file))
+
+    assert [r["model"] for r in client.requests] == [HEAVY_MODEL]
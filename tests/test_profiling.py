@@ -0,0 +1,52 @@
+# tests/test_profiling.py
+import pstats
+
+from src.cli.commands import command_handler_factory
+from src.core.profiling import TurnProfiler, profile_dir
+from src.core.runtime import run_repl
+from tests.fakes import FakeClient, text
+
+
+def scripted(lines):
+    pending = iter(lines)
+
+    def input_fn(_prompt):
+        try:
+            return next(pending)
+        except StopIteration:
+            raise EOFError
+
+    return input_fn
+
+
+def test_profile_command_reports_each_turn(tmp_path, capsys):
+    log_file = str(tmp_path / "history.jsonl")
+    handler = command_handler_factory(lambda: {"model": "m", "log_file": log_file})
+    client = FakeClient([[text("first")], [text("second")], [text("third")]])
+
+    run_repl(
+        client=client,
+        log_file=log_file,
+        input_fn=scripted(["one", ":profile on", "two", ":profile off", "three"]),
+        command_handler=handler,
+    )
+
+    reports = sorted(profile_dir(log_file).glob("*.prof"))
+    assert len(reports) == 1  # only the turn asked while profiling was on
+
+    stats = pstats.Stats(str(reports[0]))
+    assert any(name == "run_turn" for _, _, name in stats.stats)
+    assert "Top allocations" in reports[0].with_suffix(".txt").read_text()
+    assert "profile" in capsys.readouterr().err
+
+
+def test_profiler_measures_allocations(tmp_path):
+    with TurnProfiler(tmp_path, label="probe") as profiler:
+        blob = [bytearray(1024) for _ in range(2048)]
+
+    profile = profiler.profile
+    assert profile.retained_bytes >= 2 * 1024 * 1024
+    assert profile.peak_bytes >= profile.retained_bytes
+    assert any("test_profiling.py" in site for site, _, _ in profile.allocations)
+    assert profile.stats_path.name.endswith("-probe.prof")
+    assert len(blob) == 2048
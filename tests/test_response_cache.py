@@ -0,0 +1,50 @@
+# tests/test_response_cache.py
+import time
+
+from src.core.response_cache import ResponseCache, cache_key, get_cache, replayable
+
+
+def test_key_covers_prompt_model_and_context():
+    base = dict(prompt="list files", model="m", context="Shell: zsh\nCurrent directory: /a")
+    assert cache_key(**base) == cache_key(**dict(base))
+    assert cache_key(**base) != cache_key(**{**base, "model": "other"})
+    assert cache_key(**base) != cache_key(**{**base, "context": "Shell: zsh\nCurrent directory: /b"})
+
+
+def test_ttl_expiry(tmp_path):
+    cache = ResponseCache(tmp_path / "c.db", ttl=0.05)
+    cache.put("k", "ls -la")
+    assert cache.get("k") == "ls -la"
+    time.sleep(0.06)
+    assert cache.get("k") is None
+
+
+def test_size_bounded_lru(tmp_path):
+    cache = ResponseCache(tmp_path / "c.db", max_bytes=30)
+    cache.put("a", "x" * 10)
+    cache.put("b", "y" * 10)
+    time.sleep(0.01)
+    assert cache.get("a")  # touch a so b is least recently used
+    cache.put("c", "z" * 15)
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+
+
+def test_shared_between_instances(tmp_path):
+    ResponseCache(tmp_path / "c.db").put("k", "pwd")
+    assert ResponseCache(tmp_path / "c.db").get("k") == "pwd"
+
+
+def test_get_cache_reuses_one_instance_per_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEURO_COMMAND_CACHE", str(tmp_path / "c.db"))
+
+    assert get_cache() is get_cache(tmp_path / "c.db")
+    assert get_cache(tmp_path / "other.db") is not get_cache()
+
+
+def test_only_idempotent_tool_answers_are_replayable():
+    assert replayable([])
+    assert replayable(["ha_get_state"])
+    assert not replayable(["code_exec"])
+    assert not replayable(["unknown_tool"])
@@ -0,0 +1,101 @@
+# tests/test_router.py
+import threading
+
+from src.core.router import ToolRouter
+from src.core.runtime import run_turn
+from src.core.turnlog import get_writer, read_records
+from tests.fakes import FakeClient, text
+
+
+def _names(tools):
+    return {tool.get("name", tool["type"]) for tool in tools}
+
+
+def test_groups_follow_keywords_and_mode(temp_tool):
+    temp_tool("test_garden_water", groups={"garden"}, keywords=("sprinkler", "water"))
+    router = ToolRouter()
+
+    plain = router.select("what's 2+2?")
+    assert "test_garden_water" not in plain.names
+    assert "web_search" in plain.names
+    assert plain.saved_bytes > 0
+
+    garden = router.select("Water the lawn", mode="command")
+    assert "test_garden_water" in garden.names
+    assert "web_search" not in garden.names
+    assert garden.matched == {"garden"}
+
+    sticky = router.select("and tomorrow?", sticky={"garden"})
+    assert "test_garden_water" in sticky.names
+    assert sticky.matched == frozenset()
+
+    assert "test_garden_water" in router.select("anything", mode="all").names
+
+
+def test_payload_is_frozen_until_registry_changes(temp_tool):
+    router = ToolRouter()
+    first = router.select("hello")
+    assert router.select("hi again").tools is first.tools
+
+    temp_tool("test_always_on")
+    rebuilt = router.select("hello")
+    assert rebuilt.tools is not first.tools
+    assert "test_always_on" in rebuilt.names
+
+
+def test_short_keywords_match_whole_words(temp_tool):
+    temp_tool("test_exec", groups={"sandbox"}, keywords=("run ", "sum ", "python"))
+    router = ToolRouter()
+
+    assert router.match("run this and sum these") == {"sandbox"}
+    assert router.match("python runtime") == {"sandbox"}
+    assert router.match("summarize the running total") == frozenset()
+
+
+def test_concurrent_selects_survive_registry_changes(temp_tool):
+    router = ToolRouter()
+    stop = threading.Event()
+    errors = []
+
+    def select_loop():
+        while not stop.is_set():
+            try:
+                router.select("water the garden", mode="all")
+            except Exception as error:
+                errors.append(error)
+                return
+
+    threads = [threading.Thread(target=select_loop) for _ in range(6)]
+
+    for thread in threads:
+        thread.start()
+
+    for n in range(40):
+        temp_tool(f"test_race_{n}", groups={"garden"}, keywords=("garden",))
+
+    stop.set()
+
+    for thread in threads:
+        thread.join(5)
+
+    assert errors == []
+    names = router.select("water the garden").names
+    assert all(f"test_race_{n}" in names for n in range(40))
+
+
+def test_turn_sends_routed_tools_and_logs_savings(log_file, temp_tool):
+    temp_tool("test_garden_water", groups={"garden"}, keywords=("sprinkler",))
+    client = FakeClient([[text("four")], [text("done")]])
+
+    result = run_turn(client=client, user="what's 2+2?", log_file=log_file, emit_output=False)
+    assert "test_garden_water" not in _names(client.requests[0]["tools"])
+    assert result.tool_groups == frozenset()
+
+    result = run_turn(client=client, user="start the sprinkler", log_file=log_file, emit_output=False)
+    assert "test_garden_water" in _names(client.requests[1]["tools"])
+    assert result.tool_groups == {"garden"}
+
+    get_writer(log_file).flush()
+    first, second = read_records(log_file)[-2:]
+    assert first["tool_payload"]["saved_bytes"] > second["tool_payload"]["saved_bytes"]
+    assert second["tool_payload"]["groups"] == ["garden"]
@@ -0,0 +1,211 @@
+# tests/test_runtime.py
+import asyncio
+import json
+import threading
+import time
+
+from src.core import registry
+from src.core.registry import ToolSpec, register_tool
+from src.core.turnlog import get_writer, read_records
+from src.core.runtime import run_once_async, run_turn, run_turn_async
+from tests.fakes import FakeAsyncClient, FakeClient, FakeStream, call, text
+
+
+def test_plain_text_turn(log_file):
+    client = FakeClient([[text("hello there")]])
+    result = run_turn(client=client, user="hi", log_file=log_file, emit_output=False)
+
+    assert result.text.strip() == "hello there"
+    assert result.response_id == "resp_1"
+    assert result.tool_used is None
+    assert len(client.requests) == 1
+
+
+def test_parallel_calls_share_one_round_trip(log_file, temp_tool):
+    barrier = threading.Barrier(3, timeout=5)
+
+    def light(entity_id):
+        # Every call must be in flight at once to get past the barrier.
+        barrier.wait()
+        return {"entity_id": entity_id, "state": "on"}
+
+    temp_tool("test_light", light)
+
+    client = FakeClient(
+        [
+            [
+                call("test_light", {"entity_id": "light.a"}, "c1"),
+                call("test_light", {"entity_id": "light.b"}, "c2"),
+                call("test_light", {"entity_id": "light.c"}, "c3"),
+            ],
+            [text("all on")],
+        ]
+    )
+    result = run_turn(client=client, user="check lights", log_file=log_file, emit_output=False)
+
+    assert len(client.requests) == 2
+    assert client.requests[0]["parallel_tool_calls"] is True
+
+    follow_up = client.requests[1]["input"]
+    assert [item["call_id"] for item in follow_up] == ["c1", "c2", "c3"]
+    assert json.loads(follow_up[1]["output"])["entity_id"] == "light.b"
+    assert result.tools_used == ["test_light"] * 3
+
+
+def test_sequential_mode_runs_calls_one_at_a_time(log_file, temp_tool):
+    active = []
+    peak = []
+
+    def slow(n):
+        active.append(n)
+        peak.append(len(active))
+        time.sleep(0.01)
+        active.remove(n)
+        return {"n": n}
+
+    temp_tool("test_slow", slow)
+
+    client = FakeClient(
+        [
+            [call("test_slow", {"n": 1}, "c1"), call("test_slow", {"n": 2}, "c2")],
+            [text("done")],
+        ]
+    )
+    run_turn(
+        client=client,
+        user="go",
+        log_file=log_file,
+        emit_output=False,
+        parallel_tool_calls=False,
+    )
+
+    assert client.requests[0]["parallel_tool_calls"] is False
+    assert max(peak) == 1
+    assert len(client.requests[1]["input"]) == 2
+
+
+def test_async_turn_awaits_coroutine_tools_and_runs_sync_tools(log_file, temp_tool):
+    seen = []
+
+    async def async_tool(x):
+        await asyncio.sleep(0)
+        seen.append(("async", threading.current_thread() is threading.main_thread()))
+        return {"x": x}
+
+    def sync_tool(y):
+        seen.append(("sync", threading.current_thread() is threading.main_thread()))
+        return {"y": y}
+
+    temp_tool("test_async_tool", async_tool)
+    temp_tool("test_sync_tool", sync_tool)
+
+    client = FakeAsyncClient(
+        [
+            [call("test_async_tool", {"x": 1}, "a1"), call("test_sync_tool", {"y": 2}, "s1")],
+            [text("finished")],
+        ]
+    )
+    chunks = []
+
+    async def on_text(value):
+        chunks.append(value)
+
+    result = asyncio.run(
+        run_turn_async(
+            client=client,
+            user="go",
+            log_file=log_file,
+            stream_callback=on_text,
+        )
+    )
+
+    assert result.text.strip() == "finished"
+    assert result.tools_used == ["test_async_tool", "test_sync_tool"]
+    # Coroutine tools stay on the loop thread; blocking tools use the executor.
+    assert ("async", True) in seen
+    assert ("sync", False) in seen
+    assert chunks[-1].strip() == "finished"
+    get_writer(log_file).flush()
+    assert read_records(log_file)[-1]["text"].strip() == "finished"
+
+
+def test_async_turns_run_concurrently(log_file):
+    async def main():
+        clients = [FakeAsyncClient([[text(f"reply {n}")]]) for n in range(20)]
+        return await asyncio.gather(
+            *(
+                run_once_async(client=client, prompt="hi", log_file=log_file)
+                for client in clients
+            )
+        )
+
+    results = asyncio.run(main())
+    assert sorted(r.text.strip() for r in results) == sorted(f"reply {n}" for n in range(20))
+
+
+def test_tool_starts_before_stream_finishes(log_file, temp_tool):
+    started = threading.Event()
+
+    def slow_probe():
+        started.set()
+        return {"ok": True}
+
+    temp_tool("test_probe", slow_probe)
+
+    class TrailingStream(FakeStream):
+        def __iter__(self):
+            yield from self._events
+            # The model is still "streaming"; the tool should already be running.
+            self.started_during_stream = started.wait(timeout=2)
+
+    client = FakeClient([[call("test_probe", {}, "p1"), text("trailing words")], [text("ok")]])
+    streams = []
+    original = client.responses.stream
+
+    def stream(**options):
+        fake = original(**options)
+        wrapped = TrailingStream(fake._events, fake._final)
+        streams.append(wrapped)
+        return wrapped
+
+    client.responses.stream = stream
+    run_turn(client=client, user="probe", log_file=log_file, emit_output=False)
+
+    assert streams[0].started_during_stream
+    assert json.loads(client.requests[1]["input"][0]["output"]) == {"ok": True}
+
+
+def test_every_round_trip_sends_mode_instructions_and_cache_key(log_file, temp_tool):
+    from src.core.prompts import COMMAND_INSTRUCTIONS, NORMAL_INSTRUCTIONS
+
+    temp_tool("test_lookup", lambda: {"ok": True})
+    client = FakeClient([[call("test_lookup")], [text("done")]])
+    run_turn(client=client, user="hi", log_file=log_file, emit_output=False)
+
+    assert [r["instructions"] for r in client.requests] == [NORMAL_INSTRUCTIONS] * 2
+    assert {r["prompt_cache_key"] for r in client.requests} == {"neuro-chat"}
+    # The cacheable prefix leads every request.
+    assert list(client.requests[0])[:2] == ["model", "instructions"]
+
+    client = FakeClient([[text("ls -S")]])
+    run_turn(client=client, user="biggest files", log_file=log_file, emit_output=False, tool_mode="command", prompt_cache_key="neuro-command-s1")
+
+    assert client.requests[0]["instructions"] == COMMAND_INSTRUCTIONS
+    assert client.requests[0]["prompt_cache_key"] == "neuro-command-s1"
+
+
+def test_tool_payload_is_byte_stable_across_registration_order():
+    from src.core.registry import as_openai_tools
+
+    schema = {"type": "object", "properties": {"b": {"type": "string"}, "a": {"type": "string"}}}
+    reordered = {"properties": {"a": {"type": "string"}, "b": {"type": "string"}}, "type": "object"}
+    payloads = []
+
+    for first, second in ((("test_z", schema), ("test_a", schema)), (("test_a", reordered), ("test_z", reordered))):
+        for name, parameters in (first, second):
+            register_tool(ToolSpec(name=name, kind="function", description=name, runner=lambda: None, parameters=parameters))
+        payloads.append(json.dumps([t for t in as_openai_tools() if t["name"].startswith("test_")]))
+        registry.unregister_tool("test_a")
+        registry.unregister_tool("test_z")
+
+    assert payloads[0] == payloads[1]
@@ -0,0 +1,130 @@
+# tests/test_server.py
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.cli import server as neuro_server
+from tests.fakes import FakeClient, call, text
+
+
+@pytest.fixture
+def running(tmp_path):
+    client = FakeClient([])
+    pool = neuro_server.SessionPool(
+        client=client,
+        log_file=str(tmp_path / "history.jsonl"),
+        default_model="test-model",
+        workers=2,
+    )
+    httpd = neuro_server.NeuroHTTPServer(("127.0.0.1", 0), pool)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    yield httpd, client
+
+    httpd.shutdown()
+    httpd.server_close()
+    pool.close()
+    thread.join(timeout=5)
+
+
+def post(httpd, path, body=None, headers=None):
+    request = urllib.request.Request(
+        httpd.url + path,
+        data=json.dumps(body or {}).encode(),
+        headers={"Content-Type": "application/json", **(headers or {})},
+        method="POST",
+    )
+    return urllib.request.urlopen(request, timeout=10)
+
+
+def events(response):
+    parsed = []
+
+    for block in response.read().decode().split("\n\n"):
+        if block.strip():
+            kind, data = block.split("\n", 1)
+            parsed.append((kind.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+
+    return parsed
+
+
+def test_session_streams_text_and_tool_events(running, temp_tool):
+    httpd, client = running
+    temp_tool("test_probe", lambda: {"ok": True})
+    client.script += [[call("test_probe", {}, "a")], [text("all good")], [text("still good")]]
+
+    session = json.load(post(httpd, "/v1/sessions", {"mode": "command"}))
+    streamed = events(post(httpd, f"/v1/sessions/{session['id']}/turns", {"input": "probe it", "stream": True}))
+    answer = json.load(post(httpd, f"/v1/sessions/{session['id']}/turns", {"input": "and now?"}))
+
+    kinds = [kind for kind, _ in streamed]
+    assert kinds[0] == "started" and kinds[-1] == "done"
+    assert any(kind == "tool" and data["name"] == "test_probe" for kind, data in streamed)
+    assert "".join(data["delta"] for kind, data in streamed if kind == "text").strip() == "all good"
+    assert streamed[-1][1]["tools_used"] == ["test_probe"]
+
+    # The session chains its turns; the blocking form answers with JSON.
+    assert answer["text"].strip() == "still good"
+    assert client.requests[2]["previous_response_id"] == "resp_2"
+    assert client.requests[0]["model"] == "test-model"
+
+
+def test_turns_of_one_session_queue(running, temp_tool):
+    httpd, client = running
+    started, release = threading.Event(), threading.Event()
+
+    def slow_probe():
+        started.set()
+        release.wait(5)
+        return {"ok": True}
+
+    temp_tool("test_slow_probe", slow_probe)
+    client.script += [[call("test_slow_probe", {}, "a")], [text("first")], [text("second")]]
+    session = json.load(post(httpd, "/v1/sessions"))
+    results = {}
+
+    def first():
+        results["first"] = json.load(post(httpd, f"/v1/sessions/{session['id']}/turns", {"input": "one"}))
+
+    worker = threading.Thread(target=first)
+    worker.start()
+
+    try:
+        assert started.wait(5)
+
+        second = post(httpd, f"/v1/sessions/{session['id']}/turns", {"input": "two"}, {"Accept": "text/event-stream"})
+    finally:
+        release.set()
+
+    streamed = events(second)
+    worker.join(5)
+
+    assert streamed[0] == ("queued", {"turn": streamed[0][1]["turn"], "position": 1})
+    assert streamed[-1][1]["text"].strip() == "second"
+    assert results["first"]["text"].strip() == "first"
+    # The queued turn waited for, and continued from, the running one.
+    assert client.requests[2]["previous_response_id"] == "resp_2"
+
+    health = json.load(urllib.request.urlopen(httpd.url + "/v1/health", timeout=5))
+    assert health["served"] == 2 and health["busy"] == 0
+
+
+def test_errors_and_auth(running):
+    httpd, _ = running
+
+    with pytest.raises(urllib.error.HTTPError) as missing:
+        post(httpd, "/v1/sessions/nope/turns", {"input": "hi"})
+
+    assert missing.value.code == 404
+
+    httpd.token = "secret"
+
+    with pytest.raises(urllib.error.HTTPError) as denied:
+        post(httpd, "/v1/sessions")
+
+    assert denied.value.code == 401
+    assert post(httpd, "/v1/sessions", headers={"Authorization": "Bearer secret"}).status == 201
@@ -0,0 +1,47 @@
+# tests/test_startup.py
+import json
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.startup import HEAVY_MODULES, ROOT, SCENARIOS, measure
+
+
+def _loaded_after(code):
+    probe = f"{code}; import json, sys; print(json.dumps(sorted(sys.modules)))"
+    output = subprocess.run(
+        [sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return set(json.loads(output.splitlines()[-1]))
+
+
+def test_thin_client_imports_nothing_heavy():
+    loaded = _loaded_after("import main")
+    assert not loaded & set(HEAVY_MODULES)
+
+
+def test_tool_modules_load_on_first_use():
+    code = (
+        "import src.tools; from src.core.registry import all_tools, get_tool; "
+        "assert 'ha_get_state' in all_tools(); "
+        "assert get_tool('ha_get_state').cache is not None"
+    )
+    assert "src.tools.homeassistant" in _loaded_after(code)
+    assert "src.tools.homeassistant" not in _loaded_after("import src.tools")
+    assert "requests" not in _loaded_after("import src.tools")
+
+
+def test_manifest_matches_tool_modules():
+    from src.tools.manifest import MANIFEST_PATH, build_manifest
+
+    assert json.loads(MANIFEST_PATH.read_text()) == build_manifest(), (
+        "manifest.json is stale; run `python -m src.tools`"
+    )
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("scenario", list(SCENARIOS))
+def test_cold_start_within_budget(scenario):
+    result = measure(scenario, runs=3)
+    assert result["median_ms"] <= result["budget_ms"], result
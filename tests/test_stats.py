@@ -0,0 +1,49 @@
+# tests/test_stats.py
+from src.core.stats import SessionStats, TurnMetrics, percentile, session_stats
+from src.core.runtime import run_turn
+from tests.fakes import FakeClient, text
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) is None
+
+
+def test_turn_result_carries_metrics(tmp_path):
+    session_stats.clear()
+    client = FakeClient([[text("hello world")]])
+    result = run_turn(client=client, user="hi", log_file=str(tmp_path / "h.jsonl"), emit_output=False)
+
+    m = result.metrics
+    assert m.round_trips == 1
+    assert 0 <= m.ttfb_s <= m.ttft_s <= m.total_s
+    assert m.usage["input_tokens"] == 10
+    assert len(session_stats) == 1
+
+
+def test_summary_by_model():
+    stats = SessionStats()
+    for n in range(10):
+        m = TurnMetrics(ttfb_s=n / 10, total_s=n)
+        m.tool_durations.append(("t", 0.5))
+        stats.record("fast" if n < 5 else "slow", m)
+
+    assert stats.summary()["total_s"]["p50"] == 4
+    assert stats.summary("slow")["total_s"]["p50"] == 7
+    assert stats.summary()["tool_run_s"]["n"] == 10
+
+
+def test_summary_reports_cached_share_and_split_ttft():
+    stats = SessionStats()
+    for cached in (0, 80):
+        m = TurnMetrics(ttft_s=0.9 if not cached else 0.3)
+        m.usage.update(input_tokens=100, cached_tokens=cached)
+        stats.record("m", m)
+
+    summary = stats.summary()
+    assert summary["cached_pct"]["p95"] == 80
+    assert summary["ttft_cached_s"]["p50"] == 0.3
+    assert summary["ttft_uncached_s"]["p50"] == 0.9
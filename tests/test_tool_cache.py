@@ -0,0 +1,111 @@
+# tests/test_tool_cache.py
+import json
+import time
+
+import pytest
+
+from src.core.cache import tool_cache
+from src.core.registry import CachePolicy
+from src.core.runtime import _run_registered_tool
+from src.tools.homeassistant import _service_invalidates
+
+
+@pytest.fixture
+def tools(temp_tool):
+    tool_cache.clear()
+    yield temp_tool
+    tool_cache.clear()
+
+
+def _call(name, **args):
+    return _run_registered_tool({"name": name, "kind": "function_call", "call_id": "c"}, json.dumps(args))
+
+
+def test_hits_are_keyed_on_canonical_args(tools):
+    calls = []
+
+    def lookup(a, b):
+        calls.append((a, b))
+        return {"sum": a + b}
+
+    tools(name="test_lookup", runner=lookup, cache=CachePolicy(ttl=60))
+    before = tool_cache.stats()
+
+    first = _run_registered_tool({"name": "test_lookup", "kind": "function_call"}, '{"a": 1, "b": 2}')
+    second = _run_registered_tool({"name": "test_lookup", "kind": "function_call"}, '{"b": 2, "a": 1}')
+
+    assert first == second
+    assert calls == [(1, 2)]
+    after = tool_cache.stats()
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 1
+
+
+def test_entries_expire_and_errors_are_not_cached(tools):
+    calls = []
+
+    def flaky(x):
+        calls.append(x)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return {"x": x}
+
+    tools(name="test_flaky", runner=flaky, cache=CachePolicy(ttl=0.05))
+
+    assert "boom" in _call("test_flaky", x=1)
+    _call("test_flaky", x=1)
+    _call("test_flaky", x=1)
+    assert len(calls) == 2
+
+    time.sleep(0.06)
+    _call("test_flaky", x=1)
+    assert len(calls) == 3
+
+
+def test_writer_invalidates_tagged_entries(tools):
+    state = {"light.a": "off", "light.b": "off"}
+
+    tools(
+        name="test_get",
+        runner=lambda entity_id: {"state": state[entity_id]},
+        cache=CachePolicy(ttl=60, tags=lambda args: {f"entity:{args['entity_id']}"}),
+    )
+
+    def turn_on(entity_id):
+        state[entity_id] = "on"
+        return {"ok": True}
+
+    tools(
+        name="test_set",
+        runner=turn_on,
+        invalidates=lambda args: {f"entity:{args['entity_id']}"},
+    )
+
+    assert json.loads(_call("test_get", entity_id="light.a"))["state"] == "off"
+    assert json.loads(_call("test_get", entity_id="light.b"))["state"] == "off"
+
+    _call("test_set", entity_id="light.a")
+    state["light.b"] = "on"  # changed behind our back; still served from cache
+
+    assert json.loads(_call("test_get", entity_id="light.a"))["state"] == "on"
+    assert json.loads(_call("test_get", entity_id="light.b"))["state"] == "off"
+
+
+def test_lru_bound(tools):
+    tools(name="test_echo", runner=lambda v: {"v": v}, cache=CachePolicy(ttl=60))
+    limit = tool_cache.max_entries
+
+    for v in range(limit + 5):
+        _call("test_echo", v=v)
+
+    assert tool_cache.stats()["entries"] == limit
+
+
+def test_service_invalidation_targets():
+    assert _service_invalidates({"domain": "light", "service": "turn_on", "entity_id": "light.a"}) == {
+        "ha:states",
+        "entity:light.a",
+    }
+    assert _service_invalidates(
+        {"domain": "light", "service": "turn_on", "target": {"area_id": "kitchen"}}
+    ) == {"ha:states", "ha:entity"}
@@ -0,0 +1,81 @@
+# tests/test_tool_outputs.py
+import json
+
+import pytest
+
+from src.core.cache import tool_cache
+from src.core.outputs import MAX_READ_CHARS, tool_output_read
+from src.core.registry import CachePolicy
+from src.core.runtime import _run_registered_tool
+
+
+@pytest.fixture
+def big_tool(tmp_path, monkeypatch, temp_tool):
+    monkeypatch.setenv("NEURO_SPILL_DIR", str(tmp_path))
+    rows = [{"entity_id": f"light.l{n}", "state": "on"} for n in range(2000)]
+    temp_tool("test_big", lambda: rows, output_budget=4000)
+    return rows
+
+
+def _call(name, **args):
+    return _run_registered_tool({"name": name, "kind": "function_call"}, json.dumps(args))
+
+
+def test_oversized_output_is_spilled_and_pageable(big_tool, tmp_path):
+    summary = json.loads(_call("test_big"))
+
+    assert summary["truncated"] is True
+    assert summary["shape"] == {"type": "list", "items": 2000, "item_keys": ["entity_id", "state"]}
+    assert len(json.dumps(summary)) < 4000
+    assert list(tmp_path.glob("*.txt"))
+
+    pages = [summary["preview"]]
+    offset = summary["next_offset"]
+    while offset is not None:
+        page = json.loads(_call("tool_output_read", handle=summary["handle"], offset=offset, limit=20000))
+        pages.append(page["content"])
+        offset = page["next_offset"]
+
+    assert json.loads("".join(pages)) == big_tool
+
+
+def test_small_output_passes_through(temp_tool):
+    temp_tool("test_small", lambda: {"ok": 1})
+    assert json.loads(_call("test_small")) == {"ok": 1}
+
+
+def test_read_rejects_path_traversal(big_tool):
+    assert "error" in json.loads(_call("tool_output_read", handle="../../etc/passwd"))
+
+
+def test_pages_stay_within_the_default_budget(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEURO_SPILL_DIR", str(tmp_path))
+    (tmp_path / "test_wide-1.txt").write_text("é" * (3 * MAX_READ_CHARS), encoding="utf-8")
+
+    page = tool_output_read("test_wide-1", limit=10 * MAX_READ_CHARS)
+
+    assert len(page["content"].encode("utf-8")) <= MAX_READ_CHARS
+    assert page["next_offset"] == len(page["content"])
+
+
+def test_cached_summary_is_dropped_once_its_spill_is_pruned(tmp_path, monkeypatch, temp_tool):
+    monkeypatch.setenv("NEURO_SPILL_DIR", str(tmp_path))
+    runs = []
+
+    def big():
+        runs.append(1)
+        return ["x" * 100] * 100
+
+    temp_tool("test_big_cached", big, output_budget=1000, cache=CachePolicy(ttl=60))
+
+    try:
+        first = json.loads(_call("test_big_cached"))
+        assert json.loads(_call("test_big_cached")) == first  # served from the cache
+        (tmp_path / f"{first['handle']}.txt").unlink()
+
+        again = json.loads(_call("test_big_cached"))
+    finally:
+        tool_cache.clear()
+
+    assert len(runs) == 2
+    assert (tmp_path / f"{again['handle']}.txt").exists()
@@ -0,0 +1,139 @@
+# tests/test_tracing.py
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.core import tracing
+from src.core.runtime import run_turn, run_turn_async
+from tests.fakes import FakeAsyncClient, FakeClient, call, text
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    tracing.configure(path)
+    yield path
+    tracing.configure(None)
+
+
+@pytest.fixture
+def tools(temp_tool):
+    def broken():
+        raise RuntimeError("no signal")
+
+    temp_tool("test_probe", lambda: {"ok": True})
+    temp_tool("test_broken", broken)
+
+
+def by_name(spans):
+    named = {}
+
+    for span in spans:
+        named.setdefault(span["name"], []).append(span)
+
+    return named
+
+
+def test_turn_is_root_of_streams_and_tools(tmp_path, trace_file, tools):
+    client = FakeClient([[call("test_probe", {}, "a"), call("test_broken", {}, "b")], [text("done")]])
+    run_turn(client=client, user="probe", log_file=str(tmp_path / "h.jsonl"), emit_output=False)
+
+    spans = by_name(tracing.load(trace_file))
+    (turn,) = spans["turn"]
+    streams = spans["stream"]
+
+    assert turn["parent_id"] is None
+    assert turn["attributes"]["round_trips"] == 2
+    assert turn["attributes"]["tools_used"] == ["test_probe", "test_broken"]
+    assert [s["parent_id"] for s in streams] == [turn["span_id"]] * 2
+    assert streams[0]["attributes"]["tool_calls"] == 2
+    assert streams[1]["attributes"]["input_items"] == 2
+
+    tool_spans = {s["attributes"]["tool"]: s for s in spans["tool"]}
+    # Early-dispatched calls start mid-stream, on pool threads.
+    assert {s["parent_id"] for s in tool_spans.values()} <= {s["span_id"] for s in streams} | {turn["span_id"]}
+    assert {s["trace_id"] for s in tool_spans.values()} == {turn["trace_id"]}
+    assert tool_spans["test_probe"]["status"] == "ok"
+    assert tool_spans["test_broken"]["status"] == "error"
+    assert "no signal" in tool_spans["test_broken"]["error"]
+
+
+def test_async_turn_spans(tmp_path, trace_file, tools):
+    client = FakeAsyncClient([[call("test_probe", {}, "a")], [text("done")]])
+    asyncio.run(run_turn_async(client=client, user="probe", log_file=str(tmp_path / "h.jsonl")))
+
+    spans = by_name(tracing.load(trace_file))
+    (turn,) = spans["turn"]
+
+    assert len(spans["stream"]) == 2
+    assert spans["tool"][0]["trace_id"] == turn["trace_id"]
+
+
+def test_chrome_trace_events(tmp_path):
+    path = tmp_path / "trace.json"
+    tracing.configure(path)
+
+    try:
+        with tracing.span("turn", model="m"):
+            with pytest.raises(ValueError), tracing.span("stream"):
+                raise ValueError("boom")
+    finally:
+        tracing.configure(None)
+
+    events = tracing.load(path)
+    complete = {event["name"]: event for event in events if event["ph"] == "X"}
+
+    assert any(event["ph"] == "M" and event["name"] == "thread_name" for event in events)
+    assert complete["stream"]["args"]["parent_id"] == complete["turn"]["args"]["span_id"]
+    assert complete["stream"]["args"]["status"] == "error"
+    assert complete["turn"]["args"]["model"] == "m"
+    assert complete["turn"]["dur"] >= complete["stream"]["dur"]
+
+
+def test_spans_are_free_when_off(tmp_path):
+    tracing.configure(None)
+
+    with tracing.span("turn") as span:
+        span.set(anything=1)
+
+    assert span is tracing.NULL_SPAN
+
+
+def test_traced_session_records_http_calls(trace_file):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            body = b'{"ok": true}'
+            self.send_response(200 if self.path.startswith("/api/services") else 404)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    session = tracing.trace_session(requests.Session(), "ha.http")
+
+    try:
+        with tracing.span("tool"):
+            session.post(f"{base}/api/services?x=1", json={"entity_id": "light.desk"})
+            session.post(f"{base}/api/missing", json={})
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    spans = by_name(tracing.load(trace_file))
+    ok, missing = spans["ha.http"]
+
+    assert ok["parent_id"] == spans["tool"][0]["span_id"]
+    assert ok["attributes"]["url"] == f"{base}/api/services"
+    assert ok["attributes"]["status"] == 200
+    assert ok["attributes"]["request_bytes"] > 0
+    assert ok["attributes"]["response_bytes"] == 12
+    assert missing["status"] == "error"
@@ -0,0 +1,86 @@
+# tests/test_transport.py
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.core import transport
+from src.core.transport import TransportConfig, build_client, keep_warm, prewarm
+
+
+@pytest.fixture
+def server():
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_HEAD(self):
+            seen.append((self.command, self.client_address[1]))
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}/v1", seen
+    httpd.shutdown()
+
+
+def test_config_from_env(monkeypatch):
+    monkeypatch.setenv("NEURO_MAX_RETRIES", "5")
+    monkeypatch.setenv("NEURO_HTTP_MAX_KEEPALIVE", "3")
+    config = TransportConfig()
+    client = build_client(config, api_key="test")
+
+    assert client.max_retries == 5
+    assert config.limits().max_keepalive_connections == 3
+    assert client._client is client.neuro_http
+
+
+def test_backoff_is_bounded(monkeypatch):
+    monkeypatch.setenv("NEURO_RETRY_INITIAL_DELAY", "0.1")
+    monkeypatch.setenv("NEURO_RETRY_MAX_DELAY", "0.4")
+    client = build_client(api_key="test")
+
+    class Options:
+        def get_max_retries(self, default):
+            return default
+
+    delays = [client._calculate_retry_timeout(r, Options()) for r in range(client.max_retries, 0, -1)]
+    assert all(0.05 <= d <= 0.4 for d in delays)
+
+
+def test_prewarm_opens_one_pooled_connection(server, monkeypatch):
+    base_url, seen = server
+    monkeypatch.setattr(transport._activity, "last", 0.0)
+    client = build_client(api_key="test", base_url=base_url)
+
+    thread = prewarm(client)
+    thread.join(5)
+    assert [cmd for cmd, _ in seen] == ["HEAD"]
+
+    # Recently active pool: nothing to do.
+    assert prewarm(client) is None
+
+    # Forced warm-up reuses the kept-alive socket (same client port).
+    prewarm(client, force=True).join(5)
+    assert seen[0][1] == seen[1][1]
+
+
+def test_prewarm_ignores_foreign_clients():
+    assert prewarm(object()) is None
+
+
+def test_keep_warm_stops_when_asked():
+    stop = threading.Event()
+    thread = threading.Thread(target=keep_warm, args=(object(), stop), daemon=True)
+    thread.start()
+    stop.set()
+    thread.join(1)
+
+    assert not thread.is_alive()
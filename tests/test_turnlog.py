@@ -0,0 +1,100 @@
+# tests/test_turnlog.py
+import gzip
+import json
+
+from src.core.runtime import run_turn
+from src.core.turnlog import TurnLogWriter, get_writer, jsonl_path, read_records, render_markdown
+from tests.fakes import FakeClient, call, text
+
+
+def test_turn_record_captures_tools_and_response_ids(tmp_path, log_file, temp_tool):
+    temp_tool("test_ping", lambda host: {"up": True})
+
+    client = FakeClient([[call("test_ping", {"host": "a"}, "c1")], [text("it is up")]])
+    run_turn(client=client, user="ping a", model="m1", log_file=log_file, emit_output=False)
+
+    get_writer(log_file).flush()
+    (record,) = read_records(log_file)
+
+    assert record["model"] == "m1"
+    assert record["response_ids"] == ["resp_1", "resp_2"]
+    assert record["round_trips"] == 2
+    (tool,) = record["tool_calls"]
+    assert tool["name"] == "test_ping"
+    assert tool["args_bytes"] == len('{"host": "a"}')
+    assert tool["output_bytes"] == len('{"up": true}')
+    assert tool["duration_ms"] >= 0
+    # No Markdown mirror unless requested.
+    assert not (tmp_path / "history.md").exists()
+
+
+def test_legacy_markdown_path_keeps_markdown_view(tmp_path):
+    log_file = tmp_path / "history.md"
+    assert jsonl_path(log_file) == tmp_path / "history.jsonl"
+
+    writer = get_writer(log_file)
+    writer.submit({"user": "hi", "text": "hello", "tool_calls": []})
+    writer.flush()
+
+    assert read_records(log_file)[0]["user"] == "hi"
+    assert "**You:** hi" in log_file.read_text(encoding="utf-8")
+
+
+def test_rotation_compresses_archives(tmp_path):
+    path = tmp_path / "history.jsonl"
+    writer = TurnLogWriter(path, max_bytes=500, backups=2)
+
+    for n in range(40):
+        writer.submit({"n": n, "text": "x" * 50})
+    writer.flush()
+    writer.close()
+
+    archives = sorted(tmp_path.glob("history.jsonl.*.gz"))
+    assert [a.name for a in archives] == ["history.jsonl.1.gz", "history.jsonl.2.gz"]
+
+    newest = [json.loads(line) for line in gzip.open(archives[0], "rt")]
+    older = [json.loads(line) for line in gzip.open(archives[1], "rt")]
+    assert older[-1]["n"] < newest[0]["n"]
+
+
+def test_markdown_mirror_rotates_too(tmp_path):
+    path = tmp_path / "history.jsonl"
+    writer = TurnLogWriter(path, max_bytes=500, backups=2, markdown=tmp_path / "history.md")
+
+    for n in range(40):
+        writer.submit({"user": f"q{n}", "text": "x" * 50, "tool_calls": []})
+    writer.flush()
+    writer.close()
+
+    archives = sorted(tmp_path.glob("history.md.*.gz"))
+    assert [a.name for a in archives] == ["history.md.1.gz", "history.md.2.gz"]
+    assert (tmp_path / "history.md").stat().st_size < 500
+    assert "**You:** q39" in (tmp_path / "history.md").read_text(encoding="utf-8")
+
+
+def test_failing_sink_neither_blocks_rotation_nor_other_sinks(tmp_path, capsys):
+    path = tmp_path / "history.jsonl"
+    seen = []
+
+    def locked_db(record):
+        raise RuntimeError("database is locked")
+
+    writer = TurnLogWriter(path, max_bytes=500, backups=2, sinks=[locked_db, seen.append])
+
+    for n in range(40):
+        writer.submit({"n": n, "text": "x" * 50})
+    writer.flush()
+    writer.close()
+
+    assert len(seen) == 40
+    assert path.stat().st_size < 500
+    assert len(list(tmp_path.glob("history.jsonl.*.gz"))) == 2
+    assert capsys.readouterr().err.count("database is locked") == 1
+
+
+def test_render_markdown_matches_legacy_layout():
+    md = render_markdown(
+        {"user": "q", "text": "a", "tool_calls": [{"name": "t", "args_bytes": 3, "output_preview": "{}"}]}
+    )
+    assert "**AI:** a" in md
+    assert "_Tool used_: t" in md
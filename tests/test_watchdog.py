@@ -0,0 +1,123 @@
+# tests/test_watchdog.py
+import asyncio
+import time
+
+import pytest
+
+from src.core.runtime import run_turn, run_turn_async
+from src.core.watchdog import HedgeBudget, StallPolicy, StreamStalled
+from tests.fakes import FakeAsyncClient, FakeAsyncStream, FakeClient, FakeStream, call, text
+
+QUICK = StallPolicy(first_event_s=0.2, idle_s=0.2, retries=1)
+
+
+def pausing(client, pauses, stream_type=FakeStream):
+    """Make request n sleep `seconds` after `after` events: pauses[n] = (after, seconds)."""
+
+    original = client.responses.stream
+
+    class PausingStream(stream_type):
+        def __iter__(self):
+            for index, event in enumerate(self._events):
+                if index == self.pause[0]:
+                    time.sleep(self.pause[1])
+                yield event
+
+        async def __aiter__(self):
+            for index, event in enumerate(self._events):
+                if index == self.pause[0]:
+                    await asyncio.sleep(self.pause[1])
+                yield event
+
+    def stream(**options):
+        fake = original(**options)
+        wrapped = PausingStream(fake._events, fake._final)
+        wrapped.pause = pauses.get(len(client.requests) - 1, (-1, 0))
+        return wrapped
+
+    client.responses.stream = stream
+    return client
+
+
+def test_stalled_first_event_is_resent(log_file):
+    client = pausing(FakeClient([[text("lost")], [text("hello")]]), {0: (0, 1.0)})
+    result = run_turn(client=client, user="hi", log_file=log_file, emit_output=False, stall_policy=QUICK)
+
+    assert result.text.strip() == "hello"
+    assert len(client.requests) == 2
+    assert result.metrics.stalls == 1
+
+
+def test_stall_past_retries_raises(log_file):
+    client = pausing(FakeClient([[text("a")], [text("b")]]), {0: (0, 1.0), 1: (0, 1.0)})
+
+    with pytest.raises(StreamStalled):
+        run_turn(client=client, user="hi", log_file=log_file, emit_output=False, stall_policy=QUICK)
+
+
+def test_resent_stream_does_not_rerun_started_tools(log_file, temp_tool):
+    runs = []
+    temp_tool("test_light", lambda: runs.append(1) or {"on": True})
+
+    # The first copy emits the call, then stalls; the resent one emits it again.
+    client = pausing(
+        FakeClient([[call("test_light", {}, "a"), text("x")], [call("test_light", {}, "b")], [text("done")]]),
+        {0: (3, 1.0)},
+    )
+    result = run_turn(client=client, user="light on", log_file=log_file, emit_output=False, stall_policy=QUICK)
+
+    assert runs == [1]
+    assert result.text.strip() == "done"
+    assert client.requests[2]["input"][0]["call_id"] == "b"
+
+
+def test_late_first_output_is_hedged():
+    policy = StallPolicy(first_event_s=None, idle_s=None, hedge_after_s=0.1)
+    client = pausing(FakeClient([[text("slow")], [text("fast")]]), {0: (0, 1.0)})
+
+    from src.core.runtime import _stream_response
+    from src.core.stats import TurnMetrics
+
+    metrics = TurnMetrics()
+    text_out, *_ = _stream_response(
+        client=client,
+        model="m",
+        input_payload="hi",
+        previous_response_id=None,
+        instructions=None,
+        emit_output=False,
+        stream_callback=lambda _: None,
+        metrics=metrics,
+        tools=[],
+        stall_policy=policy,
+    )
+
+    assert text_out.strip() == "fast"
+    assert (metrics.hedges, metrics.hedge_wins) == (1, 1)
+
+
+def test_hedge_budget_caps_extra_requests():
+    budget = HedgeBudget(ratio=0.25, burst=1)
+    allowed = 0
+
+    for _ in range(12):
+        budget.note_request()
+        allowed += budget.try_spend()
+
+    assert allowed == 3  # the first, then one per four requests
+
+
+def test_idle_stall_is_opt_in(monkeypatch):
+    monkeypatch.delenv("NEURO_STALL_IDLE", raising=False)
+    assert StallPolicy.from_env().idle_s is None
+
+    monkeypatch.setenv("NEURO_STALL_IDLE", "120")
+    assert StallPolicy.from_env().idle_s == 120.0
+
+
+def test_async_stall_is_resent(log_file):
+    client = pausing(FakeAsyncClient([[text("lost")], [text("hello")]]), {0: (0, 1.0)}, FakeAsyncStream)
+    result = asyncio.run(run_turn_async(client=client, user="hi", log_file=log_file, stall_policy=QUICK))
+
+    assert result.text.strip() == "hello"
+    assert result.metrics.stalls == 1